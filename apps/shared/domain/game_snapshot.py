@@ -1,5 +1,7 @@
+import hashlib
+import json
 from collections import defaultdict
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 from shared.domain.detection import Detection
 from shared.domain.moves import MoveType
@@ -17,7 +19,9 @@ class GameSnapshot:
             bids: Optional[List[Any]] = None,
             is_player_move: bool = False,
             actions: Optional[Dict[int, List[Detection]]] = None,
-            moves: Optional[Dict[Street, List[Tuple[Position, MoveType]]]] = None
+            moves: Optional[Dict[Street, List[Tuple[Position, MoveType]]]] = None,
+            engine_error: Optional[str] = None,
+            stale: Optional[Set[str]] = None
     ):
         self.player_cards = player_cards or []
         self.table_cards = table_cards or []
@@ -26,6 +30,11 @@ class GameSnapshot:
         self.is_player_move = is_player_move
         self.actions = actions or {}
         self.moves = moves or defaultdict(list)
+        # Client-side diagnostics only, never sent to the server
+        self.engine_error = engine_error
+        # Parts not detected in this frame for lack of time (cached values or empty),
+        # 'moves' also when they were recovered from an edited action sequence
+        self.stale = stale or set()
 
     @property
     def has_cards(self) -> bool:
@@ -61,6 +70,18 @@ class GameSnapshot:
         return {player_num: position for player_num, position in self.positions.items()
                 if position.name != "NO"}
 
+    def get_semantic_digest(self) -> str:
+        """
+        Digest of the game data sent to the server (``to_game_update_message``)
+        without the match scores, so frames that differ only in pixels give the
+        same digest while any change of the payload gives a new one.
+        """
+        game_data = self.to_game_data()
+        for key in ('player_cards', 'table_cards'):
+            game_data[key] = [{k: v for k, v in card.items() if k != 'score'} for card in game_data[key]]
+        content = json.dumps(game_data, sort_keys=True)
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
     def get_street_display(self) -> str:
         street = self.get_street()
         if street is None:
@@ -75,37 +96,62 @@ class GameSnapshot:
     ):
         """Convert GameSnapshot directly to GameUpdateMessage protocol format."""
         from shared.protocol.message_protocol import GameUpdateMessage
-        from shared.utils.card_format_utils import format_cards_simple
         from datetime import datetime
-        from table_detector.services.flophero_link_service import FlopHeroLinkService
 
         return GameUpdateMessage(
             type='game_update',
             client_id=client_id,
             window_name=window_name,
             timestamp=datetime.now().isoformat(),
-            game_data={
-                'player_cards_string': format_cards_simple(self.player_cards),
-                'player_cards': [
-                    {'name': c.template_name, 'display': c.format_with_unicode(), 'score': round(c.match_score, 3)}
-                    for c in self.player_cards
-                ],
-                'table_cards_string': format_cards_simple(self.table_cards),
-                'table_cards': [
-                    {'name': c.template_name, 'display': c.format_with_unicode(), 'score': round(c.match_score, 3)}
-                    for c in self.table_cards
-                ],
-                'positions': [
-                    {'player': i+1, 'player_label': f'Player {i+1}', 'name': p.template_name, 'is_main_player': i==0}
-                    for i, p in enumerate(self.positions.values())
-                ],
-                'moves': self._format_moves_for_protocol(),
-                'street': self.get_street_display(),
-                'solver_link': FlopHeroLinkService.generate_link(self)
-            },
+            game_data=self.to_game_data(),
             detection_interval=detection_interval
         )
 
+    def to_game_data(self) -> dict:
+        """``game_data`` of the GameUpdateMessage."""
+        from shared.utils.card_format_utils import format_cards_simple
+        from table_detector.services.flophero_link_service import FlopHeroLinkService
+
+        return {
+            'player_cards_string': format_cards_simple(self.player_cards),
+            'player_cards': [
+                {'name': c.template_name, 'display': c.format_with_unicode(), 'score': round(c.match_score, 3)}
+                for c in self.player_cards
+            ],
+            'table_cards_string': format_cards_simple(self.table_cards),
+            'table_cards': [
+                {'name': c.template_name, 'display': c.format_with_unicode(), 'score': round(c.match_score, 3)}
+                for c in self.table_cards
+            ],
+            'positions': [
+                {'player': i+1, 'player_label': f'Player {i+1}', 'name': p.template_name, 'is_main_player': i==0}
+                for i, p in enumerate(self.positions.values())
+            ],
+            'moves': self._format_moves_for_protocol(),
+            'bids': self._format_bids_for_protocol(),
+            'street': self.get_street_display(),
+            'stale': sorted(self.stale),
+            'solver_link': FlopHeroLinkService.generate_link(self)
+        }
+
+    def to_summary(self) -> dict:
+        """Plain, JSON-serializable view of the detected content (dumps, batch reprocessing)."""
+        return {
+            'player_cards': [d.template_name for d in self.player_cards],
+            'table_cards': [d.template_name for d in self.table_cards],
+            'positions': {str(k): d.template_name for k, d in self.positions.items()},
+            'actions': {str(k): [d.template_name for d in v] for k, v in self.actions.items()},
+            'moves': self._format_moves_for_protocol(),
+            'bids': self._format_bids_for_protocol(),
+            'street': self.get_street_display(),
+            'is_player_move': self.is_player_move,
+            'engine_error': self.engine_error,
+        }
+
+    def _format_bids_for_protocol(self) -> dict:
+        bids = self.bids.items() if isinstance(self.bids, dict) else enumerate(self.bids)
+        return {str(position): getattr(bid, 'amount_text', bid) for position, bid in bids}
+
     def _format_moves_for_protocol(self):
         """Format moves dictionary for protocol transmission."""
         if not self.moves:
@@ -1,18 +1,34 @@
+import itertools
 import os
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from apscheduler.schedulers.background import BackgroundScheduler
 from loguru import logger
 
+from table_detector.services.bid_stage_service import BidDetectionStage
+from table_detector.services.detection_budget_service import CycleBudget
+from table_detector.services.detection_pipeline_service import DetectionPipeline
+from table_detector.services.detection_pool_service import DetectionProcessPool
+from table_detector.services.detector_broker_service import DetectorBroker
+from table_detector.services.frame_history_service import FrameHistory
+from table_detector.services.hand_context_service import HandContextRegistry
 from table_detector.services.image_capture_service import ImageCaptureService
 from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.services.send_filter_service import SnapshotSendFilter
+from table_detector.services.table_priority_service import HERO_TO_ACT, TablePriorityQueue
+from table_detector.services.window_scheduler_service import AdaptiveWindowScheduler
+from table_detector.utils.metrics import MetricsReporter, metrics
 from table_detector.utils.fs_utils import create_timestamp_folder, create_window_folder
 from table_detector.utils.log_accumulator import LogAccumulator
 from table_detector.utils.windows_utils import initialize_platform
 from shared.protocol.message_protocol import GameUpdateMessage, TableRemovalMessage
 
+DETECTION_RESULT_TIMEOUT = 30
+
 
 class DetectionClient:
     def __init__(self, client_id: str = None, detection_interval: int = 10, server_connector=None):
@@ -22,44 +38,119 @@ class DetectionClient:
         self.detection_interval = detection_interval
         self.http_connector = server_connector  # SimpleHttpConnector
 
-        # Initialize detection services (reuse existing components)
-        self.image_capture_service = ImageCaptureService()
-        self.poker_game_processor = PokerGameProcessor()
         self.debug_mode = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
+
+        # Initialize detection services (reuse existing components)
+        # Fast change probe with per-window backoff (PROBE_INTERVAL); None keeps the fixed interval
+        self.window_scheduler = AdaptiveWindowScheduler.from_env(max_interval=detection_interval)
+        self.image_capture_service = ImageCaptureService(window_scheduler=self.window_scheduler)
+        self.frame_history = FrameHistory.from_env(archive_writer=self.image_capture_service.archive_writer)
+        # Detection in worker processes (DETECTION_WORKERS) or in standalone detector workers fed over
+        # local IPC (DETECTOR_BROKER); None detects in the scheduler thread
+        self.detection_pool = (DetectionProcessPool.from_env() or DetectorBroker.from_env()) \
+            if not self.debug_mode else None
+        # Per-window hand state, so the engine only applies new actions (INCREMENTAL_ENGINE)
+        self.poker_game_processor = PokerGameProcessor(frame_history=self.frame_history,
+                                                       detection_pool=self.detection_pool,
+                                                       hand_contexts=HandContextRegistry.from_env(),
+                                                       cycle_budget=CycleBudget.from_env(),
+                                                       bid_stage=BidDetectionStage.from_env())
+        # Hero-to-act tables are detected and sent first (PRIORITY_SCHEDULING), on a detection thread
+        # that runs while the remaining windows are still captured
+        self.table_priority = TablePriorityQueue.from_env(waiting_deadline=detection_interval)
+        self.priority_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="priority-detection") \
+            if self.table_priority is not None else None
+        # Skip sends whose game content did not change, with periodic heartbeats (SEND_DEDUP)
+        self.send_filter = SnapshotSendFilter.from_env()
+        # Metrics snapshot in the log every METRICS_LOG_INTERVAL cycles
+        self.metrics_reporter = MetricsReporter.from_env()
         self.scheduler = BackgroundScheduler()
         self._setup_scheduler()
 
+        # Staged streaming pipeline (PIPELINE_MODE) replaces the scheduled detect_and_send cycle
+        self.pipeline = None
+        if os.getenv('PIPELINE_MODE', 'false').lower() == 'true' and not self.debug_mode:
+            self.pipeline = DetectionPipeline(
+                image_capture_service=self.image_capture_service,
+                poker_game_processor=self.poker_game_processor,
+                create_game_update=self._create_game_update,
+                create_removal_messages=self._create_removal_messages,
+                send_message=self._send_message,
+                send_filter=self.send_filter,
+                metrics_reporter=self.metrics_reporter,
+                cycle_interval=self._get_cycle_interval(),
+                queue_size=int(os.getenv('PIPELINE_QUEUE_SIZE', '8'))
+            )
+
         logger.info(f"🎯 Detection client initialized: {self.client_id}")
 
     def _setup_scheduler(self):
         self.scheduler.add_job(
             func=self.detect_and_send,
             trigger='interval',
-            seconds=self.detection_interval,
+            seconds=self._get_cycle_interval(),
             id='detect_and_send',
             coalesce=True,
             name='Poker Detection and Send Job',
             replace_existing=True,
             max_instances=1,
         )
+        self.scheduler.add_listener(self._on_cycle_dropped, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+
+    def _on_cycle_dropped(self, event):
+        # The previous cycle is still running (or the scheduler fell behind); coalesce drops this one.
+        # apscheduler already warns about it, the metrics tell how often it happens
+        reason = 'still_running' if event.code == EVENT_JOB_MAX_INSTANCES else 'missed'
+        metrics.increment('detection.cycles_dropped')
+        metrics.increment(f'detection.cycles_dropped.{reason}')
+        logger.debug(f"⏳ Detection cycle dropped ({reason.replace('_', ' ')})")
+
+    def _get_cycle_interval(self) -> float:
+        if self.window_scheduler and not self.debug_mode:
+            return self.window_scheduler.min_interval
+        return self.detection_interval
 
     def start_detection(self):
         """Start the detection scheduler."""
+        if self.pipeline:
+            if not self.pipeline.is_running():
+                self.pipeline.start()
+            return
+
         if not self.scheduler.running:
             self.scheduler.start()
-            logger.info(f"✅ Detection started (interval: {self.detection_interval}s)")
+            logger.info(f"✅ Detection started (interval: {self._get_cycle_interval()}s)")
         else:
             logger.info("⚠️ Detection is already running")
 
     def stop_detection(self):
         """Stop the detection scheduler."""
+        if self.pipeline and self.pipeline.is_running():
+            self.pipeline.stop()
+
         if self.scheduler.running:
             self.scheduler.shutdown(wait=True)
             logger.info("✅ Detection stopped")
         else:
             logger.info("⚠️ Detection is not running")
 
+        if self.priority_executor:
+            self.priority_executor.shutdown(wait=True)
+
+        # Flush pending archive writes
+        self.image_capture_service.close()
+
+        if self.detection_pool:
+            self.detection_pool.close()
+
+    def request_frame_dump(self):
+        """Dump the recent frames of every window at the end of the next cycle."""
+        if self.frame_history:
+            self.frame_history.request_dump()
+
     def is_detection_running(self) -> bool:
+        if self.pipeline:
+            return self.pipeline.is_running()
         return self.scheduler.running
 
     def detect_and_send(self):
@@ -71,24 +162,71 @@ class DetectionClient:
             if log_accumulator:
                 log_accumulator.start_capture()
 
-            base_timestamp_folder = create_timestamp_folder(self.debug_mode)
-            window_changes = self.image_capture_service.get_changed_images(base_timestamp_folder)
+            base_timestamp_folder = create_timestamp_folder(self.debug_mode, with_milliseconds=bool(self.window_scheduler))
+            self.poker_game_processor.start_cycle()
+
+            # Changed windows are processed as soon as their capture completes
+            changed_games = []
+            submitted_windows = []
+            image_numbers = itertools.count(1)
+            prioritized_detection = None
+            if self.table_priority is not None:
+                self.table_priority.open()
+                prioritized_detection = self.priority_executor.submit(
+                    self._process_prioritized_windows, base_timestamp_folder)
+
+            def handle_changed_window(captured_image):
+                if self.table_priority is not None:
+                    hero_to_act = self.poker_game_processor.probe_hero_to_act(captured_image)
+                    self.table_priority.push(captured_image, hero_to_act)
+                    return
+
+                if self.detection_pool:
+                    submitted = self._submit_changed_window(captured_image, next(image_numbers))
+                    if submitted:
+                        submitted_windows.append(submitted)
+                    return
+
+                changed_game = self._handle_changed_window(captured_image, next(image_numbers), base_timestamp_folder)
+                if changed_game:
+                    changed_games.append(changed_game)
 
-            # Only process and write logs if there are changed windows
+            try:
+                window_changes = self.image_capture_service.get_changed_images(
+                    base_timestamp_folder, on_changed=handle_changed_window
+                )
+            finally:
+                if self.table_priority is not None:
+                    # Captures are done: the detection thread finishes the queued windows and returns
+                    self.table_priority.close()
+            changed_games.extend(self._collect_submitted_windows(submitted_windows))
+            waiting_games = prioritized_detection.result() if prioritized_detection else []
+            changed_games.extend(changed_game for _, changed_game in waiting_games)
+
+            if self.frame_history:
+                self.frame_history.check_manual_trigger()
+            self.poker_game_processor.end_cycle()
+
+            # Only send and write logs if there are changed windows
             if window_changes.changed_images:
-                # Process changed windows and collect changed game states
-                changed_games = self._handle_changed_windows(window_changes.changed_images, base_timestamp_folder)
-
                 # Handle removed windows and collect removal messages
                 removal_messages = self._handle_removed_windows(window_changes.removed_windows)
 
                 # Send updates to server (let the method handle empty inputs)
                 self._send_updates_to_server(changed_games, removal_messages)
+                for prioritized_window, _ in waiting_games:
+                    TablePriorityQueue.complete(prioritized_window)
+
+                self._log_archive_stats()
 
                 # Write accumulated logs to file
                 if log_accumulator and log_accumulator.has_logs():
-                    log_accumulator.write_to_file(base_timestamp_folder / "app.log")
+                    self._write_cycle_log(log_accumulator, base_timestamp_folder)
             else:
+                # Unchanged tables still need heartbeats, or the server drops them as stale
+                if self.send_filter:
+                    self._send_updates_to_server()
+
                 # No changes detected - clear accumulated logs
                 if log_accumulator:
                     log_accumulator.clear()
@@ -100,41 +238,124 @@ class DetectionClient:
             # Write logs on error too (for debugging)
             if log_accumulator and log_accumulator.has_logs():
                 base_timestamp_folder = create_timestamp_folder(self.debug_mode)
-                log_accumulator.write_to_file(base_timestamp_folder / "app.log")
+                self._write_cycle_log(log_accumulator, base_timestamp_folder)
 
         finally:
             # Always cleanup the log handler
             if log_accumulator:
                 log_accumulator.stop_capture()
+            if self.metrics_reporter:
+                self.metrics_reporter.cycle_finished()
 
-    def _handle_changed_windows(self, captured_windows, base_timestamp_folder):
-        """Process changed windows using existing poker game processor and return list of changed game states."""
-        changed_games = []
-
-        for i, captured_image in enumerate(captured_windows):
-            try:
-                logger.info(f"\n📷 Processing image {i + 1}: {captured_image.window_name}")
-                logger.info("-" * 40)
+    def _handle_changed_window(self, captured_image, image_number, base_timestamp_folder, hero_to_act=None):
+        """Process a changed window using existing poker game processor; returns (game_snapshot, window_name) or None."""
+        try:
+            logger.info(f"\n📷 Processing image {image_number}: {captured_image.window_name}")
+            logger.info("-" * 40)
 
-                # Create window-specific folder
+            # Window-specific folder is only used for debug result images
+            window_folder = None
+            if self.debug_mode:
                 window_folder = create_window_folder(base_timestamp_folder, captured_image.window_name)
 
-                # Process and get GameSnapshot
-                game_snapshot = self.poker_game_processor.process_window(captured_image, window_folder)
+            # Process and get GameSnapshot
+            game_snapshot = self.poker_game_processor.process_window(captured_image, window_folder,
+                                                                     hero_to_act=hero_to_act)
+
+            if game_snapshot:
+                logger.debug(f"✅ Captured changes for {captured_image.window_name}")
+                return game_snapshot, captured_image.window_name
+        except Exception as e:
+            logger.error(f"Error in detection cycle: {str(e)}\n{traceback.format_exc()}")
+            logger.error(f"❌ Error processing {captured_image.window_name}: {str(e)}")
+        finally:
+            # Clean up the image immediately after processing to prevent memory leaks
+            captured_image.close()
+
+        return None
+
+    def _process_prioritized_windows(self, base_timestamp_folder):
+        """
+        Detection thread of a cycle: detect changed windows most urgent first
+        while the remaining windows are still captured, until the priority
+        queue is closed. Hero-to-act tables are sent as soon as they are
+        detected; returns (prioritized_window, (game_snapshot, window_name))
+        of the other tables, sent with the cycle.
+        """
+        waiting_games = []
+        submitted_windows = []
+        image_numbers = itertools.count(1)
+
+        while True:
+            item = self.table_priority.get()
+            if item is None:
+                break
+
+            # The probe already looked at the action buttons
+            hero_to_act = item.priority_class == HERO_TO_ACT
+            if self.detection_pool:
+                # Keep every worker busy, the results are collected in priority order below
+                submitted = self._submit_changed_window(item.captured_window, next(image_numbers), hero_to_act)
+                if submitted:
+                    submitted_windows.append((item, submitted))
+                continue
+
+            changed_game = self._handle_changed_window(item.captured_window, next(image_numbers),
+                                                       base_timestamp_folder, hero_to_act)
+            if changed_game:
+                self._complete_prioritized_window(item, changed_game, waiting_games)
+
+        for item, submitted in sorted(submitted_windows, key=lambda prioritized: prioritized[0]):
+            for changed_game in self._collect_submitted_windows([submitted]):
+                self._complete_prioritized_window(item, changed_game, waiting_games)
+
+        return waiting_games
+
+    def _complete_prioritized_window(self, item, changed_game, waiting_games):
+        if item.priority_class == HERO_TO_ACT:
+            self._send_updates_to_server([changed_game])
+            TablePriorityQueue.complete(item)
+        else:
+            waiting_games.append((item, changed_game))
+
+    def _submit_changed_window(self, captured_image, image_number, hero_to_act=None):
+        """Hand a changed window to the detection process pool; returns (future, window_name) or None."""
+        try:
+            logger.info(f"\n📷 Submitting image {image_number}: {captured_image.window_name}")
+            return self.poker_game_processor.submit_window(captured_image, hero_to_act), captured_image.window_name
+        except Exception as e:
+            logger.error(f"❌ Error submitting {captured_image.window_name}: {str(e)}")
+            return None
+        finally:
+            # The frame now lives in shared memory
+            captured_image.close()
 
+    def _collect_submitted_windows(self, submitted_windows):
+        """Wait for pool detections; returns (game_snapshot, window_name) tuples like _handle_changed_window."""
+        changed_games = []
+        for future, window_name in submitted_windows:
+            try:
+                game_snapshot = future.result(timeout=DETECTION_RESULT_TIMEOUT)
                 if game_snapshot:
-                    # Store tuple of (game_snapshot, window_name) for later processing
-                    changed_games.append((game_snapshot, captured_image.window_name))
-                    logger.debug(f"✅ Captured changes for {captured_image.window_name}")
+                    changed_games.append((game_snapshot, window_name))
+                    logger.debug(f"✅ Captured changes for {window_name}")
             except Exception as e:
-                logger.error(f"Error in detection cycle: {str(e)}\n{traceback.format_exc()}")
-                logger.error(f"❌ Error processing {captured_image.window_name}: {str(e)}")
-            finally:
-                # Clean up the image immediately after processing to prevent memory leaks
-                captured_image.close()
-
+                logger.error(f"❌ Error processing {window_name}: {str(e)}")
         return changed_games
 
+    def _write_cycle_log(self, log_accumulator: LogAccumulator, base_timestamp_folder):
+        """Write accumulated cycle logs, through the archive writer when one is available."""
+        self.image_capture_service.write_cycle_log(base_timestamp_folder, log_accumulator.get_text())
+
+    def _log_archive_stats(self):
+        archive_stats = self.image_capture_service.get_archive_stats()
+        if archive_stats:
+            logger.info(
+                f"🗄️ Archive: queued={archive_stats['queued']} written={archive_stats['written']} "
+                f"dropped={archive_stats['dropped']} failed={archive_stats['failed']} "
+                f"lag={archive_stats['lag_seconds']:.3f}s"
+            )
+
     def _handle_removed_windows(self, removed_window_names):
         """Handle removed windows and return removal message data for transmission."""
         logger.info(f"🗑️ Removing {len(removed_window_names)} closed windows")
@@ -142,18 +363,22 @@ class DetectionClient:
         removal_messages = []
         for window_name in removed_window_names:
             logger.info(f"    Removing: {window_name}")
-
-            # Create removal message data structure
-            removal_data = {
-                'type': 'table_removal',
-                'client_id': self.client_id,
-                'window_name': window_name,
-                'timestamp': datetime.now().isoformat()
-            }
-            removal_messages.append(removal_data)
+            self.poker_game_processor.forget_window(window_name)
+            if self.send_filter:
+                self.send_filter.remove(window_name)
+            removal_messages.append(self._create_removal_data(window_name))
 
         return removal_messages
 
+    def _create_removal_data(self, window_name: str) -> dict:
+        # Create removal message data structure
+        return {
+            'type': 'table_removal',
+            'client_id': self.client_id,
+            'window_name': window_name,
+            'timestamp': datetime.now().isoformat()
+        }
+
     def _send_updates_to_server(self, changed_games=None, removal_messages=None):
         """Send specific changed game states and removal messages to servers via HTTP requests.
 
@@ -166,11 +391,16 @@ class DetectionClient:
             return
 
         try:
+            # Drop snapshots whose game content was already sent, add due heartbeats
+            if self.send_filter:
+                changed_games = self.send_filter.filter(changed_games)
+
             # Send changed games (if any)
             if changed_games:
                 logger.debug(f"Sending {len(changed_games)} changed game states to server")
                 for game_snapshot, window_name in changed_games:
-                    self._send_game_update(game_snapshot, window_name)
+                    if self._send_game_update(game_snapshot, window_name) and self.send_filter:
+                        self.send_filter.mark_sent(window_name, game_snapshot)
 
             # Send removal messages (if any)
             if removal_messages:
@@ -186,32 +416,22 @@ class DetectionClient:
             logger.debug(f"Error sending updates to server: {str(e)}")
             # Continue detection regardless of server errors
 
-    def _send_game_update(self, game_snapshot, window_name: str):
-        """Send individual game update via HTTP."""
+    def _send_game_update(self, game_snapshot, window_name: str) -> bool:
+        """Send individual game update via HTTP; False when it could not be sent."""
         try:
-            # Convert GameSnapshot directly to GameUpdateMessage
-            game_update = game_snapshot.to_game_update_message(
-                client_id=self.client_id,
-                window_name=window_name,
-                detection_interval=self.detection_interval
-            )
+            game_update = self._create_game_update(game_snapshot, window_name)
 
             # Simple HTTP request - fire and forget
-            self.http_connector.send_game_update(game_update)
+            return bool(self.http_connector.send_game_update(game_update))
 
         except Exception as e:
             logger.debug(f"Failed to send game update for {window_name}: {str(e)}")
+            return False
 
     def _send_removal_update(self, removal_data: dict):
         """Send individual removal message via HTTP."""
         try:
-            # Convert removal data to message protocol
-            removal_message = TableRemovalMessage(
-                type=removal_data.get('type', 'table_removal'),
-                client_id=removal_data.get('client_id'),
-                removed_windows=[removal_data.get('window_name')],  # Convert single window to list
-                timestamp=removal_data.get('timestamp')
-            )
+            removal_message = self._create_removal_message(removal_data)
 
             # Simple HTTP request - fire and forget
             self.http_connector.send_removal_message(removal_message)
@@ -219,6 +439,42 @@ class DetectionClient:
         except Exception as e:
             logger.debug(f"Failed to send removal update for {removal_data.get('window_name', 'unknown')}: {str(e)}")
 
+    def _create_game_update(self, game_snapshot, window_name: str) -> GameUpdateMessage:
+        # Convert GameSnapshot directly to GameUpdateMessage
+        return game_snapshot.to_game_update_message(
+            client_id=self.client_id,
+            window_name=window_name,
+            detection_interval=self.detection_interval
+        )
+
+    def _create_removal_message(self, removal_data: dict) -> TableRemovalMessage:
+        # Convert removal data to message protocol
+        return TableRemovalMessage(
+            type=removal_data.get('type', 'table_removal'),
+            client_id=removal_data.get('client_id'),
+            removed_windows=[removal_data.get('window_name')],  # Convert single window to list
+            timestamp=removal_data.get('timestamp')
+        )
+
+    def _create_removal_messages(self, removed_window_names) -> list:
+        """Removal messages only; the pipeline drops the windows' state in its own stages."""
+        return [self._create_removal_message(self._create_removal_data(window_name))
+                for window_name in removed_window_names]
+
+    def _send_message(self, message) -> bool:
+        """Send a GameUpdateMessage or TableRemovalMessage (pipeline transport stage); False when it was not sent."""
+        if not self.http_connector:
+            logger.debug("No HTTP connector configured - skipping server updates")
+            return False
+
+        try:
+            if isinstance(message, TableRemovalMessage):
+                return bool(self.http_connector.send_removal_message(message))
+            return bool(self.http_connector.send_game_update(message))
+        except Exception as e:
+            logger.debug(f"Failed to send {message.type} for {getattr(message, 'window_name', '')}: {str(e)}")
+            return False
+
     def get_client_id(self) -> str:
         """Get the client ID."""
         return self.client_id
@@ -0,0 +1,200 @@
+import copy
+from collections import deque
+from typing import List, Optional
+
+
+class NativePloState:
+    """
+    Array-based pot-limit Omaha betting state, a drop-in for the part of the
+    pokerkit ``State`` used by ``OmahaEngine``: folding, checking or calling
+    and min completion/betting/raising, actor order and street progression.
+
+    It follows pokerkit's rules (tournament mode, every automation on) for
+    the engine's fixed game: equal stacks of 100, blinds 0.5/1, min bet 1.
+    Amounts are kept in half chips so all of them are integers. Cards, pots
+    and payoffs are not modelled; once the hand ends (one player left, river
+    betting closed or everybody all-in) ``street_index`` and ``actor_index``
+    are None, like in pokerkit.
+    """
+
+    STREET_COUNT = 4
+    # Half chips: 100 stacks, 0.5/1 blinds, min bet 1
+    STARTING_STACK = 200
+    BLINDS = (1, 2)
+    MIN_BET = 2
+
+    def __init__(self, player_count: int):
+        self.player_count = player_count
+        self.stacks: List[int] = [self.STARTING_STACK] * player_count
+        self.bets: List[int] = [0] * player_count
+        self.statuses: List[bool] = [True] * player_count
+        self.street_index: Optional[int] = 0
+        self.opener_index: Optional[int] = None
+        self.actor_indices: deque = deque()
+        self.completion_betting_or_raising_amount = 0
+        self.acted_player_indices = set()
+        self.consecutive_short_all_in_amounts: List[int] = []
+        self.all_in_status = False
+
+        # Heads-up the button (seat 1) posts the small blind
+        blinds = list(self.BLINDS) + [0] * (player_count - len(self.BLINDS))
+        self._blinds = blinds[1::-1] if player_count == 2 else blinds
+        for i, blind in enumerate(self._blinds):
+            self.bets[i] = min(self.stacks[i], blind)
+            self.stacks[i] -= self.bets[i]
+
+        self._begin_betting()
+
+    def copy(self) -> 'NativePloState':
+        """Independent copy: only the small per-player arrays are copied."""
+        state = copy.copy(self)
+        state.stacks = list(self.stacks)
+        state.bets = list(self.bets)
+        state.statuses = list(self.statuses)
+        state.actor_indices = deque(self.actor_indices)
+        state.acted_player_indices = set(self.acted_player_indices)
+        state.consecutive_short_all_in_amounts = list(self.consecutive_short_all_in_amounts)
+        return state
+
+    @property
+    def actor_index(self) -> Optional[int]:
+        return self.actor_indices[0] if self.actor_indices else None
+
+    @property
+    def checking_or_calling_amount(self) -> Optional[int]:
+        if not self.actor_indices:
+            return None
+        player_index = self.actor_indices[0]
+        return min(self.stacks[player_index], max(self.bets) - self.bets[player_index])
+
+    @property
+    def min_completion_betting_or_raising_to_amount(self) -> Optional[int]:
+        if not self._can_raise():
+            return None
+        player_index = self.actor_indices[0]
+        amount = max(self.completion_betting_or_raising_amount, self.MIN_BET) + max(self.bets)
+        return min(self.stacks[player_index] + self.bets[player_index], amount)
+
+    def can_fold(self) -> bool:
+        # Folding without facing a bet is refused in tournament mode
+        return bool(self.actor_indices) and self.bets[self.actor_indices[0]] < max(self.bets)
+
+    def can_check_or_call(self) -> bool:
+        return bool(self.actor_indices)
+
+    def can_complete_bet_or_raise_to(self) -> bool:
+        return self._can_raise()
+
+    def fold(self):
+        if not self.can_fold():
+            raise ValueError("Folding is not allowed")
+        player_index = self._pop_actor_index()
+        self.statuses[player_index] = False
+        self._update_betting()
+
+    def check_or_call(self):
+        if not self.can_check_or_call():
+            raise ValueError("There is no player to act.")
+        amount = self.checking_or_calling_amount
+        player_index = self._pop_actor_index()
+        self.bets[player_index] += amount
+        self.stacks[player_index] -= amount
+        self._update_betting()
+
+    def complete_bet_or_raise_to(self, amount: Optional[int] = None):
+        min_amount = self.min_completion_betting_or_raising_to_amount
+        if min_amount is None:
+            raise ValueError("Completion, betting or raising is not allowed")
+        # Only min completions are modelled
+        amount = min_amount if amount is None else amount
+        if amount != min_amount:
+            raise ValueError(f"Only the min completion, betting or raising to {min_amount} is supported")
+
+        player_index = self._pop_actor_index()
+        raised_by = amount - max(self.bets)
+        self.stacks[player_index] -= amount - self.bets[player_index]
+        self.bets[player_index] = amount
+
+        # Everybody still able to act gets to answer the raise
+        self.actor_indices = deque((player_index + offset) % self.player_count
+                                   for offset in range(1, self.player_count))
+        self.actor_indices = deque(i for i in self.actor_indices if self.statuses[i] and self.stacks[i])
+        self.opener_index = player_index
+
+        if raised_by >= self.completion_betting_or_raising_amount:
+            self.acted_player_indices = {player_index}
+        self.completion_betting_or_raising_amount = max(self.completion_betting_or_raising_amount, raised_by)
+        if self.stacks[player_index]:
+            self.consecutive_short_all_in_amounts.clear()
+        else:
+            self.consecutive_short_all_in_amounts.append(raised_by)
+        if sum(self.consecutive_short_all_in_amounts) >= self.completion_betting_or_raising_amount:
+            self.consecutive_short_all_in_amounts.clear()
+        self._update_betting()
+
+    def _can_raise(self) -> bool:
+        if not self.actor_indices:
+            return False
+        player_index = self.actor_indices[0]
+        to_call = max(self.bets) - self.bets[player_index]
+
+        if min(self.stacks[player_index], to_call) < self.completion_betting_or_raising_amount:
+            return False  # Short all-in cannot be raised
+        if (self.consecutive_short_all_in_amounts
+                and sum(self.consecutive_short_all_in_amounts) < self.completion_betting_or_raising_amount
+                and player_index in self.acted_player_indices):
+            return False
+        if self.stacks[player_index] <= to_call:
+            return False
+        # Somebody else must be able to answer
+        return any(i != player_index and self.statuses[i] and self.stacks[i] + self.bets[i] > max(self.bets)
+                   for i in range(self.player_count))
+
+    def _pop_actor_index(self) -> int:
+        player_index = self.actor_indices.popleft()
+        self.acted_player_indices.add(player_index)
+        return player_index
+
+    def _effective_stack(self, player_index: int) -> int:
+        if not self.statuses[player_index]:
+            return 0
+        totals = sorted(self.bets[i] + self.stacks[i] for i in range(self.player_count) if self.statuses[i])
+        return min(self.stacks[player_index], max(0, totals[-2] - self.bets[player_index]))
+
+    def _begin_betting(self):
+        if self.street_index == 0:
+            # The player after the biggest blind opens preflop
+            max_bet_index = max(range(self.player_count),
+                                key=lambda i: (self.bets[i] if self._blinds[i] > 0 else 0, i))
+        else:
+            max_bet_index = self.player_count - 1
+        self.opener_index = (max_bet_index + 1) % self.player_count
+
+        self.actor_indices = deque(i % self.player_count
+                                   for i in range(self.opener_index, self.opener_index + self.player_count))
+        self.actor_indices = deque(i for i in self.actor_indices
+                                   if self.statuses[i] and self.stacks[i] and self._effective_stack(i))
+        self.completion_betting_or_raising_amount = 0
+        self.acted_player_indices.clear()
+        self.consecutive_short_all_in_amounts.clear()
+        self._update_betting(len(self.actor_indices) == 1 and self.bets[self.actor_indices[0]] >= max(self.bets))
+
+    def _update_betting(self, status: bool = False):
+        if not self.actor_indices or sum(self.statuses) <= 1 or status:
+            self._end_betting()
+
+    def _end_betting(self):
+        self.actor_indices.clear()
+        active = sum(self.statuses)
+        if active > 1 and sum(1 for i in range(self.player_count) if self.statuses[i] and self.stacks[i]) <= 1:
+            self.all_in_status = True
+        if not all(self.stacks) and self.street_index == self.STREET_COUNT - 1:
+            self.all_in_status = True
+
+        # Bets go to the pot
+        self.bets = [0] * self.player_count
+        if active == 1 or self.street_index == self.STREET_COUNT - 1 or self.all_in_status:
+            self.street_index = None
+        else:
+            self.street_index += 1
+            self._begin_betting()
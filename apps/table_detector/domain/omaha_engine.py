@@ -1,3 +1,6 @@
+import os
+import pickle
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 from loguru import logger
@@ -5,6 +8,9 @@ from pokerkit import Automation, PotLimitOmahaHoldem
 from shared.domain.moves import MoveType
 from shared.domain.position import Position
 from shared.domain.street import Street
+from table_detector.domain.native_plo_state import NativePloState
+
+ENGINE_BACKENDS = ('pokerkit', 'native')
 
 
 class OmahaEngineException(Exception):
@@ -60,7 +66,7 @@ class OmahaEngine:
         Automation.HOLE_DEALING
     )
 
-    def __init__(self, player_count):
+    def __init__(self, player_count, backend: str = None):
         if player_count < 2:
             raise WrongPlayerAmount("Need at least 2 players to start game")
 
@@ -74,10 +80,21 @@ class OmahaEngine:
             Street.RIVER: []
         }
 
+        backend = backend or get_engine_backend()
+        if backend == 'native':
+            self.poker_state = NativePloState(player_count)
+        elif backend == 'pokerkit':
+            self.poker_state = self._create_pokerkit_state(player_count)
+        else:
+            raise ValueError(f"Unsupported engine backend: {backend}. Supported: {list(ENGINE_BACKENDS)}")
+
+        self.seat_mapping = self._get_seat_to_position_mapping()
+
+    def _create_pokerkit_state(self, player_count):
         starting_stacks = [100] * player_count  # Default stack size
         blinds = (0.5, 1)  # Default blinds (SB, BB)
 
-        self.poker_state = PotLimitOmahaHoldem.create_state(
+        return PotLimitOmahaHoldem.create_state(
             self.AUTOMATIONS,
             True,  # Uniform antes?
             0,  # Antes
@@ -87,7 +104,17 @@ class OmahaEngine:
             player_count,  # Number of players
         )
 
-        self.seat_mapping = self._get_seat_to_position_mapping()
+    def fork(self) -> 'OmahaEngine':
+        """Independent copy of the engine to try actions on; the seat mapping never changes and is shared."""
+        engine = OmahaEngine.__new__(OmahaEngine)
+        engine.moves_by_street = {street: list(moves) for street, moves in self.moves_by_street.items()}
+        engine.seat_mapping = self.seat_mapping
+        if isinstance(self.poker_state, NativePloState):
+            engine.poker_state = self.poker_state.copy()
+        else:
+            # Much faster than deepcopy for pokerkit states
+            engine.poker_state = pickle.loads(pickle.dumps(self.poker_state, pickle.HIGHEST_PROTOCOL))
+        return engine
 
     def process_action(self, position: Position, action: MoveType):
 
@@ -211,3 +238,11 @@ class OmahaEngine:
 
         return result
 
+
+@lru_cache(maxsize=None)
+def get_engine_backend() -> str:
+    """
+    Betting state behind OmahaEngine: 'pokerkit' (default) or 'native', the array-based
+    NativePloState covering only the actions the engine uses (ENGINE_BACKEND).
+    """
+    return os.getenv('ENGINE_BACKEND', 'pokerkit').lower()
@@ -0,0 +1,163 @@
+import heapq
+import itertools
+import os
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from shared.domain.game_snapshot import GameSnapshot
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from table_detector.domain.omaha_engine import OmahaEngine, OmahaEngineException, WrongPlayerAmount
+from table_detector.services.engine_state_cache_service import get_engine_state_cache
+from table_detector.utils.metrics import metrics
+
+Pending = Tuple[Tuple[Position, Tuple[MoveType, ...]], ...]
+
+
+class ActionSequenceRecovery:
+    """
+    Bounded best-first search for the smallest edit of a frame's detected
+    actions the engine accepts: a missing fold/check inserted for the seat
+    to act, or a spurious detected action dropped.
+
+    Candidates are ordered by edit count, then by dropped detections (an
+    inserted action keeps every detection) and by how many detected actions
+    are still left, so the first complete sequence found has the fewest
+    edits. Every candidate applies one action to a fork of its parent's
+    engine (the search starts from the cached new hand state; forks of the
+    native backend cost microseconds), and the search gives up after
+    ``max_edits`` edits or ``time_budget`` seconds.
+
+    Metrics: ``action_recovery.recovered``, ``action_recovery.failed``,
+    ``action_recovery.edits`` and ``action_recovery.candidates`` counters,
+    ``action_recovery.seconds``.
+    """
+
+    def __init__(self, max_edits: int = 2, time_budget: float = 0.02):
+        self.max_edits = max_edits
+        self.time_budget = time_budget
+
+    @classmethod
+    def from_env(cls) -> Optional['ActionSequenceRecovery']:
+        if os.getenv('ACTION_RECOVERY', 'true').lower() != 'true':
+            return None
+        return cls(max_edits=int(os.getenv('ACTION_RECOVERY_MAX_EDITS', '2')),
+                   time_budget=float(os.getenv('ACTION_RECOVERY_BUDGET', '0.02')))
+
+    def recover(self, position_actions: Dict[Position, List[MoveType]]) -> Optional[Tuple[OmahaEngine, List[str]]]:
+        """Engine with the edited actions applied and the edits made, None when nothing was found in budget."""
+        started = time.perf_counter()
+        deadline = started + self.time_budget
+        result = None
+        candidates = 0
+
+        pending: Pending = tuple((position, tuple(actions)) for position, actions in position_actions.items())
+        root = self._new_hand(len(position_actions))
+        order = itertools.count()
+        # (edits, drops, actions left, order, parent engine, step to apply, pending actions, edits made);
+        # queued engines are never changed, a step is applied to a fork of its parent
+        queue = [(0, 0, self._left(pending), next(order), root, None, pending, ())]
+        seen = set()
+
+        while queue and time.perf_counter() < deadline:
+            cost, drops, _, _, engine, step, pending, edits = heapq.heappop(queue)
+            candidates += 1
+            if step is not None:
+                if engine.poker_state.actor_index is None:
+                    continue
+                engine = engine.fork()
+                try:
+                    engine.process_action(*step)
+                except OmahaEngineException:
+                    continue
+
+            if not self._left(pending):
+                result = engine, list(edits)
+                break
+
+            key = (self._applied_steps(engine), pending)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            for child_cost, child_step, child_pending, child_edits in self._children(engine, cost, pending, edits):
+                child_drops = drops + (child_step is None)
+                heapq.heappush(queue, (child_cost, child_drops, self._left(child_pending), next(order), engine,
+                                       child_step, child_pending, child_edits))
+
+        metrics.observe('action_recovery.seconds', time.perf_counter() - started)
+        metrics.increment('action_recovery.candidates', candidates)
+        metrics.increment('action_recovery.recovered' if result else 'action_recovery.failed')
+        if result:
+            metrics.increment('action_recovery.edits', len(result[1]))
+        return result
+
+    def _children(self, engine: OmahaEngine, cost: int, pending: Pending, edits: tuple):
+        actor = engine.poker_state.actor_index
+        position = engine.seat_mapping[actor] if actor is not None else None
+        moves = dict(pending)
+
+        if position is not None and moves.get(position):
+            yield cost, (position, moves[position][0]), self._pop(pending, position), edits
+
+        if cost >= self.max_edits:
+            return
+
+        if position is not None:
+            # A seat with nothing to call checks, otherwise it folds
+            calling_amount = engine.poker_state.checking_or_calling_amount
+            missing = MoveType.CHECK if not calling_amount else MoveType.FOLD
+            yield cost + 1, (position, missing), pending, edits + (f"insert {missing} for {position.name}",)
+
+        for dropped, actions in pending:
+            if actions:
+                yield (cost + 1, None, self._pop(pending, dropped),
+                       edits + (f"drop {actions[0]} of {dropped.name}",))
+
+    @staticmethod
+    def _new_hand(player_count: int) -> OmahaEngine:
+        engine_cache = get_engine_state_cache()
+        if engine_cache is not None:
+            return engine_cache.replay(player_count, {})
+        return OmahaEngine(player_count)
+
+    @staticmethod
+    def _pop(pending: Pending, position: Position) -> Pending:
+        return tuple((other, actions[1:] if other == position else actions) for other, actions in pending)
+
+    @staticmethod
+    def _left(pending: Pending) -> int:
+        return sum(len(actions) for _, actions in pending)
+
+    @staticmethod
+    def _applied_steps(engine: OmahaEngine) -> tuple:
+        return tuple(step for moves in engine.get_moves_by_street().values() for step in moves)
+
+
+@lru_cache(maxsize=None)
+def get_action_recovery() -> Optional[ActionSequenceRecovery]:
+    """Process-wide action recovery (None when ACTION_RECOVERY=false)."""
+    return ActionSequenceRecovery.from_env()
+
+
+def recover_moves(game_snapshot: GameSnapshot, position_actions: Dict[Position, List[MoveType]],
+                  error: OmahaEngineException, recovery: Optional[ActionSequenceRecovery]) -> GameSnapshot:
+    """
+    Fill the snapshot's moves with the smallest accepted edit of ``position_actions``, re-raises ``error``
+    when there is none. Recovered moves are guessed rather than replayed, so ``moves`` is listed in ``stale``.
+    """
+    if recovery is None or isinstance(error, WrongPlayerAmount):
+        raise error
+
+    recovered = recovery.recover(position_actions)
+    if recovered is None:
+        raise error
+
+    engine, edits = recovered
+    logger.warning(f"🩹 Recovered actions with {len(edits)} edit(s) ({', '.join(edits)}) after: {error}")
+    game_snapshot.moves = engine.get_moves_by_street()
+    game_snapshot.stale.add('moves')
+    return game_snapshot
@@ -0,0 +1,262 @@
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+from loguru import logger
+
+from table_detector.services.frame_store_service import FrameStore
+from table_detector.utils.fs_utils import get_results_root
+from table_detector.utils.metrics import metrics
+from table_detector.utils.opencv_utils import pil_to_cv2, IMAGE_CODECS, write_image
+
+DROP_NEWEST = 'drop_newest'
+DROP_OLDEST = 'drop_oldest'
+DROP_POLICIES = (DROP_NEWEST, DROP_OLDEST)
+
+
+@dataclass
+class ArchiveJob:
+    path: Path
+    image: Optional[Union[Image.Image, np.ndarray]] = None
+    text: Optional[str] = None
+    # Cycle jobs (content-addressed layout): window_name -> image, plus the window list
+    frames: Optional[Dict[str, Union[Image.Image, np.ndarray]]] = None
+    windows: Optional[list] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class ArchiveWriter:
+    """
+    Background writer for archived captures.
+
+    The detection cycle only enqueues jobs; encoding and disk I/O happen on a
+    dedicated thread. The queue is bounded and, when it is full, jobs are
+    dropped according to ``drop_policy`` instead of blocking the caller.
+
+    With a ``frame_store`` the cycle captures go to the content-addressed store
+    (one object per distinct frame plus a manifest) instead of the legacy
+    ``<date>/<time>/<window>/`` folder tree.
+
+    ``lag_seconds`` in the stats is the age of the oldest job not written yet
+    (0 when the queue is idle).
+    """
+
+    def __init__(self, codec: str = 'png', max_queue_size: int = 64, drop_policy: str = DROP_OLDEST,
+                 frame_store: FrameStore = None):
+        if codec not in IMAGE_CODECS:
+            raise ValueError(f"Unsupported archive codec: {codec}. Supported: {list(IMAGE_CODECS)}")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unsupported drop policy: {drop_policy}. Supported: {list(DROP_POLICIES)}")
+
+        self.codec = codec
+        self.extension = IMAGE_CODECS[codec][0]
+        self.drop_policy = drop_policy
+        self.frame_store = frame_store
+        self._queue: "queue.Queue[Optional[ArchiveJob]]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._closing = False
+        # Enqueue time of the job being written, None while the writer waits
+        self._writing_since: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="archive-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls) -> 'ArchiveWriter':
+        codec = os.getenv('ARCHIVE_CODEC', 'png').lower()
+        layout = os.getenv('ARCHIVE_LAYOUT', 'tree').lower()
+        if layout not in ('tree', 'cas'):
+            raise ValueError(f"Unsupported archive layout: {layout}. Supported: ['tree', 'cas']")
+
+        return cls(
+            codec=codec,
+            max_queue_size=int(os.getenv('ARCHIVE_QUEUE_SIZE', '64')),
+            drop_policy=os.getenv('ARCHIVE_DROP_POLICY', DROP_OLDEST).lower(),
+            frame_store=FrameStore(get_results_root(), codec) if layout == 'cas' else None
+        )
+
+    def submit_cycle(self, timestamp_folder, captures: Dict[str, Tuple[str, str, Image.Image]], windows: list,
+                     windows_text: str) -> bool:
+        """
+        Queue all captures of one detection cycle.
+
+        Args:
+            timestamp_folder: Legacy cycle folder (resources/results/<date>/<time>)
+            captures: window_name -> (window folder, filename, image)
+            windows: Raw window info dicts of the cycle
+            windows_text: Formatted window list for windows.txt
+        """
+        if self.frame_store is None:
+            accepted = True
+            for folder, filename, image in captures.values():
+                accepted &= self.submit_image(folder, filename, image)
+            accepted &= self.submit_text(Path(timestamp_folder) / "windows.txt", windows_text)
+            return accepted
+
+        frames = {window_name: image.copy() if isinstance(image, Image.Image) else image
+                  for window_name, (_, _, image) in captures.items()}
+        manifest_windows = [{'title': w['title'], 'process': w['process'], 'rect': list(w['rect'])} for w in windows]
+        return self._enqueue(ArchiveJob(path=Path(timestamp_folder), frames=frames, windows=manifest_windows))
+
+    def submit_cycle_log(self, timestamp_folder, text: str) -> bool:
+        if self.frame_store is None:
+            return self.submit_text(Path(timestamp_folder) / "app.log", text)
+        return self._enqueue(ArchiveJob(path=Path(timestamp_folder), text=text, frames={}))
+
+    def submit_image(self, folder, filename: str, image: Union[Image.Image, np.ndarray]) -> bool:
+        """
+        Queue an image for writing. ``filename`` extension is replaced by the codec's one.
+
+        PIL images are copied so the caller may close the original right away;
+        numpy arrays are expected to be owned by the writer from now on.
+        """
+        if isinstance(image, Image.Image):
+            image = image.copy()
+        path = Path(folder) / (Path(filename).stem + self.extension)
+        return self._enqueue(ArchiveJob(path=path, image=image))
+
+    def submit_text(self, path, text: str) -> bool:
+        return self._enqueue(ArchiveJob(path=Path(path), text=text))
+
+    def _enqueue(self, job: ArchiveJob) -> bool:
+        with self._lock:
+            # Once closing, nothing may evict the shutdown sentinel
+            if self._closing:
+                return False
+            try:
+                self._queue.put_nowait(job)
+                return True
+            except queue.Full:
+                pass
+
+            if self.drop_policy == DROP_OLDEST:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self._record_drop()
+                    self._queue.put_nowait(job)
+                    return True
+                except (queue.Empty, queue.Full):
+                    pass
+
+            self._record_drop()
+            return False
+
+    def _record_drop(self):
+        """Count a dropped job; called with ``_lock`` held."""
+        self._dropped += 1
+        metrics.increment('archive.dropped')
+        logger.warning(f"⚠️ Archive queue full, dropped a job ({self.drop_policy})")
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                with self._lock:
+                    self._writing_since = job.enqueued_at
+                self._write(job)
+                with self._lock:
+                    self._written += 1
+                metrics.increment('archive.written')
+            except Exception as e:
+                with self._lock:
+                    self._failed += 1
+                metrics.increment('archive.failed')
+                logger.error(f"❌ Failed to archive {job.path}: {e}")
+            finally:
+                with self._lock:
+                    self._writing_since = None
+                metrics.set_gauge('archive.lag_seconds', self._backlog_lag())
+                self._queue.task_done()
+
+    def _backlog_lag(self) -> float:
+        """Age of the oldest job not written yet: the one being written, else the head of the queue."""
+        with self._lock:
+            oldest = self._writing_since
+        if oldest is None:
+            with self._queue.mutex:
+                head = self._queue.queue[0] if self._queue.queue else None
+            oldest = head.enqueued_at if head is not None else None
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    def _write(self, job: ArchiveJob):
+        if job.frames is not None:
+            self._write_to_frame_store(job)
+            return
+
+        job.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if job.text is not None:
+            with open(job.path, 'w', encoding='utf-8') as f:
+                f.write(job.text)
+            return
+
+        image = job.image
+        if isinstance(image, Image.Image):
+            image = pil_to_cv2(image)
+
+        write_image(job.path, image, self.codec)
+
+    def _write_to_frame_store(self, job: ArchiveJob):
+        cycle_id = self.frame_store.cycle_id(job.path)
+
+        if job.text is not None:
+            self.frame_store.write_cycle_log(cycle_id, job.text)
+            return
+
+        digests = {}
+        for window_name, image in job.frames.items():
+            if isinstance(image, Image.Image):
+                image = pil_to_cv2(image)
+            digests[window_name] = self.frame_store.put_frame(image)
+        self.frame_store.write_manifest(cycle_id, digests, job.windows)
+
+    def get_stats(self) -> dict:
+        lag = self._backlog_lag()
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'written': self._written,
+                'dropped': self._dropped,
+                'failed': self._failed,
+                'lag_seconds': round(lag, 3),
+            }
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until all queued jobs are written. Returns False on timeout."""
+        if timeout is None:
+            self._queue.join()
+            return True
+
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Flush pending jobs and stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+        with self._lock:
+            self._closing = True
+        self.flush(timeout)
+        try:
+            # Blocking put: submissions are refused from now on, so the sentinel cannot be evicted
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("⚠️ Archive writer did not drain in time, abandoning pending jobs")
+            return
+        self._thread.join(timeout)
+        logger.info(f"🗄️ Archive writer stopped: {self.get_stats()}")
@@ -1,11 +1,17 @@
-from typing import Dict, Tuple, List
+import os
+import time
+from typing import Dict, Tuple, List, Optional
 
 import cv2
 import numpy as np
-import pytesseract
 from loguru import logger
 
 from shared.domain.detected_bid import DetectedBid
+from table_detector.services.digit_recognition_service import get_digit_recognizer
+from table_detector.services.ocr_cache_service import get_ocr_cache, region_fingerprint
+from table_detector.services.ocr_engine_service import OcrEngine, get_ocr_engine
+from table_detector.services.ocr_profile_service import INTERPOLATIONS, OcrProfile, get_ocr_profile
+from table_detector.utils.metrics import metrics
 
 # Player position coordinates (position_id: (x, y, width, height))
 PLAYER_BID_POSITIONS = {
@@ -33,6 +39,12 @@ TESSERACT_CONFIG = (
     "-c load_system_dawg=0 -c load_freq_dawg=0"
 )
 
+# Batched mode: all seat crops stacked in one image, one line of text per seat
+TESSERACT_BATCH_CONFIG = TESSERACT_CONFIG.replace("--psm 7", "--psm 6")
+
+# Blank rows between stacked seat crops, so Tesseract never joins two seats into one line
+BATCH_SEPARATOR_HEIGHT = 40
+
 
 def detect_bids(cv2_image: np.ndarray, debug = False) -> Dict[int, DetectedBid]:
     """
@@ -44,18 +56,13 @@ def detect_bids(cv2_image: np.ndarray, debug = False) -> Dict[int, DetectedBid]:
     Returns:
         Dictionary mapping position number to DetectedBid object
     """
-    detected_bids = {}
-
     try:
         # First extract all regions
-        processed_regions = {}
-        for position, bounds in PLAYER_BID_POSITIONS.items():
-            x, y, w, h = bounds
-            region = cv2_image[y:y + h, x:x + w]
-            processed_regions[position] = _preprocess_bid_region(region)
+        regions = get_bid_regions(cv2_image)
 
         # Visualize all processed regions on single plot
         if debug:
+            processed_regions = {position: _preprocess_bid_region(region) for position, region in regions.items()}
             import matplotlib.pyplot as plt
             fig, axes = plt.subplots(2, 3, figsize=(12, 8))
             axes = axes.ravel()
@@ -65,45 +72,192 @@ def detect_bids(cv2_image: np.ndarray, debug = False) -> Dict[int, DetectedBid]:
             plt.tight_layout()
             plt.show()
 
-        # Process each region for bids
-        for position, processed_region in processed_regions.items():
-            bounds = PLAYER_BID_POSITIONS[position]
-            bid_text = _extract_bid_text(processed_region, bounds)
-
-            if bid_text and _is_valid_bid_text(bid_text):
-                detected_bid = _create_detected_bid(position, bid_text, bounds)
-                detected_bids[position] = detected_bid
-                logger.info(f"Position {position}: ${bid_text}")
-
-        return detected_bids
+        bid_texts, _, _ = read_bid_texts(regions)
+        return bids_from_texts(bid_texts)
 
     except Exception as e:
         logger.error(f"❌ Error detecting bids: {str(e)}")
         return {}
 
 
-def _extract_bid_text(processed_region, bounds: Tuple[int, int, int, int]) -> str:
-    """Extract bid text from specific image region using OCR"""
+def get_bid_regions(cv2_image: np.ndarray) -> Dict[int, np.ndarray]:
+    """Bid region of every seat (views into the screenshot)"""
+    return {position: cv2_image[y:y + h, x:x + w] for position, (x, y, w, h) in PLAYER_BID_POSITIONS.items()}
+
+
+def read_bid_texts(regions: Dict[int, np.ndarray],
+                   ocr_allowed: bool = True) -> Tuple[Dict[int, Optional[str]], List[int], float]:
+    """
+    Bid text of seat regions: native recognizer first, Tesseract only for the seats it
+    is not confident about. Without ``ocr_allowed`` those seats are left unread;
+    returns the texts read, the unread seats and the seconds spent in the Tesseract fallback
+    """
+    bid_texts = {}
+    tesseract_regions = {}
+    for position, region in regions.items():
+        bid_text = _read_bid_text_natively(region)
+        if bid_text is None:
+            tesseract_regions[position] = region
+        else:
+            bid_texts[position] = bid_text
+
+    if not ocr_allowed:
+        return bid_texts, sorted(tesseract_regions), 0.0
+    if not tesseract_regions:
+        return bid_texts, [], 0.0
+
+    started = time.perf_counter()
+    bid_texts.update(_extract_bid_texts({position: _preprocess_bid_region(region)
+                                         for position, region in tesseract_regions.items()}))
+    return bid_texts, [], time.perf_counter() - started
+
+
+def bids_from_texts(bid_texts: Dict[int, Optional[str]]) -> Dict[int, DetectedBid]:
+    """DetectedBid of every seat whose text is a valid amount"""
+    detected_bids = {}
+    for position, bid_text in sorted(bid_texts.items()):
+        bounds = PLAYER_BID_POSITIONS[position]
+
+        if bid_text and _is_valid_bid_text(bid_text):
+            detected_bid = _create_detected_bid(position, bid_text, bounds)
+            detected_bids[position] = detected_bid
+            logger.info(f"Position {position}: ${bid_text}")
+
+    return detected_bids
+
+
+def _read_bid_text_natively(region: np.ndarray):
+    """Bid text read by the native digit recognizer, None when Tesseract has to read it"""
+    recognizer = get_digit_recognizer()
+    if recognizer is None:
+        return None
+
+    text, confidence = recognizer.recognize(region)
+    if confidence >= recognizer.min_confidence and (not text or _is_valid_bid_text(text)):
+        metrics.increment('bid_ocr.native')
+        return text
+    metrics.increment('bid_ocr.tesseract_fallback')
+    return None
+
+
+def _extract_bid_texts(processed_regions: Dict[int, np.ndarray]) -> Dict[int, str]:
+    """
+    Tesseract reads of preprocessed seat regions. Regions read before come from the
+    OCR result cache; the others are read with one call unless BATCHED_OCR=false
+    """
+    cache = get_ocr_cache()
+    bid_texts = {}
+    fingerprints = {}
+    uncached_regions = {}
+    for position, processed_region in processed_regions.items():
+        if cache is not None:
+            fingerprints[position] = region_fingerprint(processed_region)
+            cached_text = cache.get(fingerprints[position])
+            if cached_text is not None:
+                bid_texts[position] = cached_text
+                continue
+        uncached_regions[position] = processed_region
+
+    if not uncached_regions:
+        return bid_texts
+
+    started = time.perf_counter()
+    if len(uncached_regions) > 1 and os.getenv('BATCHED_OCR', 'true').lower() == 'true':
+        ocr_texts = _extract_bid_texts_batched(uncached_regions)
+    else:
+        ocr_texts = {position: _extract_bid_text(processed_region, PLAYER_BID_POSITIONS[position])
+                     for position, processed_region in uncached_regions.items()}
+    seconds_per_region = (time.perf_counter() - started) / len(uncached_regions)
+
+    for position, text in ocr_texts.items():
+        # Failed reads (None) are retried next time
+        if cache is not None and text is not None:
+            cache.put(fingerprints[position], text, seconds_per_region)
+    bid_texts.update(ocr_texts)
+    return bid_texts
+
+
+def _stitch_regions(processed_regions: Dict[int, np.ndarray]) -> Tuple[np.ndarray, Dict[int, Tuple[int, int]]]:
+    """
+    Stack preprocessed seat regions (dark text on white) into one image, separated
+    by blank rows. Returns the image and every seat's vertical band (top, bottom).
+    """
+    width = max(region.shape[1] for region in processed_regions.values())
+    rows = []
+    bands = {}
+    top = BATCH_SEPARATOR_HEIGHT
+    rows.append(np.full((BATCH_SEPARATOR_HEIGHT, width), 255, dtype=np.uint8))
+
+    for position, region in processed_regions.items():
+        height = region.shape[0]
+        padded = np.full((height, width), 255, dtype=np.uint8)
+        padded[:, :region.shape[1]] = region
+        rows.append(padded)
+        rows.append(np.full((BATCH_SEPARATOR_HEIGHT, width), 255, dtype=np.uint8))
+        bands[position] = (top, top + height)
+        top += height + BATCH_SEPARATOR_HEIGHT
+
+    return np.vstack(rows), bands
+
+
+def _extract_bid_texts_batched(processed_regions: Dict[int, np.ndarray],
+                               engine: OcrEngine = None) -> Dict[int, Optional[str]]:
+    """
+    Read all seat regions with a single image_to_data call; words go back to seats
+    by bounding box. Every seat reads as None when the call fails
+    """
+    stitched, bands = _stitch_regions(processed_regions)
+    try:
+        data = (engine or get_ocr_engine()).image_to_data(stitched, config=TESSERACT_BATCH_CONFIG)
+    except Exception as e:
+        logger.error(f"❌ Error extracting bid texts of positions {list(processed_regions)}: {str(e)}")
+        return {position: None for position in processed_regions}
+
+    metrics.increment('bid_ocr.tesseract_batches')
+    words_by_position = {position: [] for position in processed_regions}
+    for word in _collect_valid_texts(data):
+        center_y = word['top'] + word['height'] / 2
+        for position, (top, bottom) in bands.items():
+            if top <= center_y < bottom:
+                # Back to the seat region's own coordinates
+                words_by_position[position].append(dict(word, top=word['top'] - top))
+                break
+
+    bid_texts = {}
+    for position, words in words_by_position.items():
+        words.sort(key=lambda x: x['conf'], reverse=True)
+        bid_texts[position] = _combine_bid_detections(words)
+    return bid_texts
+
+
+def _collect_valid_texts(data: Dict[str, list]) -> List[Dict]:
+    """Non-empty image_to_data words with decent confidence"""
+    valid_texts = []
+    for i in range(len(data['text'])):
+        text = data['text'][i].strip()
+        conf = int(float(data['conf'][i]))
+
+        # Only consider non-empty text with decent confidence
+        if text and conf > 40:
+            valid_texts.append({
+                'text': text,
+                'conf': conf,
+                'left': data['left'][i],
+                'top': data['top'][i],
+                'width': data['width'][i],
+                'height': data['height'][i]
+            })
+    return valid_texts
+
+
+def _extract_bid_text(processed_region, bounds: Tuple[int, int, int, int], engine: OcrEngine = None) -> Optional[str]:
+    """Extract bid text from specific image region using OCR, None when OCR failed"""
     try:
         # Get detailed OCR data with confidence scores and positions
-        data = pytesseract.image_to_data(processed_region, config=TESSERACT_CONFIG, output_type=pytesseract.Output.DICT)
+        data = (engine or get_ocr_engine()).image_to_data(processed_region, config=TESSERACT_CONFIG)
 
         # Filter for high-confidence text detections
-        valid_texts = []
-        for i in range(len(data['text'])):
-            text = data['text'][i].strip()
-            conf = int(data['conf'][i])
-
-            # Only consider non-empty text with decent confidence
-            if text and conf > 40:
-                valid_texts.append({
-                    'text': text,
-                    'conf': conf,
-                    'left': data['left'][i],
-                    'top': data['top'][i],
-                    'width': data['width'][i],
-                    'height': data['height'][i]
-                })
+        valid_texts = _collect_valid_texts(data)
 
         if not valid_texts:
             return ""
@@ -118,7 +272,7 @@ def _extract_bid_text(processed_region, bounds: Tuple[int, int, int, int]) -> st
 
     except Exception as e:
         logger.error(f"❌ Error extracting bid text at {bounds}: {str(e)}")
-        return ""
+        return None
 
 
 def _combine_bid_detections(detections: List[Dict]) -> str:
@@ -192,10 +346,14 @@ def _combine_bid_detections(detections: List[Dict]) -> str:
     return detections[0]['text']
 
 
-def _preprocess_bid_region(region: np.ndarray, scale_factor = 8) -> np.ndarray:
+def _preprocess_bid_region(region: np.ndarray, scale_factor = None, profile: OcrProfile = None) -> np.ndarray:
     """
     Preprocess image region for optimal OCR performance
 
+    Scale factor, interpolation and threshold come from the layout's OCR profile
+    (see ocr_profile_service and tools/ocr_preprocess_sweep); the default profile
+    is 8x cubic upscaling and a fixed threshold of 133
+
     Steps:
     1. Convert to grayscale
     2. Apply binary threshold with inversion (white text on black background):
@@ -213,13 +371,23 @@ def _preprocess_bid_region(region: np.ndarray, scale_factor = 8) -> np.ndarray:
     else:
         gray = region.copy()
 
-    upscaled = cv2.resize(gray, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_CUBIC)
+    profile = profile or get_ocr_profile()
+    scale_factor = scale_factor or profile.scale_factor
+    upscaled = cv2.resize(gray, None, fx=scale_factor, fy=scale_factor,
+                          interpolation=INTERPOLATIONS[profile.interpolation])
 
     # Binary threshold with inversion (text becomes white on black)
     # THRESH_BINARY_INV: Inverts the output so that text (which is usually darker) becomes white (255) on black (0) background
     # THRESH_OTSU: Automatically determines the optimal threshold value based on image histogram
     # This makes OCR more effective as it works better with white text on black background
-    _, thresh = cv2.threshold(upscaled, 133, 255, cv2.THRESH_BINARY_INV)  # Start with 120
+    if profile.threshold_method == 'otsu':
+        _, thresh = cv2.threshold(upscaled, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    elif profile.threshold_method == 'adaptive':
+        # Text brighter than its neighbourhood by more than 10 levels; block of about one glyph
+        thresh = cv2.adaptiveThreshold(upscaled, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV,
+                                       scale_factor * 8 + 1, -10)
+    else:
+        _, thresh = cv2.threshold(upscaled, profile.threshold, 255, cv2.THRESH_BINARY_INV)  # Start with 120
 
     return thresh
 
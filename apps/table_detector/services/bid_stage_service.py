@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from shared.domain.detected_bid import DetectedBid
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.bid_detection_service import bids_from_texts, get_bid_regions, read_bid_texts
+from table_detector.utils.metrics import metrics
+
+
+class BidDetectionStage:
+    """
+    Change-gated bid detection of live windows.
+
+    A seat is read again only when its bid region differs from the pixels it
+    was last read from; unchanged seats keep their bid. Tesseract reads (seats
+    the native digit recognizer is not sure about) share ``ocr_budget``
+    seconds per detection cycle; native reads are not charged. Once it is
+    spent, changed seats needing
+    Tesseract keep their previous bid, are flagged in ``GameSnapshot.stale``
+    as ``bids.<seat>`` and are read in a later cycle.
+
+    Metrics: ``bid_stage.seats_read``, ``bid_stage.seats_reused``,
+    ``bid_stage.seats_stale`` counters, ``bid_stage.read_seconds`` (all
+    reads) and ``bid_stage.ocr_seconds`` (the Tesseract fallback).
+    """
+
+    def __init__(self, ocr_budget: float = 0.25):
+        self.ocr_budget = ocr_budget
+        # window name -> seat -> (region last read, its bid)
+        self._windows: Dict[str, Dict[int, Tuple[np.ndarray, Optional[DetectedBid]]]] = {}
+        self._spent = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['BidDetectionStage']:
+        if os.getenv('BID_DETECTION', 'true').lower() != 'true':
+            return None
+        return cls(ocr_budget=float(os.getenv('BID_OCR_BUDGET', '0.25')))
+
+    def start_cycle(self):
+        with self._lock:
+            self._spent = 0.0
+
+    def detect(self, window_name: str, cv2_image: np.ndarray, game_snapshot: GameSnapshot) -> GameSnapshot:
+        regions = get_bid_regions(cv2_image)
+        with self._lock:
+            seats = dict(self._windows.get(window_name, {}))
+            # 0 means no budget limit
+            ocr_allowed = self.ocr_budget <= 0 or self._spent < self.ocr_budget
+
+        changed = {position: region for position, region in regions.items()
+                   if position not in seats or not np.array_equal(seats[position][0], region)}
+
+        bid_texts, unread = {}, []
+        if changed:
+            started = time.perf_counter()
+            bid_texts, unread, ocr_seconds = read_bid_texts(changed, ocr_allowed=ocr_allowed)
+            metrics.observe('bid_stage.read_seconds', time.perf_counter() - started)
+            if ocr_seconds:
+                metrics.observe('bid_stage.ocr_seconds', ocr_seconds)
+                with self._lock:
+                    self._spent += ocr_seconds
+
+        read_bids = bids_from_texts(bid_texts)
+        for position in bid_texts:
+            seats[position] = (changed[position].copy(), read_bids.get(position))
+        for position in unread:
+            game_snapshot.stale.add(f'bids.{position}')
+
+        game_snapshot.bids = {position: bid for position, (_, bid) in sorted(seats.items())
+                              if bid is not None}
+        with self._lock:
+            self._windows[window_name] = seats
+
+        metrics.increment('bid_stage.seats_read', len(bid_texts))
+        metrics.increment('bid_stage.seats_reused', len(regions) - len(changed))
+        metrics.increment('bid_stage.seats_stale', len(unread))
+        return game_snapshot
+
+    def remove(self, window_name: str):
+        with self._lock:
+            self._windows.pop(window_name, None)
@@ -0,0 +1,111 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional, Set
+
+from PIL import Image
+from loguru import logger
+
+from table_detector.domain.captured_window import CapturedWindow
+from table_detector.utils.capture_backend import CaptureBackend
+from table_detector.utils.capture_utils import _to_captured_window, capture_window_name
+from table_detector.utils.metrics import metrics
+
+
+class WindowCapturePool:
+    """
+    Captures windows concurrently on a bounded thread pool.
+
+    Captures are yielded as soon as they complete, so detection of the first
+    table starts while the others are still being captured. Captures not
+    finished ``timeout`` seconds after the cycle submitted them are abandoned
+    for the cycle: one still waiting for a worker is cancelled, a running one
+    has its image closed when it finally returns. The window of a running
+    capture is skipped in later cycles until it returns, so a hung window can
+    hold at most one worker.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, max_workers: int = None, timeout: float = None):
+        self.max_workers = max_workers or int(os.getenv('CAPTURE_WORKERS', '4'))
+        self.timeout = timeout or float(os.getenv('CAPTURE_TIMEOUT', '2.0'))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="capture")
+        self._in_flight: Dict[int, Future] = {}
+
+    def capture(self, windows: List[dict], backend: CaptureBackend,
+                skip_windows: Set[str] = frozenset()) -> Iterator[CapturedWindow]:
+        """Capture ``windows`` except those whose window name is in ``skip_windows``."""
+        windows = sorted(windows, key=lambda w: w['hwnd'])
+        logger.debug(f"Found {len(windows)} windows to capture ({self.max_workers} workers)")
+
+        pending = {}
+        deadline = time.monotonic() + self.timeout
+        for i, window in enumerate(windows, 1):
+            if capture_window_name(i, window['title']) in skip_windows:
+                continue
+
+            previous = self._in_flight.get(window['hwnd'])
+            if previous is not None and not previous.done():
+                logger.warning(f"⏳ Skipping {window['title']}: previous capture has not returned yet")
+                metrics.increment('capture.skipped_busy')
+                continue
+
+            started_at = [None]
+            future = self._executor.submit(self._capture_one, backend, window, started_at)
+            self._in_flight[window['hwnd']] = future
+            pending[future] = (i, window, started_at)
+
+        while pending:
+            done, _ = wait(pending, timeout=self.POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                i, window, started_at = pending.pop(future)
+                captured = self._collect(future, i, window, started_at[0])
+                if captured:
+                    yield captured
+
+            if pending and time.monotonic() > deadline:
+                for future, (i, window, started_at) in pending.items():
+                    metrics.increment('capture.timeouts')
+                    if not future.cancel():
+                        future.add_done_callback(self._close_late_result)
+                    state = "still waiting for a worker" if started_at[0] is None else "still running"
+                    logger.error(f"  ✗ Capture of {window['title']} timed out after {self.timeout:.1f}s ({state})")
+                pending.clear()
+
+    @staticmethod
+    def _capture_one(backend: CaptureBackend, window: dict, started_at: list) -> Optional[Image.Image]:
+        started_at[0] = time.monotonic()
+        return backend.capture_window(window)
+
+    @staticmethod
+    def _close_late_result(future: Future):
+        """Done callback of an abandoned capture: nobody collects its image, release it."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        img = future.result()
+        if img:
+            img.close()
+            metrics.increment('capture.late_results_closed')
+
+    @staticmethod
+    def _collect(future: Future, index: int, window: dict, started_at: float) -> Optional[CapturedWindow]:
+        try:
+            img = future.result()
+        except Exception as e:
+            img = None
+            logger.error(f"  ✗ Capture of {window['title']} raised: {e}")
+
+        if not img:
+            metrics.increment('capture.failed')
+            logger.error(f"  ✗ Failed to capture {window['title']}")
+            return None
+
+        metrics.increment('capture.captured')
+        metrics.set_gauge('capture.latency_seconds', time.monotonic() - started_at)
+        logger.debug(f"  ✓ Captured {window['title']} ({window['process']})")
+        return _to_captured_window(index, window, img)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
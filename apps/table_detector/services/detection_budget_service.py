@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from loguru import logger
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.utils.metrics import metrics
+
+# Snapshot parts in order of value; the first one is always detected
+DETECTOR_RANKING = ('player_cards', 'table_cards', 'positions', 'actions')
+
+
+class CycleBudget:
+    """
+    Latency budget of one detection cycle.
+
+    The deadline is wall-clock time, so detection worker processes can check
+    it as well. Once a detector is not expected to finish before the
+    deadline it is skipped (see ``PokerGameProcessor.detect_game_elements``).
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> Optional['CycleBudget']:
+        seconds = float(os.getenv('CYCLE_BUDGET', '0'))
+        return cls(seconds) if seconds > 0 else None
+
+    def start(self, now: float = None) -> float:
+        self.deadline = (time.time() if now is None else now) + self.seconds
+        return self.deadline
+
+    def remaining(self, now: float = None) -> float:
+        if self.deadline is None:
+            return self.seconds
+        return self.deadline - (time.time() if now is None else now)
+
+
+class DetectorCosts:
+    """Moving average of every detector's duration, to predict whether it fits the time left."""
+
+    def __init__(self, smoothing: float = 0.3):
+        self.smoothing = smoothing
+        self._estimates: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, part: str, seconds: float):
+        with self._lock:
+            previous = self._estimates.get(part)
+            self._estimates[part] = seconds if previous is None else \
+                previous + self.smoothing * (seconds - previous)
+
+    def fits(self, part: str, deadline: float, now: float = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            return now + self._estimates.get(part, 0.0) <= deadline
+
+
+class DetectionCache:
+    """
+    Last freshly detected value of every snapshot part, per window.
+
+    Parts skipped for lack of budget are filled from here and stay flagged
+    in ``GameSnapshot.stale``. Metrics: ``degradation.<part>.reused`` and
+    ``degradation.<part>.missing`` (skipped with nothing cached).
+    """
+
+    def __init__(self):
+        self._parts: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    def fill_stale(self, window_name: str, game_snapshot: GameSnapshot) -> GameSnapshot:
+        with self._lock:
+            cached = self._parts.setdefault(window_name, {})
+            for part in DETECTOR_RANKING:
+                if part not in game_snapshot.stale:
+                    cached[part] = getattr(game_snapshot, part)
+                elif part in cached:
+                    setattr(game_snapshot, part, cached[part])
+                    metrics.increment(f'degradation.{part}.reused')
+                else:
+                    metrics.increment(f'degradation.{part}.missing')
+
+        if game_snapshot.stale:
+            logger.info(f"⏳ {window_name}: budget exhausted, stale parts: {sorted(game_snapshot.stale)}")
+        return game_snapshot
+
+    def remove(self, window_name: str):
+        with self._lock:
+            self._parts.pop(window_name, None)
@@ -0,0 +1,261 @@
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.domain.captured_window import CapturedWindow
+from table_detector.services.image_capture_service import ImageCaptureService
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.services.send_filter_service import SnapshotSendFilter
+from table_detector.utils.fs_utils import create_timestamp_folder
+from table_detector.utils.log_accumulator import LogAccumulator
+from table_detector.utils.metrics import MetricsReporter, metrics
+from table_detector.utils.pipeline import Pipeline, PipelineStage
+
+DETECTION_RESULT_TIMEOUT = 30
+
+
+@dataclass
+class WindowItem:
+    """One changed window travelling through the pipeline."""
+    window_name: str
+    captured_image: Optional[CapturedWindow] = None
+    # Wall-clock CYCLE_BUDGET deadline of the capture cycle
+    deadline: Optional[float] = None
+    cv2_image: Optional[np.ndarray] = None
+    pending_detection: Optional["Future[GameSnapshot]"] = None
+    game_snapshot: Optional[GameSnapshot] = None
+    message: Any = None
+
+
+@dataclass
+class CycleEnd:
+    """Marks the end of a capture cycle; carries the closed windows and the cycle's log downstream."""
+    timestamp_folder: Path
+    expected_window_names: Set[str]
+    deadline: Optional[float] = None
+    log_accumulator: Optional[LogAccumulator] = None
+    changed_count: int = 0
+    removed_windows: List[str] = field(default_factory=list)
+    messages: List[Any] = field(default_factory=list)
+    # (window name, game snapshot, message) of due heartbeats
+    heartbeats: List[Tuple[str, GameSnapshot, Any]] = field(default_factory=list)
+
+
+class DetectionPipeline:
+    """
+    Streaming detection: capture → change filter → detection → engine → serialization → transport.
+
+    Every stage runs on its own thread with a bounded input queue, so the next
+    capture overlaps detection and sending of the previous one. A full queue
+    blocks the stage feeding it; when detection falls behind, capture slows
+    down to match rather than skipping whole cycles.
+
+    With a ``CycleBudget`` on the processor, every capture cycle starts it
+    and its windows carry the deadline through detection; cycles still in
+    the engine stage after it are counted as over budget.
+
+    Logs are captured from the start of a capture cycle until its end marker
+    leaves the transport stage and archived as the cycle's ``app.log`` when
+    it had changed windows (stages overlap, so the next cycle's capture
+    shows up in it too). Closed windows are forgotten by the engine stage
+    and the send filter in the transport stage, in order with their updates.
+    """
+
+    def __init__(self, image_capture_service: ImageCaptureService, poker_game_processor: PokerGameProcessor,
+                 create_game_update: Callable[[GameSnapshot, str], Any],
+                 create_removal_messages: Callable[[List[str]], List[Any]],
+                 send_message: Callable[[Any], bool],
+                 cycle_interval: float, queue_size: int = 8, send_filter: SnapshotSendFilter = None,
+                 metrics_reporter: MetricsReporter = None):
+        self.image_capture_service = image_capture_service
+        self.poker_game_processor = poker_game_processor
+        self.create_game_update = create_game_update
+        self.create_removal_messages = create_removal_messages
+        self.send_message = send_message
+        self.cycle_interval = cycle_interval
+        self.send_filter = send_filter
+        self.metrics_reporter = metrics_reporter
+
+        # Change filter state of the cycle in progress
+        self._current_hashes: Dict[str, str] = {}
+        self._changed_count = 0
+
+        self.pipeline = Pipeline([
+            PipelineStage('change_filter', self._filter_changes, queue_size),
+            PipelineStage('detection', self._detect, queue_size),
+            PipelineStage('engine', self._apply_engine, queue_size),
+            PipelineStage('serialization', self._serialize, queue_size),
+            PipelineStage('transport', self._transport, queue_size),
+        ])
+        self._stop_event = threading.Event()
+        self._capture_thread = threading.Thread(target=self._capture_loop, name="pipeline-capture", daemon=True)
+
+    def start(self):
+        self.pipeline.start()
+        self._capture_thread.start()
+        logger.info(f"🚰 Detection pipeline started (cycle interval: {self.cycle_interval}s)")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop_event.set()
+        self._capture_thread.join(timeout)
+        self.pipeline.stop(timeout)
+        logger.info(f"🚰 Detection pipeline stopped, queue depths: {self.pipeline.get_queue_depths()}")
+
+    def is_running(self) -> bool:
+        return self._capture_thread.is_alive()
+
+    # === Capture (source) ===
+
+    def _capture_loop(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                self.run_capture_cycle()
+            except Exception as e:
+                logger.error(f"❌ Capture cycle failed: {e}")
+            elapsed = time.monotonic() - started
+            metrics.observe('pipeline.capture.latency_seconds', elapsed)
+            if self.metrics_reporter:
+                self.metrics_reporter.cycle_finished()
+            self._stop_event.wait(max(self.cycle_interval - elapsed, 0))
+
+    def run_capture_cycle(self):
+        timestamp_folder = create_timestamp_folder(with_milliseconds=True)
+        log_accumulator = LogAccumulator()
+        log_accumulator.start_capture()
+        try:
+            # Cycles overlap in the pipeline, so the deadline travels with the items
+            cycle_budget = self.poker_game_processor.cycle_budget
+            deadline = cycle_budget.start() if cycle_budget else None
+            captured_windows, expected_window_names = self.image_capture_service.capture_cycle(timestamp_folder)
+
+            for captured_window in captured_windows:
+                self.pipeline.put(WindowItem(window_name=captured_window.window_name, captured_image=captured_window,
+                                             deadline=deadline))
+        except Exception as e:
+            # Keep the log of a failed cycle for debugging, like the scheduled cycle does
+            logger.error(f"❌ Capture cycle failed: {e}")
+            self._finish_cycle_log(log_accumulator, timestamp_folder, write=True)
+            return
+        self.pipeline.put(CycleEnd(timestamp_folder=timestamp_folder, expected_window_names=expected_window_names,
+                                   deadline=deadline, log_accumulator=log_accumulator))
+
+    def _finish_cycle_log(self, log_accumulator: LogAccumulator, timestamp_folder: Path, write: bool):
+        log_accumulator.stop_capture()
+        if write and log_accumulator.has_logs():
+            self.image_capture_service.write_cycle_log(timestamp_folder, log_accumulator.get_text())
+        log_accumulator.clear()
+
+    # === Stages ===
+
+    def _filter_changes(self, item):
+        if isinstance(item, CycleEnd):
+            item.removed_windows = self.image_capture_service.finish_cycle(
+                self._current_hashes, item.expected_window_names, self._changed_count
+            )
+            item.changed_count = self._changed_count
+            self._current_hashes = {}
+            self._changed_count = 0
+            return [item]
+
+        if self.image_capture_service.check_changed(item.captured_image, self._current_hashes):
+            self._changed_count += 1
+            return [item]
+
+        item.captured_image.close()
+        return []
+
+    def _detect(self, item):
+        if isinstance(item, CycleEnd):
+            return [item]
+
+        try:
+            self.poker_game_processor.validate_image(item.captured_image)
+            item.cv2_image = item.captured_image.get_cv2_image()
+        except Exception as e:
+            logger.error(f"❌ Error processing {item.window_name}: {str(e)}")
+            return []
+        finally:
+            item.captured_image.close()
+            item.captured_image = None
+
+        detection_pool = self.poker_game_processor.detection_pool
+        if detection_pool:
+            # The engine stage waits for the result, so several windows are in the pool at once
+            item.pending_detection = detection_pool.submit(item.cv2_image, detect_only=True, deadline=item.deadline)
+        else:
+            item.game_snapshot = PokerGameProcessor.detect_game_elements(item.cv2_image, deadline=item.deadline)
+        return [item]
+
+    def _apply_engine(self, item):
+        frame_history = self.poker_game_processor.frame_history
+
+        if isinstance(item, CycleEnd):
+            # In order with the engine work of the windows' earlier frames
+            for window_name in item.removed_windows:
+                self.poker_game_processor.forget_window(window_name)
+            self.poker_game_processor.end_cycle(deadline=item.deadline)
+            if frame_history:
+                frame_history.check_manual_trigger()
+            if self.poker_game_processor.bid_stage:
+                # The bid OCR budget is per cycle
+                self.poker_game_processor.bid_stage.start_cycle()
+            return [item]
+
+        if item.pending_detection is not None:
+            try:
+                item.game_snapshot = item.pending_detection.result(timeout=DETECTION_RESULT_TIMEOUT)
+            except Exception as e:
+                logger.error(f"❌ Error processing {item.window_name}: {str(e)}")
+                return []
+            item.pending_detection = None
+
+        self.poker_game_processor.detect_bids(item.window_name, item.cv2_image, item.game_snapshot)
+        self.poker_game_processor.finish_window(item.window_name, item.game_snapshot)
+        if frame_history:
+            frame_history.record(item.window_name, item.cv2_image, item.game_snapshot)
+        item.cv2_image = None
+        return [item]
+
+    def _serialize(self, item):
+        if isinstance(item, CycleEnd):
+            if item.removed_windows:
+                item.messages = self.create_removal_messages(item.removed_windows)
+            if self.send_filter:
+                item.heartbeats = [(window_name, game_snapshot, self.create_game_update(game_snapshot, window_name))
+                                   for game_snapshot, window_name in
+                                   self.send_filter.due_heartbeats(exclude=set(item.removed_windows))]
+            return [item]
+
+        if self.send_filter and not self.send_filter.should_send(item.window_name, item.game_snapshot):
+            return []
+
+        item.message = self.create_game_update(item.game_snapshot, item.window_name)
+        return [item]
+
+    def _transport(self, item):
+        if isinstance(item, CycleEnd):
+            for message in item.messages:
+                self.send_message(message)
+            if self.send_filter:
+                for window_name in item.removed_windows:
+                    self.send_filter.remove(window_name)
+            updates = item.heartbeats
+        else:
+            updates = [(item.window_name, item.game_snapshot, item.message)]
+
+        for window_name, game_snapshot, message in updates:
+            # Only content the server received suppresses later sends
+            if self.send_message(message) and self.send_filter:
+                self.send_filter.mark_sent(window_name, game_snapshot)
+
+        if isinstance(item, CycleEnd) and item.log_accumulator:
+            self._finish_cycle_log(item.log_accumulator, item.timestamp_folder, write=item.changed_count > 0)
+        return []
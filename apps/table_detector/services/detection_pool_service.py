@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor, Future
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.template_registry import TemplateRegistry
+from table_detector.utils.metrics import metrics
+
+FRAME_SHAPE = (584, 784, 3)
+
+# Per worker process: shared memory blocks attached so far (kept open for the life of the worker)
+_worker_memory: Dict[str, SharedMemory] = {}
+
+
+def publish_templates(templates_by_category: Dict[str, Dict[str, np.ndarray]]) -> Tuple[SharedMemory, dict]:
+    """
+    Pack all templates into one shared memory block.
+
+    Returns the block (owned by the caller, who must unlink it) and a picklable
+    descriptor that ``attach_templates`` turns back into template arrays.
+    """
+    entries = []
+    offset = 0
+    for category, templates in templates_by_category.items():
+        for name, template in templates.items():
+            template = np.ascontiguousarray(template)
+            entries.append((category, name, offset, template.shape, template.dtype.str))
+            offset += template.nbytes
+
+    memory = SharedMemory(create=True, size=max(offset, 1))
+    for (category, name, start, shape, dtype) in entries:
+        target = np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=start)
+        target[...] = templates_by_category[category][name]
+
+    return memory, {'name': memory.name, 'entries': entries}
+
+
+def attach_templates(descriptor: dict) -> Tuple[SharedMemory, Dict[str, Dict[str, np.ndarray]]]:
+    """Read-only template views over a block created by ``publish_templates``."""
+    memory = SharedMemory(name=descriptor['name'])
+    templates_by_category: Dict[str, Dict[str, np.ndarray]] = {}
+
+    for category, name, offset, shape, dtype in descriptor['entries']:
+        view = np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+        view.setflags(write=False)
+        templates_by_category.setdefault(category, {})[name] = view
+
+    return memory, templates_by_category
+
+
+class SharedFrameSlots:
+    """Fixed set of reusable shared memory blocks, one frame each."""
+
+    def __init__(self, count: int, frame_shape: Tuple[int, int, int] = FRAME_SHAPE):
+        self.frame_shape = frame_shape
+        self.frame_size = int(np.prod(frame_shape))
+        self._blocks: List[SharedMemory] = [SharedMemory(create=True, size=self.frame_size) for _ in range(count)]
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for index in range(count):
+            self._free.put(index)
+
+    def acquire(self, timeout: float = None) -> int:
+        """Index of a free slot; blocks while all slots are in use."""
+        return self._free.get(timeout=timeout)
+
+    def write(self, index: int, frame: np.ndarray) -> str:
+        if frame.shape != self.frame_shape or frame.dtype != np.uint8:
+            raise ValueError(f"Frame {frame.shape}/{frame.dtype} does not fit slot {self.frame_shape}/uint8")
+        target = np.ndarray(self.frame_shape, dtype=np.uint8, buffer=self._blocks[index].buf)
+        np.copyto(target, frame)
+        return self._blocks[index].name
+
+    def release(self, index: int):
+        self._free.put(index)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def _init_worker(templates_descriptor: dict):
+    from table_detector.services.template_matcher_service import TemplateMatchService
+
+    memory, templates_by_category = attach_templates(templates_descriptor)
+    _worker_memory[templates_descriptor['name']] = memory
+    TemplateMatchService.TEMPLATE_REGISTRY.preload(templates_by_category)
+
+
+def _detect_in_worker(slot_name: str, frame_shape: Tuple[int, int, int], detect_only: bool,
+                      deadline: Optional[float], hero_to_act: Optional[bool] = None) -> GameSnapshot:
+    from table_detector.services.poker_game_processor import PokerGameProcessor
+
+    memory = _worker_memory.get(slot_name)
+    if memory is None:
+        memory = _worker_memory[slot_name] = SharedMemory(name=slot_name)
+
+    frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=memory.buf)
+    if detect_only:
+        return PokerGameProcessor.detect_game_elements(frame, deadline=deadline, hero_to_act=hero_to_act)
+    return PokerGameProcessor.create_game_snapshot(frame)
+
+
+class DetectionProcessPool:
+    """
+    Runs ``PokerGameProcessor.create_game_snapshot`` in worker processes.
+
+    Templates are loaded once by the parent and published in a single shared
+    memory block that every worker maps read-only. Frames are copied into a
+    fixed set of shared memory slots (two per worker) and only the slot name
+    crosses the process boundary; ``submit`` blocks while all slots are busy.
+    """
+
+    def __init__(self, workers: int, template_registry: TemplateRegistry = None):
+        from table_detector.services.template_matcher_service import TemplateMatchService
+
+        self.workers = workers
+        registry = template_registry or TemplateMatchService.TEMPLATE_REGISTRY
+        self._templates_memory, descriptor = publish_templates(registry.load_all())
+        self._slots = SharedFrameSlots(workers * 2)
+        # Spawned workers behave the same on Windows and Linux
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(descriptor,)
+        )
+        logger.info(f"🧵 Detection process pool started with {workers} workers "
+                    f"({self._templates_memory.size / 1024:.0f} KB of shared templates)")
+
+    @classmethod
+    def from_env(cls) -> Optional['DetectionProcessPool']:
+        workers = int(os.getenv('DETECTION_WORKERS', '0'))
+        return cls(workers) if workers > 0 else None
+
+    def submit(self, cv2_image: np.ndarray, detect_only: bool = False,
+               deadline: float = None, hero_to_act: bool = None) -> "Future[GameSnapshot]":
+        """
+        Detect a frame in a worker; ``detect_only`` skips the engine (see PokerGameProcessor.apply_engine)
+        and allows a cycle ``deadline`` and a probed ``hero_to_act`` (see PokerGameProcessor.detect_game_elements).
+        """
+        slot = self._slots.acquire()
+        try:
+            slot_name = self._slots.write(slot, cv2_image)
+            future = self._executor.submit(_detect_in_worker, slot_name, cv2_image.shape, detect_only, deadline,
+                                           hero_to_act)
+        except Exception:
+            self._slots.release(slot)
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release(slot))
+        metrics.increment('detection_pool.submitted')
+        return future
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._slots.close()
+        self._templates_memory.close()
+        self._templates_memory.unlink()
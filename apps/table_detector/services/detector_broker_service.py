@@ -0,0 +1,250 @@
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, address_type
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.utils.metrics import metrics
+
+
+class DetectorWorkerError(Exception):
+    """Detection failed in a detector worker, or no worker could finish it."""
+
+
+def default_address() -> str:
+    """Named pipe on Windows, Unix socket in a directory private to the user elsewhere."""
+    if sys.platform == "win32":
+        return r'\\.\pipe\table_detector_detection'
+    return os.path.join(tempfile.gettempdir(), f'table_detector-{os.getuid()}', 'detection.sock')
+
+
+def env_authkey() -> Optional[bytes]:
+    """Shared secret of the broker and its standalone workers (DETECTOR_AUTHKEY), None when unset."""
+    authkey = os.getenv('DETECTOR_AUTHKEY')
+    return authkey.encode() if authkey else None
+
+
+def _make_private_directory(path: str):
+    """Create ``path`` with 0700 permissions; refuse a directory somebody else owns."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    stat = os.lstat(path)
+    if not os.path.isdir(path) or os.path.islink(path) or stat.st_uid != os.getuid():
+        raise DetectorWorkerError(f"Socket directory {path} is not a directory owned by the current user")
+    os.chmod(path, 0o700)
+
+
+@dataclass
+class _Job:
+    payload: dict
+    future: Future
+
+
+_STOP = object()
+
+
+class DetectorBroker:
+    """
+    Capture-side end of standalone detector workers.
+
+    Listens on a local IPC address (named pipe / Unix socket). Detector
+    worker processes (``python -m table_detector.tools.detector_worker``)
+    connect, take one frame at a time and reply with its ``GameSnapshot``.
+    Workers can be started, stopped and restarted independently of capture:
+    the job of a worker that disconnects mid-frame goes back to the queue
+    for the next one, and workers reconnect when capture restarts.
+
+    Connections must present ``authkey``: a random one unless given, the
+    client reads DETECTOR_AUTHKEY so standalone workers can share it. The
+    default Unix socket lives in a 0700 directory of the current user.
+
+    ``submit`` has the signature of ``DetectionProcessPool.submit``. While
+    ``max_pending`` frames wait for a worker it blocks for up to
+    ``submit_timeout`` seconds, then fails the frame's future.
+
+    Metrics: ``detector_broker.workers_connected``, ``detector_broker.submitted``,
+    ``detector_broker.requeued``, ``detector_broker.failed``,
+    ``detector_broker.rejected`` (no room within ``submit_timeout``) counters
+    and ``detector_broker.latency_seconds``.
+    """
+
+    def __init__(self, address: str = None, authkey: bytes = None, max_pending: int = 16,
+                 submit_timeout: float = 5.0):
+        self.address = address or default_address()
+        if address_type(self.address) == 'AF_UNIX':
+            if address is None:
+                _make_private_directory(os.path.dirname(self.address))
+            if os.path.exists(self.address):
+                # Socket file left behind by a previous run
+                os.unlink(self.address)
+
+        self.authkey = authkey or os.urandom(32)
+        self.submit_timeout = submit_timeout
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self._jobs: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._closed = threading.Event()
+        self._accept_thread = threading.Thread(target=self._accept_workers, name="detector-broker", daemon=True)
+        self._accept_thread.start()
+        logger.info(f"🛰️ Detector broker listening on {self.address}")
+
+    @classmethod
+    def from_env(cls) -> Optional['DetectorBroker']:
+        if os.getenv('DETECTOR_BROKER', 'false').lower() != 'true':
+            return None
+        authkey = env_authkey()
+        if authkey is None:
+            raise ValueError("DETECTOR_BROKER=true requires DETECTOR_AUTHKEY, the secret shared with the workers")
+        return cls(address=os.getenv('DETECTOR_ADDRESS') or None, authkey=authkey)
+
+    def submit(self, cv2_image: np.ndarray, detect_only: bool = False,
+               deadline: float = None, hero_to_act: bool = None) -> "Future[GameSnapshot]":
+        if self._closed.is_set():
+            raise DetectorWorkerError("Detector broker is closed")
+
+        future: "Future[GameSnapshot]" = Future()
+        payload = {'frame': cv2_image, 'detect_only': detect_only, 'deadline': deadline, 'hero_to_act': hero_to_act,
+                   'submitted_at': time.time()}
+        try:
+            self._jobs.put(_Job(payload, future), timeout=self.submit_timeout)
+        except queue.Full:
+            metrics.increment('detector_broker.rejected')
+            future.set_exception(DetectorWorkerError(
+                f"No detector worker took a frame within {self.submit_timeout}s, is one running?"))
+            return future
+        metrics.increment('detector_broker.submitted')
+        return future
+
+    def close(self):
+        self._closed.set()
+        try:
+            # accept() is not interrupted by closing the listener on every platform
+            Client(self.address, authkey=self.authkey).close()
+        except OSError:
+            pass
+        self._accept_thread.join(5)
+        self._listener.close()
+
+        # Fail what no worker picked up, then wake the worker threads; never block on a full queue
+        while True:
+            self._fail_pending()
+            try:
+                self._jobs.put_nowait(_STOP)
+                return
+            except queue.Full:
+                continue
+
+    def _fail_pending(self):
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is not _STOP and not job.future.done():
+                job.future.set_exception(DetectorWorkerError("Detector broker closed"))
+
+    def _accept_workers(self):
+        while not self._closed.is_set():
+            try:
+                connection = self._listener.accept()
+            except Exception as e:
+                if not self._closed.is_set():
+                    logger.warning(f"⚠️ Detector worker connection rejected: {e}")
+                continue
+
+            if self._closed.is_set():
+                connection.close()
+                return
+
+            metrics.increment('detector_broker.workers_connected')
+            logger.info("🛰️ Detector worker connected")
+            threading.Thread(target=self._serve_worker, args=(connection,), name="detector-broker-worker",
+                             daemon=True).start()
+
+    def _serve_worker(self, connection):
+        with connection:
+            while True:
+                job = self._jobs.get()
+                if job is _STOP:
+                    # Let the other worker threads see it too
+                    self._jobs.put(_STOP)
+                    return
+
+                try:
+                    connection.send(job.payload)
+                    status, result = connection.recv()
+                except (EOFError, OSError) as e:
+                    # The worker went away mid-frame; another worker takes the job
+                    metrics.increment('detector_broker.requeued')
+                    logger.warning(f"⚠️ Detector worker disconnected ({e}), requeueing its frame")
+                    self._jobs.put(job)
+                    return
+
+                metrics.observe('detector_broker.latency_seconds', time.time() - job.payload['submitted_at'])
+                if status == 'ok':
+                    job.future.set_result(result)
+                else:
+                    metrics.increment('detector_broker.failed')
+                    job.future.set_exception(DetectorWorkerError(result))
+
+
+def run_detector_worker(address: str = None, authkey: bytes = None, max_jobs: int = None,
+                        retry_interval: float = 1.0, stop_event: threading.Event = None) -> int:
+    """
+    Detector worker loop: connect to the broker, detect the frames it sends,
+    reconnect when it goes away. Returns the number of frames detected once
+    ``max_jobs`` is reached or ``stop_event`` is set. ``authkey`` defaults
+    to DETECTOR_AUTHKEY.
+    """
+    from table_detector.services.poker_game_processor import PokerGameProcessor
+
+    address = address or default_address()
+    authkey = authkey or env_authkey()
+    if authkey is None:
+        raise ValueError("Detector workers need the broker's DETECTOR_AUTHKEY")
+    stop_event = stop_event or threading.Event()
+    done = 0
+
+    def keep_running():
+        return not stop_event.is_set() and (max_jobs is None or done < max_jobs)
+
+    while keep_running():
+        try:
+            connection = Client(address, authkey=authkey)
+        except OSError:
+            stop_event.wait(retry_interval)
+            continue
+        except AuthenticationError:
+            logger.error(f"❌ Detector broker at {address} rejected the authkey, check DETECTOR_AUTHKEY")
+            return done
+
+        logger.info(f"🛰️ Connected to detector broker at {address}")
+        with connection:
+            try:
+                while keep_running():
+                    if not connection.poll(retry_interval):
+                        continue
+                    job = connection.recv()
+                    try:
+                        if job['detect_only']:
+                            snapshot = PokerGameProcessor.detect_game_elements(job['frame'], deadline=job['deadline'],
+                                                                               hero_to_act=job.get('hero_to_act'))
+                        else:
+                            snapshot = PokerGameProcessor.create_game_snapshot(job['frame'])
+                        reply = ('ok', snapshot)
+                    except Exception as e:
+                        reply = ('error', f"{type(e).__name__}: {e}")
+                    connection.send(reply)
+                    done += 1
+            except (EOFError, OSError):
+                logger.info("🛰️ Detector broker went away, reconnecting")
+
+    return done
@@ -0,0 +1,113 @@
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Gray level separating the client's light bid digits from the dark chip bubble
+DIGIT_THRESHOLD = 120
+
+# Template file name -> character; '.' cannot be a file name
+TEMPLATE_CHARACTERS = {'dot': '.'}
+
+
+def template_character(template_name: str) -> str:
+    """'5' and '5_2' (a second variant of 5) -> '5', 'dot' -> '.'."""
+    base = template_name.split('_')[0]
+    return TEMPLATE_CHARACTERS.get(base, base)
+
+
+class DigitRecognizer:
+    """
+    Reads bid amounts written in the client's fixed font without Tesseract.
+
+    The seat region is binarized at its native resolution, split into glyphs
+    by connected components and every glyph is classified by the nearest
+    ``digits`` template of about the same size: the intersection over union
+    of their ink pixels, so the shared background does not count. A glyph
+    whose runner-up character scores within ``min_margin`` of the best one
+    gets confidence 0, so a character without a template goes to Tesseract
+    instead of being read as a look-alike. The confidence of a read is that
+    of its least certain glyph.
+    """
+
+    def __init__(self, templates: Dict[str, np.ndarray], min_confidence: float = 0.9,
+                 min_margin: float = 0.15, threshold: int = DIGIT_THRESHOLD):
+        self.min_confidence = min_confidence
+        self.min_margin = min_margin
+        self.threshold = threshold
+        self._templates: List[Tuple[str, np.ndarray]] = [
+            (template_character(name), self._to_binary(template, 127)) for name, template in templates.items()
+        ]
+
+    @classmethod
+    def from_env(cls, templates: Dict[str, np.ndarray]) -> Optional['DigitRecognizer']:
+        if os.getenv('DIGIT_RECOGNIZER', 'true').lower() != 'true' or not templates:
+            return None
+        return cls(templates, min_confidence=float(os.getenv('DIGIT_MIN_CONFIDENCE', '0.9')),
+                   min_margin=float(os.getenv('DIGIT_MIN_MARGIN', '0.15')))
+
+    def recognize(self, region: np.ndarray) -> Tuple[str, float]:
+        """Text of a bid region and its confidence; an empty seat reads as ('', 1.0)."""
+        text = []
+        confidence = 1.0
+        for glyph in self.segment(self._to_binary(region, self.threshold)):
+            character, score = self.classify(glyph)
+            text.append(character)
+            confidence = min(confidence, score)
+        return ''.join(text), confidence
+
+    def classify(self, glyph: np.ndarray) -> Tuple[str, float]:
+        """Best character of a glyph and its ink IoU, 0 when another character comes within ``min_margin``."""
+        height, width = glyph.shape
+        scores: Dict[str, float] = {}
+        for character, template in self._templates:
+            template_height, template_width = template.shape
+            if abs(template_height - height) > 1 or abs(template_width - width) > 1:
+                continue
+            resized = glyph if glyph.shape == template.shape else \
+                cv2.resize(glyph, (template_width, template_height), interpolation=cv2.INTER_NEAREST)
+            union = np.count_nonzero(resized | template)
+            score = float(np.count_nonzero(resized & template) / union) if union else 0.0
+            scores[character] = max(score, scores.get(character, 0.0))
+
+        if not scores:
+            return '', 0.0
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_character, best_score = ranked[0]
+        if len(ranked) > 1 and best_score - ranked[1][1] < self.min_margin:
+            return best_character, 0.0
+        return best_character, best_score
+
+    @staticmethod
+    def segment(binary: np.ndarray) -> List[np.ndarray]:
+        """Glyph crops, left to right. Parts cut off by the region's left or right edge are dropped."""
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=4)
+        region_width = binary.shape[1]
+
+        boxes = []
+        for x, y, width, height, _ in sorted(stats[1:count].tolist()):
+            if x == 0 or x + width == region_width:
+                continue
+            if boxes and x < boxes[-1][2]:
+                # Overlaps the previous component horizontally: another piece of the same glyph
+                left, top, right, bottom = boxes[-1]
+                boxes[-1] = (left, min(top, y), max(right, x + width), max(bottom, y + height))
+            else:
+                boxes.append((x, y, x + width, y + height))
+
+        return [binary[top:bottom, left:right] for left, top, right, bottom in boxes]
+
+    @staticmethod
+    def _to_binary(image: np.ndarray, threshold: int) -> np.ndarray:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        return (gray >= threshold).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def get_digit_recognizer() -> Optional[DigitRecognizer]:
+    """Process-wide recognizer over the registry's ``digits`` templates (None when disabled)."""
+    from table_detector.services.template_matcher_service import TemplateMatchService
+
+    return DigitRecognizer.from_env(TemplateMatchService.TEMPLATE_REGISTRY.digit_templates)
@@ -0,0 +1,180 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from table_detector.domain.omaha_engine import OmahaEngine
+from table_detector.utils.metrics import metrics
+
+Step = Tuple[Position, MoveType]
+
+
+class _StateNode:
+    """Trie node: the engine after the action sequence leading to it (if still cached)."""
+    __slots__ = ('parent', 'step', 'children', 'actor', 'state')
+
+    def __init__(self, parent: Optional['_StateNode'] = None, step: Optional[Step] = None):
+        self.parent = parent
+        self.step = step
+        self.children: Dict[Step, '_StateNode'] = {}
+        # Position acting next; all children of a node are moves of the same actor
+        self.actor: Optional[Position] = None
+        self.state: Optional[bytes] = None
+
+
+class EngineStateCache:
+    """
+    Trie of engine states keyed by player count and the sequence of applied
+    (position, move) steps.
+
+    Consecutive frames of a hand share almost their whole action sequence, so
+    ``replay`` resumes from the deepest cached prefix instead of creating a
+    new pokerkit state (the expensive part: dealing hole cards) and replaying
+    every action. States are kept pickled; each resume unpickles a private
+    engine, so frames that diverge from a shared prefix branch off without
+    touching the cached states (copy-on-branch). Only the new hand state and
+    the state at the end of every replayed sequence are stored, the prefix
+    nodes in between are bare trie nodes.
+
+    At most ``max_states`` states (~5 KB each) are kept, the least recently
+    used are evicted together with the trie nodes that only led to them.
+
+    Metrics: ``engine_cache.hits``, ``engine_cache.misses``,
+    ``engine_cache.actions_reused`` and ``engine_cache.actions_applied``
+    counters, ``engine_cache.hit_rate`` and ``engine_cache.states`` gauges.
+    """
+
+    def __init__(self, max_states: int = 1024):
+        self.max_states = max_states
+        self._roots: Dict[int, _StateNode] = {}
+        self._states: "OrderedDict[int, _StateNode]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional['EngineStateCache']:
+        max_states = int(os.getenv('ENGINE_CACHE_SIZE', '1024'))
+        return cls(max_states) if max_states > 0 else None
+
+    def replay(self, player_count: int, position_actions: Dict[Position, List[MoveType]]) -> OmahaEngine:
+        """
+        Engine with all ``position_actions`` applied, like a new ``OmahaEngine``
+        after ``simulate_all_moves``; raises the same exceptions. The engine
+        belongs to the caller.
+        """
+        pending = {position: list(actions) for position, actions in position_actions.items()}
+
+        with self._lock:
+            node, reused = self._find_deepest_state(player_count, pending)
+            state = node.state if node is not None else None
+            if node is not None:
+                self._states.move_to_end(id(node))
+                self._hits += 1
+            else:
+                self._misses += 1
+            hit_rate = self._hits / (self._hits + self._misses)
+
+        metrics.increment('engine_cache.hits' if node is not None else 'engine_cache.misses')
+        metrics.set_gauge('engine_cache.hit_rate', hit_rate)
+        metrics.increment('engine_cache.actions_reused', reused)
+
+        if state is not None:
+            engine = pickle.loads(state)
+        else:
+            engine = OmahaEngine(player_count)
+            # The new hand state: every later hand of this player count resumes from it
+            self._store(player_count, [], pickle.dumps(engine, pickle.HIGHEST_PROTOCOL))
+        applied = sum(len(actions) for actions in pending.values())
+        engine.simulate_all_moves(pending)
+        metrics.increment('engine_cache.actions_applied', applied)
+
+        if applied:
+            self._store(player_count, self._applied_steps(engine), pickle.dumps(engine, pickle.HIGHEST_PROTOCOL))
+        return engine
+
+    def __len__(self):
+        with self._lock:
+            return len(self._states)
+
+    def _find_deepest_state(self, player_count: int,
+                            pending: Dict[Position, List[MoveType]]) -> Tuple[Optional[_StateNode], int]:
+        """Deepest cached node of the pending actions' sequence; its steps are removed from ``pending``."""
+        node = self._roots.get(player_count)
+        path: List[Step] = []
+        deepest, depth = (node, 0) if node is not None and node.state is not None else (None, 0)
+
+        while node is not None and node.actor is not None and pending.get(node.actor):
+            step = (node.actor, pending[node.actor][0])
+            node = node.children.get(step)
+            if node is None:
+                break
+            pending[step[0]].pop(0)
+            path.append(step)
+            if node.state is not None:
+                deepest, depth = node, len(path)
+
+        # Put back the steps walked past the deepest state
+        for position, move in reversed(path[depth:]):
+            pending[position].insert(0, move)
+        return deepest, depth
+
+    def _store(self, player_count: int, steps: List[Step], state: bytes):
+        with self._lock:
+            node = self._roots.get(player_count)
+            if node is None:
+                node = self._roots[player_count] = _StateNode()
+            for step in steps:
+                child = node.children.get(step)
+                if child is None:
+                    child = node.children[step] = _StateNode(node, step)
+                    node.actor = step[0]
+                node = child
+
+            node.state = state
+            self._states[id(node)] = node
+            self._states.move_to_end(id(node))
+            while len(self._states) > self.max_states:
+                _, evicted = self._states.popitem(last=False)
+                evicted.state = None
+                self._prune(evicted)
+            states = len(self._states)
+
+        metrics.set_gauge('engine_cache.states', states)
+
+    def _prune(self, node: _StateNode):
+        """Drop a stateless leaf and the stateless ancestors that only led to it."""
+        while node.state is None and not node.children:
+            parent = node.parent
+            if parent is None:
+                self._roots = {count: root for count, root in self._roots.items() if root is not node}
+                return
+            del parent.children[node.step]
+            if not parent.children:
+                parent.actor = None
+            node = parent
+
+    @staticmethod
+    def _applied_steps(engine: OmahaEngine) -> List[Step]:
+        return [step for moves in engine.get_moves_by_street().values() for step in moves]
+
+
+@lru_cache(maxsize=None)
+def get_engine_state_cache() -> Optional[EngineStateCache]:
+    """Process-wide engine state cache (None when ENGINE_CACHE_SIZE=0)."""
+    return EngineStateCache.from_env()
+
+
+def replay_hand(position_actions: Dict[Position, List[MoveType]]) -> OmahaEngine:
+    """New engine with all actions of a hand applied, resumed from the engine state cache when enabled."""
+    engine_cache = get_engine_state_cache()
+    if engine_cache is not None:
+        return engine_cache.replay(len(position_actions), position_actions)
+
+    engine = OmahaEngine(len(position_actions))
+    engine.simulate_all_moves({position: list(actions) for position, actions in position_actions.items()})
+    return engine
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.archive_writer_service import ArchiveWriter
+from table_detector.utils.fs_utils import get_results_root
+from table_detector.utils.metrics import metrics
+from table_detector.utils.opencv_utils import write_image
+
+FRAME_SHAPE = (584, 784, 3)
+
+DUMP_ENGINE_ERROR = 'engine_error'
+DUMP_ANOMALY = 'anomaly'
+DUMP_MANUAL = 'manual'
+
+
+class FrameRingBuffer:
+    """
+    Last ``capacity`` frames of one window in a single preallocated array.
+
+    Slots are overwritten in place, so memory stays constant for the whole session.
+    """
+
+    def __init__(self, capacity: int, frame_shape: Tuple[int, int, int] = FRAME_SHAPE):
+        self.capacity = capacity
+        self.frame_shape = frame_shape
+        self._frames = np.zeros((capacity, *frame_shape), dtype=np.uint8)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._snapshots: List[Optional[dict]] = [None] * capacity
+        self._next = 0
+        self._count = 0
+
+    def push(self, frame: np.ndarray, snapshot: dict) -> bool:
+        if frame.shape != self.frame_shape:
+            return False
+
+        np.copyto(self._frames[self._next], frame)
+        self._timestamps[self._next] = time.time()
+        self._snapshots[self._next] = snapshot
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        return True
+
+    def __len__(self):
+        return self._count
+
+    def items(self) -> List[Tuple[float, np.ndarray, dict]]:
+        """Buffered (timestamp, frame view, snapshot) entries, oldest first."""
+        start = (self._next - self._count) % self.capacity
+        indices = [(start + i) % self.capacity for i in range(self._count)]
+        return [(self._timestamps[i], self._frames[i], self._snapshots[i]) for i in indices]
+
+
+class FrameHistory:
+    """
+    Per-window ring buffers of recent frames and their game snapshots.
+
+    Buffers are dumped to ``<results>/dumps/`` when the engine rejects the
+    detected actions, when the detection looks inconsistent, or on a manual
+    request (``request_dump()`` or creating the trigger file). After a dump a
+    window must record ``capacity`` new frames before it is dumped again, so a
+    persistent problem does not dump every cycle.
+    """
+
+    def __init__(self, capacity: int = 5, dump_root=None, archive_writer: ArchiveWriter = None,
+                 trigger_file=None):
+        self.capacity = capacity
+        self.dump_root = Path(dump_root) if dump_root else get_results_root() / "dumps"
+        self.trigger_file = Path(trigger_file) if trigger_file else get_results_root() / "dump.request"
+        self.archive_writer = archive_writer
+        self._buffers: Dict[str, FrameRingBuffer] = {}
+        self._frames_since_dump: Dict[str, int] = {}
+        self._manual_requested = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, archive_writer: ArchiveWriter = None) -> Optional['FrameHistory']:
+        capacity = int(os.getenv('FRAME_HISTORY_SIZE', '5'))
+        if capacity <= 0:
+            return None
+        return cls(capacity=capacity, archive_writer=archive_writer)
+
+    def record(self, window_name: str, cv2_image: np.ndarray, game_snapshot: GameSnapshot):
+        """Buffer a processed frame and dump the window's history if the result looks wrong."""
+        with self._lock:
+            buffer = self._buffers.get(window_name)
+            if buffer is None:
+                buffer = self._buffers[window_name] = FrameRingBuffer(self.capacity)
+                self._frames_since_dump[window_name] = self.capacity
+
+            if not buffer.push(cv2_image, self._summarize(game_snapshot)):
+                logger.debug(f"Frame of {window_name} has unexpected shape {cv2_image.shape}, not buffered")
+                return
+            self._frames_since_dump[window_name] += 1
+
+            reason = self._dump_reason(game_snapshot)
+            if reason and self._frames_since_dump[window_name] >= self.capacity:
+                self._dump(window_name, buffer, reason)
+
+    def request_dump(self):
+        """Dump all windows on the next ``check_manual_trigger()``."""
+        self._manual_requested.set()
+
+    def check_manual_trigger(self) -> int:
+        """Dump all buffers if a manual dump was requested. Returns the number of windows dumped."""
+        if self.trigger_file.exists():
+            try:
+                self.trigger_file.unlink()
+            except OSError:
+                pass
+            self._manual_requested.set()
+
+        if not self._manual_requested.is_set():
+            return 0
+        self._manual_requested.clear()
+
+        with self._lock:
+            for window_name, buffer in self._buffers.items():
+                self._dump(window_name, buffer, DUMP_MANUAL)
+            return len(self._buffers)
+
+    def remove(self, window_name: str):
+        with self._lock:
+            self._buffers.pop(window_name, None)
+            self._frames_since_dump.pop(window_name, None)
+
+    @staticmethod
+    def find_anomaly(game_snapshot: GameSnapshot) -> Optional[str]:
+        """Detections that cannot come from a real Omaha table."""
+        if len(game_snapshot.player_cards) not in (0, 4):
+            return f"{len(game_snapshot.player_cards)} player cards"
+        if game_snapshot.get_street() is None:
+            return f"{len(game_snapshot.table_cards)} table cards"
+        return None
+
+    def _dump_reason(self, game_snapshot: GameSnapshot) -> Optional[str]:
+        if game_snapshot.engine_error:
+            return DUMP_ENGINE_ERROR
+        if self.find_anomaly(game_snapshot):
+            return DUMP_ANOMALY
+        return None
+
+    def _dump(self, window_name: str, buffer: FrameRingBuffer, reason: str):
+        folder = self.dump_root / f"{datetime.now().strftime('%Y_%m_%d_%H%M%S')}_{window_name}_{reason}"
+        entries = buffer.items()
+        index = []
+
+        extension = self.archive_writer.extension if self.archive_writer else '.png'
+        if not self.archive_writer:
+            folder.mkdir(parents=True, exist_ok=True)
+
+        for i, (timestamp, frame, snapshot) in enumerate(entries):
+            filename = f"{i:02d}{extension}"
+            # Slots are reused by the next cycles, so the writer gets its own copy
+            if self.archive_writer:
+                self.archive_writer.submit_image(folder, filename, frame.copy())
+            else:
+                write_image(folder / filename, frame)
+            index.append({'frame': filename, 'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+                          'snapshot': snapshot})
+
+        text = json.dumps({'window': window_name, 'reason': reason, 'frames': index}, indent=2)
+        if self.archive_writer:
+            self.archive_writer.submit_text(folder / "snapshots.json", text)
+        else:
+            (folder / "snapshots.json").write_text(text, encoding='utf-8')
+
+        self._frames_since_dump[window_name] = 0
+        metrics.increment(f'frame_history.dumps.{reason}')
+        logger.warning(f"💾 Dumped {len(entries)} frames of {window_name} ({reason}) to {folder}")
+
+    @staticmethod
+    def _summarize(game_snapshot: GameSnapshot) -> dict:
+        return game_snapshot.to_summary()
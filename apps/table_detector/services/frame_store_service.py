@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set
+
+import numpy as np
+from loguru import logger
+
+from table_detector.utils.metrics import metrics
+from table_detector.utils.opencv_utils import IMAGE_CODECS, write_image, read_image
+
+OBJECTS_FOLDER = "objects"
+MANIFESTS_FOLDER = "manifests"
+MANIFEST_DATE_FORMAT = "%Y_%m_%d"
+
+
+def frame_digest(image: np.ndarray) -> str:
+    """Content hash of a decoded frame (pixels and shape), independent of codec."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(str(image.shape).encode('ascii'))
+    hasher.update(np.ascontiguousarray(image).data)
+    return hasher.hexdigest()
+
+
+class FrameStore:
+    """
+    Content-addressed frame archive.
+
+    Layout under ``root``::
+
+        objects/<ab>/<digest>.<ext>        one file per distinct frame
+        manifests/<date>/<time>.json       per-cycle manifest referencing digests
+        manifests/<date>/<time>.log        per-cycle detection log (optional)
+        manifests/<date>.jsonl             compacted manifests of a whole day
+
+    Frames are written once; repeated frames only cost a hash and a stat.
+    """
+
+    def __init__(self, root, codec: str = 'png'):
+        if codec not in IMAGE_CODECS:
+            raise ValueError(f"Unsupported frame store codec: {codec}. Supported: {list(IMAGE_CODECS)}")
+        self.root = Path(root)
+        self.codec = codec
+        self.objects_dir = self.root / OBJECTS_FOLDER
+        self.manifests_dir = self.root / MANIFESTS_FOLDER
+        self._last_manifest_frames: Optional[Dict[str, str]] = None
+        self._last_manifest_cycle: Optional[str] = None
+
+    # === Objects ===
+
+    def object_path(self, digest: str, extension: str = None) -> Path:
+        extension = extension or IMAGE_CODECS[self.codec][0]
+        return self.objects_dir / digest[:2] / f"{digest}{extension}"
+
+    def find_object(self, digest: str) -> Optional[Path]:
+        """Locate an object regardless of the codec it was written with."""
+        for extension, _ in IMAGE_CODECS.values():
+            path = self.object_path(digest, extension)
+            if path.exists():
+                return path
+        return None
+
+    def put_frame(self, image: np.ndarray) -> str:
+        """Store a BGR frame if it is not stored yet and return its digest."""
+        digest = frame_digest(image)
+        path = self.object_path(digest)
+
+        try:
+            # Refresh the mtime: GC keeps unreferenced objects younger than its grace period,
+            # and the manifest referencing this frame is not written yet
+            os.utime(path)
+            metrics.increment('archive.frames_deduplicated')
+            return digest
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so readers never see a partial object
+        tmp_path = path.with_name(f".{digest}.{os.getpid()}.tmp{path.suffix}")
+        write_image(tmp_path, image, self.codec)
+        os.replace(tmp_path, path)
+
+        metrics.increment('archive.frames_stored')
+        return digest
+
+    def load_frame(self, digest: str) -> Optional[np.ndarray]:
+        path = self.find_object(digest)
+        return read_image(path) if path else None
+
+    # === Manifests ===
+
+    def cycle_id(self, timestamp_folder) -> str:
+        """'<date>/<time>' id of a cycle, derived from its legacy timestamp folder."""
+        timestamp_folder = Path(timestamp_folder)
+        return f"{timestamp_folder.parent.name}/{timestamp_folder.name}"
+
+    def manifest_path(self, cycle_id: str) -> Path:
+        return self.manifests_dir / f"{cycle_id}.json"
+
+    def write_manifest(self, cycle_id: str, frames: Dict[str, str], windows: list = None) -> bool:
+        """
+        Write the manifest of one cycle. A cycle whose frames are identical to the
+        previous manifest is skipped - it would only repeat the same references
+        (unless it gets a log, see ``write_cycle_log``).
+        """
+        if frames == self._last_manifest_frames:
+            metrics.increment('archive.manifests_skipped')
+            return False
+
+        manifest = {
+            'cycle': cycle_id,
+            'written_at': datetime.now().isoformat(),
+            'frames': frames,
+            'windows': windows or [],
+        }
+        path = self.manifest_path(cycle_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+        self._last_manifest_frames = dict(frames)
+        self._last_manifest_cycle = cycle_id
+        metrics.increment('archive.manifests_written')
+        return True
+
+    def write_cycle_log(self, cycle_id: str, text: str):
+        """
+        Write the log of one cycle. A cycle whose manifest was skipped gets a small
+        one pointing to the previous cycle's frames (``same_frames_as``), so the
+        log is not left without a manifest.
+        """
+        manifest_path = self.manifest_path(cycle_id)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        if not manifest_path.exists():
+            manifest = {
+                'cycle': cycle_id,
+                'written_at': datetime.now().isoformat(),
+                'same_frames_as': self._last_manifest_cycle,
+            }
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+
+        with open(manifest_path.with_suffix('.log'), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def iter_manifests(self) -> Iterator[dict]:
+        """Yield all manifests, compacted and per-cycle, oldest first."""
+        if not self.manifests_dir.exists():
+            return
+
+        for entry in sorted(self.manifests_dir.iterdir()):
+            if entry.is_file() and entry.suffix == '.jsonl':
+                with open(entry, encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+            elif entry.is_dir():
+                for manifest_path in sorted(entry.glob('*.json')):
+                    with open(manifest_path, encoding='utf-8') as f:
+                        yield json.load(f)
+
+    # === Maintenance ===
+
+    def gc(self, retention_days: int, grace_seconds: int = 3600) -> Dict[str, int]:
+        """
+        Remove manifests older than ``retention_days`` and then every object no
+        remaining manifest references. Objects younger than ``grace_seconds`` are
+        kept so a live writer cannot lose a frame it is about to reference.
+        """
+        removed_manifests = self._remove_expired_manifests(retention_days)
+        referenced = self._referenced_digests()
+
+        removed_objects = 0
+        freed_bytes = 0
+        now = time.time()
+        if self.objects_dir.exists():
+            for object_path in self.objects_dir.glob('*/*'):
+                digest = object_path.name.split('.')[0]
+                if digest in referenced:
+                    continue
+                stat = object_path.stat()
+                if now - stat.st_mtime < grace_seconds:
+                    continue
+                object_path.unlink()
+                removed_objects += 1
+                freed_bytes += stat.st_size
+
+        result = {
+            'manifests_removed': removed_manifests,
+            'objects_removed': removed_objects,
+            'bytes_freed': freed_bytes,
+            'objects_referenced': len(referenced),
+        }
+        logger.info(f"🧹 Frame store GC: {result}")
+        return result
+
+    def compact(self, keep_days: int = 0) -> Dict[str, int]:
+        """
+        Merge per-cycle manifests (and their logs) into a single ``<date>.jsonl``
+        file per day, for every day older than today minus ``keep_days``.
+
+        The day file is rewritten under a temporary name and renamed in place,
+        merged with what it already holds by cycle id, so rerunning after an
+        interrupted compaction does not duplicate manifests.
+        """
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime(MANIFEST_DATE_FORMAT)
+        days_compacted = 0
+        manifests_merged = 0
+
+        if not self.manifests_dir.exists():
+            return {'days_compacted': 0, 'manifests_merged': 0}
+
+        for day_dir in sorted(p for p in self.manifests_dir.iterdir() if p.is_dir()):
+            if day_dir.name >= cutoff:
+                continue
+
+            day_path = self.manifests_dir / f"{day_dir.name}.jsonl"
+            manifests = {}
+            if day_path.exists():
+                with open(day_path, encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            manifest = json.loads(line)
+                            manifests[manifest['cycle']] = manifest
+
+            for manifest_path in sorted(day_dir.glob('*.json')):
+                with open(manifest_path, encoding='utf-8') as f:
+                    manifest = json.load(f)
+                log_path = manifest_path.with_suffix('.log')
+                if log_path.exists():
+                    manifest['log'] = log_path.read_text(encoding='utf-8')
+                manifests[manifest['cycle']] = manifest
+                manifests_merged += 1
+
+            # Logs without a manifest (written before their cycle's manifest existed) are kept as log-only entries
+            for log_path in sorted(day_dir.glob('*.log')):
+                if not log_path.with_suffix('.json').exists():
+                    cycle_id = f"{day_dir.name}/{log_path.stem}"
+                    manifests.setdefault(cycle_id, {'cycle': cycle_id})['log'] = log_path.read_text(encoding='utf-8')
+
+            tmp_path = day_path.with_name(f".{day_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as out:
+                for cycle in sorted(manifests):
+                    out.write(json.dumps(manifests[cycle]) + "\n")
+            os.replace(tmp_path, day_path)
+
+            for path in day_dir.iterdir():
+                path.unlink()
+            day_dir.rmdir()
+            days_compacted += 1
+
+        result = {'days_compacted': days_compacted, 'manifests_merged': manifests_merged}
+        logger.info(f"📦 Frame store compaction: {result}")
+        return result
+
+    def get_usage(self) -> Dict[str, int]:
+        objects = list(self.objects_dir.glob('*/*')) if self.objects_dir.exists() else []
+        manifest_files = list(self.manifests_dir.rglob('*')) if self.manifests_dir.exists() else []
+        return {
+            'objects': len(objects),
+            'object_bytes': sum(p.stat().st_size for p in objects),
+            'manifest_files': sum(1 for p in manifest_files if p.is_file()),
+        }
+
+    def _remove_expired_manifests(self, retention_days: int) -> int:
+        if not self.manifests_dir.exists():
+            return 0
+
+        cutoff = (datetime.now() - timedelta(days=retention_days)).strftime(MANIFEST_DATE_FORMAT)
+        removed = 0
+        for entry in list(self.manifests_dir.iterdir()):
+            day = entry.stem if entry.is_file() else entry.name
+            if day >= cutoff:
+                continue
+            if entry.is_dir():
+                removed += len(list(entry.glob('*.json')))
+                for path in entry.iterdir():
+                    path.unlink()
+                entry.rmdir()
+            else:
+                with open(entry, encoding='utf-8') as f:
+                    removed += sum(1 for line in f if line.strip())
+                entry.unlink()
+        return removed
+
+    def _referenced_digests(self) -> Set[str]:
+        referenced = set()
+        for manifest in self.iter_manifests():
+            referenced.update(manifest.get('frames', {}).values())
+        return referenced
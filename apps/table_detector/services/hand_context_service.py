@@ -0,0 +1,179 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from shared.domain.detection import Detection
+from shared.domain.game_snapshot import GameSnapshot
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from shared.domain.street import Street
+from table_detector.domain.omaha_engine import OmahaEngine, OmahaEngineException
+from table_detector.services.action_recovery_service import ActionSequenceRecovery, get_action_recovery, recover_moves
+from table_detector.services.engine_state_cache_service import replay_hand
+from table_detector.services.move_memo_service import MoveReconstructionMemo, get_move_memo
+from table_detector.services.position_service import PositionService
+from table_detector.utils.metrics import metrics
+
+
+class HandContext:
+    """
+    Engine state of the hand currently played in one window.
+
+    The hand is identified by the hero's hole cards and the seat positions.
+    While both stay the same, the board does not shrink and every seat's
+    detected actions still start with the actions already applied, a new
+    frame only feeds its new actions into the existing engine.
+
+    Frames of a window can complete on different pool or broker callback
+    threads; ``lock`` serializes them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hand_key: Optional[tuple] = None
+        self.board_size = 0
+        self.engine: Optional[OmahaEngine] = None
+        self.applied_actions: Dict[Position, List[MoveType]] = {}
+        # Position detections as seen in the last frame and what they were recovered to
+        self._positions_signature: Optional[tuple] = None
+        self._positions: Dict[int, Position] = {}
+
+    def get_positions(self, position_detections: Dict[int, Detection]) -> Dict[int, Position]:
+        signature = tuple(sorted((player_id, detection.name) for player_id, detection in position_detections.items()))
+        if signature != self._positions_signature:
+            self._positions = PositionService.get_positions(position_detections)
+            self._positions_signature = signature
+        return self._positions
+
+    def get_new_actions(self, hand_key: tuple, board_size: int,
+                        position_actions: Dict[Position, List[MoveType]]) -> Optional[Dict[Position, List[MoveType]]]:
+        """Actions not applied yet, or None when the frame does not continue the current hand."""
+        if self.engine is None or hand_key != self.hand_key or board_size < self.board_size:
+            return None
+
+        new_actions = {}
+        for position, actions in position_actions.items():
+            applied = self.applied_actions.get(position, [])
+            if actions[:len(applied)] != applied:
+                return None
+            new_actions[position] = actions[len(applied):]
+        return new_actions
+
+    def start_hand(self, hand_key: tuple, engine: OmahaEngine):
+        self.hand_key = hand_key
+        self.board_size = 0
+        self.engine = engine
+        self.applied_actions = {}
+
+    def reset(self):
+        self.hand_key = None
+        self.engine = None
+        self.applied_actions = {}
+
+
+class HandContextRegistry:
+    """
+    Per-window ``HandContext``s, so each changed frame costs the engine only
+    its new actions instead of a replay of the whole hand.
+
+    Whenever a frame does not continue the hand (new hole cards, different
+    positions, a detected action that disagrees with an applied one) or the
+    engine rejects an action, the whole hand is replayed into a new engine,
+    exactly like ``PokerGameProcessor.apply_engine`` (resumed from the engine
+    state cache when enabled). Frames already seen on any window are
+    answered by the move memo without touching the context. Frames the
+    engine rejects get the moves of the smallest accepted edit of their
+    actions when action recovery is enabled, flagged ``stale``.
+
+    Metrics: ``hand_context.new_hands``, ``hand_context.replays`` (full
+    replays of a hand already in progress), ``hand_context.incremental``
+    and ``hand_context.actions_applied``.
+    """
+
+    def __init__(self, move_memo: MoveReconstructionMemo = None, action_recovery: ActionSequenceRecovery = None):
+        self.move_memo = move_memo
+        self.action_recovery = action_recovery
+        self._contexts: Dict[str, HandContext] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['HandContextRegistry']:
+        enabled = os.getenv('INCREMENTAL_ENGINE', 'true').lower() == 'true'
+        return cls(move_memo=get_move_memo(), action_recovery=get_action_recovery()) if enabled else None
+
+    def apply_engine(self, window_name: str, game_snapshot: GameSnapshot) -> GameSnapshot:
+        """Fill moves (or engine_error) of a window's snapshot, see ``PokerGameProcessor.apply_engine``."""
+        context = self._get_context(window_name)
+        with context.lock:
+            try:
+                positions = context.get_positions(game_snapshot.positions)
+
+                def reconstruct():
+                    return self._apply_context(context, game_snapshot, positions)
+
+                try:
+                    if self.move_memo is not None:
+                        game_snapshot.moves = self.move_memo.get_moves(positions, game_snapshot.actions, reconstruct)
+                    else:
+                        game_snapshot.moves = reconstruct()
+                except OmahaEngineException as e:
+                    # Outside the memo: a search that ran out of time must not stick to the pattern
+                    position_actions = OmahaEngine.convert_to_position_actions(game_snapshot.actions, positions)
+                    recover_moves(game_snapshot, position_actions, e, self.action_recovery)
+                logger.info(game_snapshot.moves)
+            except OmahaEngineException as e:
+                logger.error(f"Expected exception: {e}")
+                game_snapshot.engine_error = str(e)
+            except Exception:
+                # Positions that cannot be recovered end the window's hand as well
+                context.reset()
+                raise
+
+        return game_snapshot
+
+    def _apply_context(self, context: HandContext, game_snapshot: GameSnapshot,
+                       positions: Dict[int, Position]) -> Dict[Street, List[Tuple[Position, MoveType]]]:
+        """Moves of the frame from the window's hand context; the context is reset when the engine fails."""
+        position_actions = OmahaEngine.convert_to_position_actions(game_snapshot.actions, positions)
+        hand_key = self._get_hand_key(game_snapshot, positions)
+        board_size = len(game_snapshot.table_cards)
+
+        try:
+            new_actions = context.get_new_actions(hand_key, board_size, position_actions)
+            if new_actions is None:
+                metrics.increment('hand_context.replays' if hand_key == context.hand_key else 'hand_context.new_hands')
+                metrics.increment('hand_context.actions_applied',
+                                  sum(len(actions) for actions in position_actions.values()))
+                context.start_hand(hand_key, replay_hand(position_actions))
+            else:
+                metrics.increment('hand_context.incremental')
+                metrics.increment('hand_context.actions_applied', sum(len(actions) for actions in new_actions.values()))
+                context.engine.simulate_all_moves(new_actions)
+
+            context.applied_actions = position_actions
+            context.board_size = board_size
+
+            # Copy: the engine keeps appending to its street lists on later frames
+            return {street: list(moves) for street, moves in context.engine.get_moves_by_street().items()}
+        except Exception:
+            # The next frame replays the hand
+            context.reset()
+            raise
+
+    def remove(self, window_name: str):
+        with self._lock:
+            self._contexts.pop(window_name, None)
+
+    def _get_context(self, window_name: str) -> HandContext:
+        with self._lock:
+            context = self._contexts.get(window_name)
+            if context is None:
+                context = self._contexts[window_name] = HandContext()
+            return context
+
+    @staticmethod
+    def _get_hand_key(game_snapshot: GameSnapshot, positions: Dict[int, Position]) -> Tuple[tuple, tuple]:
+        hole_cards = tuple(sorted(card.template_name for card in game_snapshot.player_cards))
+        return hole_cards, tuple(sorted((player_id, position.name) for player_id, position in positions.items()))
@@ -1,10 +1,18 @@
 import os
-from typing import List, Dict, NamedTuple
+from pathlib import Path
+from typing import List, Dict, NamedTuple, Optional, Callable, Iterable, Set, Tuple
 
 from loguru import logger
 
 from table_detector.domain.captured_window import CapturedWindow
-from table_detector.services.window_capture_service import capture_and_save_windows
+from table_detector.services.archive_writer_service import ArchiveWriter
+from table_detector.services.capture_pool_service import WindowCapturePool
+from table_detector.services.window_capture_service import capture_and_save_windows, stream_and_save_windows, \
+    POKER_WINDOW_TITLE
+from table_detector.services.window_registry_service import WindowRegistry
+from table_detector.services.window_scheduler_service import AdaptiveWindowScheduler
+from table_detector.utils.capture_backend import CaptureBackend, Win32CaptureBackend
+from table_detector.utils.capture_utils import capture_window_name
 
 
 class WindowChanges(NamedTuple):
@@ -13,55 +21,143 @@ class WindowChanges(NamedTuple):
 
 
 class ImageCaptureService:
-    def __init__(self):
+    def __init__(self, capture_backend: CaptureBackend = None, window_scheduler: AdaptiveWindowScheduler = None):
         self.debug_mode = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
         self._window_hashes: Dict[str, str] = {}
-
-    def get_changed_images(self, base_timestamp_folder) -> WindowChanges:
-        captured_windows = capture_and_save_windows(
-            timestamp_folder=base_timestamp_folder,
-            save_windows=not self.debug_mode,
-            debug=self.debug_mode
-        )
-
-        if not captured_windows:
-            logger.warning("🚫 No poker tables detected")
-            removed_windows = list(self._window_hashes.keys())
-            self._window_hashes.clear()
-            return WindowChanges(changed_images=[], removed_windows=removed_windows)
+        self.archive_writer = ArchiveWriter.from_env() if not self.debug_mode else None
+        self.window_registry = WindowRegistry(capture_backend or Win32CaptureBackend(), POKER_WINDOW_TITLE) \
+            if not self.debug_mode else None
+        self.capture_pool = WindowCapturePool() if not self.debug_mode else None
+        # With the fast probe only due windows are captured and only changed ones archived
+        self.window_scheduler = window_scheduler if not self.debug_mode else None
+
+    def get_changed_images(self, base_timestamp_folder,
+                           on_changed: Callable[[CapturedWindow], None] = None) -> WindowChanges:
+        """
+        Capture all poker windows and return the ones whose content changed.
+
+        ``on_changed`` is called for every changed window as soon as its capture
+        completes, while the remaining windows are still being captured.
+        """
+        captured_windows, expected_window_names = self.capture_cycle(base_timestamp_folder)
 
         changed_images = []
-        unchanged_windows = []
         current_hashes = {}
-        current_window_names = set()
 
         for captured_window in captured_windows:
-            window_name = captured_window.window_name
-            current_window_names.add(window_name)
-            current_hash = captured_window.calculate_hash()
-            current_hashes[window_name] = current_hash
-
-            if self._window_hashes.get(window_name) != current_hash:
+            if self.check_changed(captured_window, current_hashes):
                 changed_images.append(captured_window)
+                if on_changed:
+                    on_changed(captured_window)
             else:
-                unchanged_windows.append(captured_window)
+                # Clean up unchanged images immediately to prevent memory leaks
+                captured_window.close()
 
-        # Clean up unchanged images immediately to prevent memory leaks
-        for unchanged_window in unchanged_windows:
-            unchanged_window.close()
+        removed_windows = self.finish_cycle(current_hashes, expected_window_names, len(changed_images))
+        return WindowChanges(changed_images=changed_images, removed_windows=removed_windows)
+
+    def capture_cycle(self, base_timestamp_folder) -> Tuple[Iterable[CapturedWindow], Set[str]]:
+        """
+        Start capturing one cycle.
+
+        Returns the captured windows (streamed as captures complete) and the
+        names of all poker windows currently open, captured this cycle or not.
+        """
+        if self.debug_mode:
+            captured_windows = capture_and_save_windows(timestamp_folder=base_timestamp_folder, debug=True)
+            return captured_windows, set()
+
+        windows = self.window_registry.get_windows()
+        expected_window_names = {
+            capture_window_name(i, window['title'])
+            for i, window in enumerate(sorted(windows, key=lambda w: w['hwnd']), 1)
+        }
+        skip_windows = set()
+        should_archive = None
+        if self.window_scheduler:
+            skip_windows = expected_window_names - self.window_scheduler.due_windows(expected_window_names)
+            should_archive = self._has_changed
+
+        captured_windows = stream_and_save_windows(
+            timestamp_folder=base_timestamp_folder,
+            windows=windows,
+            backend=self.window_registry.backend,
+            capture_pool=self.capture_pool,
+            save_windows=True,
+            archive_writer=self.archive_writer,
+            skip_windows=skip_windows,
+            should_archive=should_archive
+        )
+        return captured_windows, expected_window_names
+
+    def check_changed(self, captured_window: CapturedWindow, current_hashes: Dict[str, str]) -> bool:
+        """Hash a captured window into ``current_hashes`` and tell whether it changed since the last cycle."""
+        window_name = captured_window.window_name
+        current_hash = captured_window.calculate_hash()
+        current_hashes[window_name] = current_hash
+
+        changed = self._window_hashes.get(window_name) != current_hash
+        if self.window_scheduler:
+            self.window_scheduler.record(window_name, changed)
+        return changed
+
+    def finish_cycle(self, current_hashes: Dict[str, str], expected_window_names: Set[str],
+                     changed_count: int) -> List[str]:
+        """Commit the hashes of a cycle and return the windows that were closed since the previous one."""
+        captured_count = len(current_hashes)
+        log_idle = logger.debug if self.window_scheduler else logger.info
+
+        if not captured_count and not expected_window_names:
+            if self._window_hashes or not self.window_scheduler:
+                logger.warning("🚫 No poker tables detected")
+            removed_windows = list(self._window_hashes.keys())
+            self._window_hashes = {}
+            if self.window_scheduler:
+                for window_name in removed_windows:
+                    self.window_scheduler.forget(window_name)
+            return removed_windows
+
+        # Windows still open but not captured this cycle (not due, timed out, busy) keep their previous state
+        for window_name in expected_window_names - current_hashes.keys():
+            if window_name in self._window_hashes:
+                current_hashes[window_name] = self._window_hashes[window_name]
 
         previous_window_names = set(self._window_hashes.keys())
-        removed_windows = list(previous_window_names - current_window_names)
+        removed_windows = list(previous_window_names - current_hashes.keys())
 
         self._window_hashes = current_hashes
 
-        if changed_images:
-            logger.info(f"🔍 Processing {len(changed_images)} changed/new images out of {len(captured_windows)} total")
+        if changed_count:
+            logger.info(f"🔍 Processing {changed_count} changed/new images out of {captured_count} total")
 
         if removed_windows:
             logger.info(f"🗑️ Detected {len(removed_windows)} removed windows: {removed_windows}")
-
-        if not changed_images and not removed_windows:
-            logger.info("📊 All windows unchanged")
-
-        return WindowChanges(changed_images=changed_images, removed_windows=removed_windows)
+            if self.window_scheduler:
+                for window_name in removed_windows:
+                    self.window_scheduler.forget(window_name)
+
+        if not changed_count and not removed_windows:
+            log_idle("📊 All windows unchanged")
+
+        return removed_windows
+
+    def _has_changed(self, captured_window: CapturedWindow) -> bool:
+        return self._window_hashes.get(captured_window.window_name) != captured_window.calculate_hash()
+
+    def get_archive_stats(self) -> Optional[dict]:
+        return self.archive_writer.get_stats() if self.archive_writer else None
+
+    def write_cycle_log(self, base_timestamp_folder, text: str):
+        """Write a cycle's log next to its frames, through the archive writer when one is available."""
+        if self.archive_writer:
+            self.archive_writer.submit_cycle_log(base_timestamp_folder, text)
+        else:
+            log_path = Path(base_timestamp_folder) / "app.log"
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            log_path.write_text(text, encoding='utf-8')
+
+    def close(self):
+        if self.capture_pool:
+            self.capture_pool.close()
+        if self.archive_writer:
+            self.archive_writer.close()
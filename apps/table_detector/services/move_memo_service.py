@@ -0,0 +1,99 @@
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from shared.domain.detection import Detection
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from shared.domain.street import Street
+from table_detector.domain.omaha_engine import OmahaEngineException
+from table_detector.utils.metrics import metrics
+
+MovesByStreet = Dict[Street, List[Tuple[Position, MoveType]]]
+
+
+class MoveReconstructionMemo:
+    """
+    LRU memo of the engine's moves by street, keyed by the recovered seat
+    positions and every seat's action detection names.
+
+    Reconstructing moves from those is pure, and many tables show the same
+    common patterns (folds to the big blind, an open folded around), so a
+    pattern is simulated once for all windows and frames. Engine exceptions
+    are memoized as well: an invalid sequence is not simulated again on
+    every frame, the memoized exception is raised instead. Callers recover
+    rejected sequences outside the memo.
+
+    Metrics: ``move_memo.hits``, ``move_memo.misses`` and
+    ``move_memo.errors`` (hits that raised) counters, ``move_memo.hit_rate``
+    gauge.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[Optional[tuple], Optional[OmahaEngineException]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional['MoveReconstructionMemo']:
+        max_entries = int(os.getenv('MOVE_MEMO_SIZE', '2048'))
+        return cls(max_entries) if max_entries > 0 else None
+
+    @staticmethod
+    def key(positions: Dict[int, Position], actions: Dict[int, List[Detection]]) -> tuple:
+        return (tuple(sorted((player_id, position.name) for player_id, position in positions.items())),
+                tuple(sorted((player_id, tuple(detection.name for detection in detections))
+                             for player_id, detections in actions.items())))
+
+    def get_moves(self, positions: Dict[int, Position], actions: Dict[int, List[Detection]],
+                  reconstruct: Callable[[], MovesByStreet]) -> MovesByStreet:
+        """Memoized moves (or engine exception) of the frame, ``reconstruct`` computes them on a miss."""
+        key = self.key(positions, actions)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            hit_rate = self._hits / (self._hits + self._misses)
+
+        metrics.increment('move_memo.misses' if entry is None else 'move_memo.hits')
+        metrics.set_gauge('move_memo.hit_rate', hit_rate)
+
+        if entry is None:
+            try:
+                moves = reconstruct()
+            except OmahaEngineException as e:
+                self._put(key, (None, e))
+                raise
+            self._put(key, (tuple((street, tuple(street_moves)) for street, street_moves in moves.items()), None))
+            return moves
+
+        frozen_moves, error = entry
+        if error is not None:
+            metrics.increment('move_memo.errors')
+            # Drop the traceback of the previous raise so it does not keep growing
+            raise error.with_traceback(None)
+        return {street: list(street_moves) for street, street_moves in frozen_moves}
+
+    def _put(self, key: tuple, entry: Tuple[Optional[tuple], Optional[OmahaEngineException]]):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+@lru_cache(maxsize=None)
+def get_move_memo() -> Optional[MoveReconstructionMemo]:
+    """Process-wide move reconstruction memo (None when MOVE_MEMO_SIZE=0)."""
+    return MoveReconstructionMemo.from_env()
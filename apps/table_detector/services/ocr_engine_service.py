@@ -0,0 +1,197 @@
+import os
+import queue
+import shlex
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from table_detector.utils.metrics import metrics
+
+OCR_ENGINES = ('auto', 'tesserocr', 'pytesseract')
+
+
+def parse_tesseract_config(config: str) -> Tuple[int, int, Dict[str, str]]:
+    """(psm, oem, variables) of a pytesseract config string such as "--psm 7 --oem 3 -c name=value"."""
+    psm, oem, variables = 3, 3, {}
+    tokens = shlex.split(config)
+    for option, value in zip(tokens, tokens[1:]):
+        if option == '--psm':
+            psm = int(value)
+        elif option == '--oem':
+            oem = int(value)
+        elif option == '-c':
+            name, _, variable_value = value.partition('=')
+            variables[name] = variable_value
+    return psm, oem, variables
+
+
+class OcrEngine(ABC):
+    """Tesseract behind ``image_to_data``, returning the ``pytesseract.Output.DICT`` layout."""
+
+    name = 'ocr'
+
+    @abstractmethod
+    def image_to_data(self, image: np.ndarray, config: str) -> Dict[str, list]:
+        pass
+
+    def close(self):
+        pass
+
+
+class PytesseractEngine(OcrEngine):
+    """One tesseract process per call; the language model is loaded every time."""
+
+    name = 'pytesseract'
+
+    def image_to_data(self, image: np.ndarray, config: str) -> Dict[str, list]:
+        import pytesseract
+
+        started = time.perf_counter()
+        data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+        metrics.observe('ocr_engine.latency_seconds', time.perf_counter() - started)
+        return data
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    Long-lived in-process Tesseract APIs (``tesserocr``) with warm models.
+
+    Up to ``workers`` APIs are created per (oem, variables) configuration and
+    reused; a call waits for a free API, which bounds OCR concurrency. An API
+    whose call fails is discarded and a fresh one is created for the next
+    call. Metrics: ``ocr_engine.apis_created``, ``ocr_engine.restarts`` and
+    ``ocr_engine.latency_seconds``.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, workers: int = 2, lang: str = 'eng', acquire_timeout: float = 10.0):
+        self.workers = workers
+        self.lang = lang
+        self.acquire_timeout = acquire_timeout
+        # (oem, variables) -> idle APIs and the number created so far
+        self._idle: Dict[tuple, "queue.Queue"] = {}
+        self._created: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def image_to_data(self, image: np.ndarray, config: str) -> Dict[str, list]:
+        psm, oem, variables = parse_tesseract_config(config)
+        key = (oem, tuple(sorted(variables.items())))
+
+        api = self._acquire(key)
+        started = time.perf_counter()
+        try:
+            data = self._recognize(api, image, psm)
+        except Exception:
+            self._discard(key, api)
+            raise
+        metrics.observe('ocr_engine.latency_seconds', time.perf_counter() - started)
+        self._idle[key].put(api)
+        return data
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                while True:
+                    try:
+                        self._end_api(idle.get_nowait())
+                    except queue.Empty:
+                        break
+            self._idle.clear()
+            self._created.clear()
+
+    def _acquire(self, key: tuple):
+        with self._lock:
+            idle = self._idle.setdefault(key, queue.Queue())
+            create = idle.empty() and self._created.get(key, 0) < self.workers
+            if create:
+                self._created[key] = self._created.get(key, 0) + 1
+
+        if create:
+            try:
+                api = self._create_api(key[0], dict(key[1]))
+            except Exception:
+                with self._lock:
+                    self._created[key] -= 1
+                raise
+            metrics.increment('ocr_engine.apis_created')
+            return api
+
+        try:
+            return idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No OCR engine free after {self.acquire_timeout}s")
+
+    def _discard(self, key: tuple, api):
+        metrics.increment('ocr_engine.restarts')
+        logger.warning("⚠️ OCR engine failed, restarting it")
+        self._end_api(api)
+        with self._lock:
+            self._created[key] -= 1
+
+    def _create_api(self, oem: int, variables: Dict[str, str]):
+        import tesserocr
+
+        api = tesserocr.PyTessBaseAPI(lang=self.lang, oem=tesserocr.OEM(oem), init=False)
+        # dawg loading switches only take effect at init time
+        api.InitFull(lang=self.lang, oem=tesserocr.OEM(oem), variables=variables)
+        return api
+
+    @staticmethod
+    def _recognize(api, image: np.ndarray, psm: int) -> Dict[str, list]:
+        import tesserocr
+        from PIL import Image
+
+        api.SetPageSegMode(tesserocr.PSM(psm))
+        api.SetImage(Image.fromarray(image))
+        api.Recognize()
+
+        data = {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+        level = tesserocr.RIL.WORD
+        for word in tesserocr.iterate_level(api.GetIterator(), level):
+            box = word.BoundingBox(level)
+            if box is None:
+                continue
+            left, top, right, bottom = box
+            data['text'].append(word.GetUTF8Text(level) or '')
+            data['conf'].append(word.Confidence(level))
+            data['left'].append(left)
+            data['top'].append(top)
+            data['width'].append(right - left)
+            data['height'].append(bottom - top)
+        return data
+
+    @staticmethod
+    def _end_api(api):
+        try:
+            api.End()
+        except Exception:
+            pass
+
+
+def create_ocr_engine(engine: str = 'auto', workers: int = 2) -> OcrEngine:
+    """``auto`` prefers in-process tesserocr and falls back to pytesseract when it is not installed."""
+    if engine not in OCR_ENGINES:
+        raise ValueError(f"Unsupported OCR engine: {engine}. Supported: {list(OCR_ENGINES)}")
+
+    if engine in ('auto', 'tesserocr'):
+        try:
+            import tesserocr  # noqa: F401
+            return TesserocrEngine(workers=workers)
+        except ImportError:
+            if engine == 'tesserocr':
+                raise
+            logger.info("ℹ️ tesserocr is not installed, OCR runs one tesseract process per call")
+
+    return PytesseractEngine()
+
+
+@lru_cache(maxsize=None)
+def get_ocr_engine() -> OcrEngine:
+    """Process-wide OCR engine chosen by OCR_ENGINE / OCR_WORKERS."""
+    return create_ocr_engine(os.getenv('OCR_ENGINE', 'auto').lower(), workers=int(os.getenv('OCR_WORKERS', '2')))
@@ -0,0 +1,66 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import cv2
+from loguru import logger
+
+PROFILES_DIR = Path(__file__).resolve().parent.parent / "resources" / "ocr_profiles"
+
+INTERPOLATIONS = {
+    'nearest': cv2.INTER_NEAREST,
+    'linear': cv2.INTER_LINEAR,
+    'cubic': cv2.INTER_CUBIC,
+    'area': cv2.INTER_AREA,
+}
+THRESHOLD_METHODS = ('fixed', 'otsu', 'adaptive')
+
+
+@dataclass(frozen=True)
+class OcrProfile:
+    """How bid regions are preprocessed for Tesseract; the defaults are the original hand-tuned values."""
+    scale_factor: int = 8
+    interpolation: str = 'cubic'
+    threshold_method: str = 'fixed'
+    threshold: int = 133
+
+    def __post_init__(self):
+        if self.interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unsupported interpolation: {self.interpolation}. Supported: {list(INTERPOLATIONS)}")
+        if self.threshold_method not in THRESHOLD_METHODS:
+            raise ValueError(f"Unsupported threshold method: {self.threshold_method}. "
+                             f"Supported: {list(THRESHOLD_METHODS)}")
+
+    @classmethod
+    def load(cls, path) -> 'OcrProfile':
+        with open(path, encoding='utf-8') as f:
+            return cls(**json.load(f)['profile'])
+
+    def save(self, path, **details):
+        """Write the profile, with free-form ``details`` (e.g. the sweep results that chose it)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'profile': asdict(self), **details}, f, indent=2)
+
+
+def profile_path(layout: str) -> Path:
+    return PROFILES_DIR / f"{layout}.json"
+
+
+@lru_cache(maxsize=None)
+def get_ocr_profile() -> OcrProfile:
+    """
+    Profile of the current layout: OCR_PROFILE names a layout under resources/ocr_profiles
+    or a profile file; without one (or without the file) the default profile is used.
+    """
+    name = os.getenv('OCR_PROFILE', 'canada')
+    path = Path(name) if name.endswith('.json') else profile_path(name)
+    if not path.exists():
+        return OcrProfile()
+
+    profile = OcrProfile.load(path)
+    logger.info(f"🔧 OCR profile {path.name}: {profile}")
+    return profile
@@ -1,32 +1,197 @@
 import os
+import time
+from concurrent.futures import Future
+from typing import Optional
 
 from loguru import logger
 
 from shared.domain.game_snapshot import GameSnapshot
+from shared.domain.street import Street
 from table_detector.domain.captured_window import CapturedWindow
 from table_detector.domain.omaha_engine import OmahaEngine, OmahaEngineException
+from table_detector.services.action_recovery_service import get_action_recovery, recover_moves
+from table_detector.services.bid_stage_service import BidDetectionStage
+from table_detector.services.detection_budget_service import (
+    CycleBudget, DetectionCache, DetectorCosts, DETECTOR_RANKING
+)
+from table_detector.services.detection_pool_service import DetectionProcessPool
+from table_detector.services.engine_state_cache_service import replay_hand
+from table_detector.services.frame_history_service import FrameHistory
+from table_detector.services.hand_context_service import HandContextRegistry
+from table_detector.services.move_memo_service import get_move_memo
 from table_detector.services.position_service import PositionService
 from table_detector.utils.detect_utils import DetectUtils
 from table_detector.utils.drawing_utils import save_detection_result
+from table_detector.utils.metrics import metrics
+
+# Detector of every snapshot part, see DETECTOR_RANKING for their order
+DETECTORS = {
+    'player_cards': DetectUtils.detect_player_cards,
+    'table_cards': DetectUtils.detect_table_cards,
+    'positions': DetectUtils.detect_positions,
+    'actions': DetectUtils.get_player_actions_detection,
+}
+
+# Stages whose results a stage needs; it is skipped when one of them did not run
+STAGE_DEPENDENCIES = {
+    'positions': ('player_cards',),
+    'actions': ('positions',),
+    'hero_to_act': ('player_cards',),
+    'bids': ('player_cards',),
+    'engine': ('player_cards', 'positions', 'actions'),
+}
+
+# Cheap checks on the dependencies' results; a stage whose output would be discarded is skipped
+STAGE_GUARDS = {
+    # No hole cards: the hero is not in the hand
+    'positions': lambda parts: bool(parts['player_cards']),
+    'hero_to_act': lambda parts: bool(parts['player_cards']),
+    'bids': lambda parts: bool(parts['player_cards']),
+    # PositionService.get_positions rejects fewer detections, so actions could not be attributed
+    'actions': lambda parts: len(parts['positions']) >= PositionService.REQUIRED_DETECTIONS,
+    # Nothing to simulate: no hero, positions that cannot be recovered or no actions yet (see skip_engine)
+    'engine': lambda parts: (bool(parts['player_cards'])
+                             and len(parts['positions']) >= PositionService.REQUIRED_DETECTIONS
+                             and any(parts['actions'].values())),
+}
+
+# Per process: how long each detector usually takes
+DETECTOR_COSTS = DetectorCosts()
+
+
+def should_run_stage(stage: str, parts: dict) -> bool:
+    """Dependency and guard check of a detection stage; counts detection_stage.<stage>.executed/skipped."""
+    dependencies = STAGE_DEPENDENCIES.get(stage, ())
+    guard = STAGE_GUARDS.get(stage)
+    should_run = all(dependency in parts for dependency in dependencies) and (guard is None or guard(parts))
+
+    metrics.increment(f'detection_stage.{stage}.{"executed" if should_run else "skipped"}')
+    return should_run
 
 
 class PokerGameProcessor:
 
-    def __init__(self):
+    def __init__(self, frame_history: FrameHistory = None, detection_pool: DetectionProcessPool = None,
+                 hand_contexts: HandContextRegistry = None, cycle_budget: CycleBudget = None,
+                 bid_stage: BidDetectionStage = None):
         self.debug_mode = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
+        self.frame_history = frame_history
+        self.detection_pool = detection_pool
+        self.hand_contexts = hand_contexts
+        self.cycle_budget = cycle_budget
+        self.detection_cache = DetectionCache() if cycle_budget else None
+        self.bid_stage = bid_stage
+
+    def start_cycle(self):
+        """Start the latency budgets of a detection cycle: CYCLE_BUDGET and the bid OCR budget."""
+        if self.cycle_budget:
+            self.cycle_budget.start()
+        if self.bid_stage:
+            self.bid_stage.start_cycle()
+
+    def end_cycle(self, deadline: float = None):
+        """Count a cycle over CYCLE_BUDGET; ``deadline`` of a pipelined cycle, the last started one otherwise."""
+        if not self.cycle_budget:
+            return
+        remaining = self.cycle_budget.remaining() if deadline is None else deadline - time.time()
+        if remaining < 0:
+            metrics.increment('degradation.cycles_over_budget')
+            logger.warning(f"⏳ Detection cycle exceeded its {self.cycle_budget.seconds}s budget "
+                           f"by {-remaining:.2f}s")
 
-    def process_window(self, captured_image: CapturedWindow, timestamp_folder) -> GameSnapshot:
-        """Process captured image and return GameSnapshot."""
+    def _get_deadline(self) -> Optional[float]:
+        return self.cycle_budget.deadline if self.cycle_budget else None
+
+    def process_window(self, captured_image: CapturedWindow, timestamp_folder,
+                       hero_to_act: bool = None) -> GameSnapshot:
+        """Process captured image and return GameSnapshot; ``hero_to_act`` reuses an earlier probe."""
         window_name = captured_image.window_name
 
         self.validate_image(captured_image)
 
-        game_snapshot = PokerGameProcessor.create_game_snapshot(captured_image.get_cv2_image())
+        cv2_image = captured_image.get_cv2_image()
+        game_snapshot = PokerGameProcessor.detect_game_elements(cv2_image, deadline=self._get_deadline(),
+                                                                hero_to_act=hero_to_act)
+        game_snapshot = self.detect_bids(window_name, cv2_image, game_snapshot)
+        game_snapshot = self.finish_window(window_name, game_snapshot)
+        if self.frame_history:
+            self.frame_history.record(window_name, cv2_image, game_snapshot)
         if self.debug_mode:
             save_detection_result(timestamp_folder, captured_image, game_snapshot)
 
         return game_snapshot
 
+    def submit_window(self, captured_image: CapturedWindow, hero_to_act: bool = None) -> "Future[GameSnapshot]":
+        """
+        Detect a window in the detection process pool; ``hero_to_act`` reuses an earlier probe.
+
+        The frame is copied into shared memory, so the captured image may be
+        closed as soon as this returns.
+        """
+        window_name = captured_image.window_name
+
+        self.validate_image(captured_image)
+
+        cv2_image = captured_image.get_cv2_image()
+        detection = self.detection_pool.submit(cv2_image, detect_only=True, deadline=self._get_deadline(),
+                                               hero_to_act=hero_to_act)
+
+        # The engine runs here rather than in the worker, where the window's hand context lives
+        future: "Future[GameSnapshot]" = Future()
+
+        def complete(done: Future):
+            try:
+                game_snapshot = self.detect_bids(window_name, cv2_image, done.result())
+                game_snapshot = self.finish_window(window_name, game_snapshot)
+                if self.frame_history:
+                    self.frame_history.record(window_name, cv2_image, game_snapshot)
+                future.set_result(game_snapshot)
+            except BaseException as e:
+                future.set_exception(e)
+
+        detection.add_done_callback(complete)
+        return future
+
+    def finish_window(self, window_name: str, game_snapshot: GameSnapshot) -> GameSnapshot:
+        """
+        Per-window steps after detection: fill parts skipped for lack of budget
+        from the window's cache, then the engine (incremental within the
+        current hand when hand contexts are enabled).
+        """
+        if self.detection_cache:
+            self.detection_cache.fill_stale(window_name, game_snapshot)
+        if not PokerGameProcessor.should_run_engine(game_snapshot):
+            return PokerGameProcessor.skip_engine(game_snapshot)
+        if self.hand_contexts:
+            return self.hand_contexts.apply_engine(window_name, game_snapshot)
+        return PokerGameProcessor.apply_engine(game_snapshot)
+
+    def detect_bids(self, window_name: str, cv2_image, game_snapshot: GameSnapshot) -> GameSnapshot:
+        """Change-gated bid stage (BID_DETECTION); skipped when the hero is not in the hand."""
+        if self.bid_stage and should_run_stage('bids', {'player_cards': game_snapshot.player_cards}):
+            self.bid_stage.detect(window_name, cv2_image, game_snapshot)
+        return game_snapshot
+
+    def forget_window(self, window_name: str):
+        """Drop per-window state of a closed window."""
+        if self.bid_stage:
+            self.bid_stage.remove(window_name)
+        if self.hand_contexts:
+            self.hand_contexts.remove(window_name)
+        if self.detection_cache:
+            self.detection_cache.remove(window_name)
+        if self.frame_history:
+            self.frame_history.remove(window_name)
+
+    @staticmethod
+    def probe_hero_to_act(captured_image: CapturedWindow) -> bool:
+        """Cheap pre-detection check (action buttons only) used to order changed windows."""
+        try:
+            return DetectUtils.detect_hero_to_act(captured_image.get_cv2_image())
+        except Exception as e:
+            logger.error(f"❌ Hero-to-act probe failed for {captured_image.window_name}: {str(e)}")
+            return False
+
     def validate_image(self, captured_image: CapturedWindow):
         # Add size validation
         image_width, image_height = captured_image.get_size()
@@ -36,27 +201,98 @@ class PokerGameProcessor:
 
     @staticmethod
     def create_game_snapshot(cv2_image):
-        player_cards_detections = DetectUtils.detect_player_cards(cv2_image)
-        table_cards_detections = DetectUtils.detect_table_cards(cv2_image)
-        position_detections = DetectUtils.detect_positions(cv2_image)
-        action_detections = DetectUtils.get_player_actions_detection(cv2_image)
+        game_snapshot = PokerGameProcessor.detect_game_elements(cv2_image)
+        if PokerGameProcessor.should_run_engine(game_snapshot):
+            return PokerGameProcessor.apply_engine(game_snapshot)
+        return PokerGameProcessor.skip_engine(game_snapshot)
+
+    @staticmethod
+    def should_run_engine(game_snapshot: GameSnapshot) -> bool:
+        """Engine stage guard, checked after detection and cache filling (see STAGE_GUARDS)."""
+        parts = {
+            'player_cards': game_snapshot.player_cards,
+            'positions': game_snapshot.positions,
+            'actions': game_snapshot.actions,
+        }
+        return should_run_stage('engine', parts)
+
+    @staticmethod
+    def skip_engine(game_snapshot: GameSnapshot) -> GameSnapshot:
+        """
+        Moves of a snapshot whose engine stage was skipped. A hand before its
+        first action (hero and positions detected, no actions) gets the empty
+        streets the engine reports for it, the other cases keep no moves.
+        """
+        if game_snapshot.player_cards and len(game_snapshot.positions) >= PositionService.REQUIRED_DETECTIONS:
+            game_snapshot.moves = {street: [] for street in Street.get_street_order()}
+        return game_snapshot
+
+    @staticmethod
+    def detect_game_elements(cv2_image, deadline: float = None, hero_to_act: bool = None) -> GameSnapshot:
+        """
+        Template matching part of create_game_snapshot: cards, positions and actions, no moves.
+
+        Detectors run as stages (STAGE_DEPENDENCIES, STAGE_GUARDS): a stage
+        whose output would be discarded, such as positions and actions when
+        the hero has no hole cards, is skipped and its part left empty.
+
+        With a (wall-clock) ``deadline``, detectors after the hole cards that
+        are not expected to finish in time are skipped, in DETECTOR_RANKING
+        order; their parts, and those of stages depending on them, are left
+        empty and listed in ``stale``.
+
+        ``hero_to_act`` is the result of ``probe_hero_to_act`` when the frame
+        was already probed, so the action buttons are not matched twice.
+        """
+        parts = {}
+        stale = set()
+        for rank, part in enumerate(DETECTOR_RANKING):
+            out_of_time = rank > 0 and deadline is not None and not DETECTOR_COSTS.fits(part, deadline)
+            if out_of_time or stale.intersection(STAGE_DEPENDENCIES.get(part, ())):
+                stale.add(part)
+                metrics.increment(f'degradation.{part}.skipped')
+                metrics.increment(f'detection_stage.{part}.skipped')
+                continue
 
-        moves_data = None
+            if not should_run_stage(part, parts):
+                continue
+
+            started = time.perf_counter()
+            parts[part] = DETECTORS[part](cv2_image)
+            DETECTOR_COSTS.record(part, time.perf_counter() - started)
+
+        is_player_move = should_run_stage('hero_to_act', parts) and (
+            hero_to_act if hero_to_act is not None else DetectUtils.detect_hero_to_act(cv2_image))
+        return GameSnapshot(
+            **parts,
+            is_player_move=is_player_move,
+            stale=stale
+        )
+
+    @staticmethod
+    def apply_engine(game_snapshot: GameSnapshot) -> GameSnapshot:
+        """Engine part of create_game_snapshot: fill moves (or engine_error) from detected positions and actions."""
         try:
-            recovered_positions = PositionService.get_positions(position_detections)
-            position_actions = OmahaEngine.convert_to_position_actions(action_detections, recovered_positions)
-            game = OmahaEngine(len(position_actions))
-            game.simulate_all_moves(position_actions)
-            moves_data = game.get_moves_by_street()
-            logger.info(moves_data)
+            recovered_positions = PositionService.get_positions(game_snapshot.positions)
+
+            def reconstruct():
+                position_actions = OmahaEngine.convert_to_position_actions(game_snapshot.actions, recovered_positions)
+                return replay_hand(position_actions).get_moves_by_street()
+
+            try:
+                move_memo = get_move_memo()
+                if move_memo is not None:
+                    game_snapshot.moves = move_memo.get_moves(recovered_positions, game_snapshot.actions, reconstruct)
+                else:
+                    game_snapshot.moves = reconstruct()
+            except OmahaEngineException as e:
+                # Outside the memo: a search that ran out of time must not stick to the pattern
+                position_actions = OmahaEngine.convert_to_position_actions(game_snapshot.actions, recovered_positions)
+                recover_moves(game_snapshot, position_actions, e, get_action_recovery())
+            logger.info(game_snapshot.moves)
         except OmahaEngineException as e:
             # logger.error(f"Error in detection cycle: {str(e)}\n{traceback.format_exc()}")
             logger.error(f"Expected exception: {e}")
+            game_snapshot.engine_error = str(e)
 
-        return GameSnapshot(
-            player_cards=player_cards_detections,
-            table_cards=table_cards_detections,
-            positions=position_detections,
-            actions=action_detections,
-            moves=moves_data
-        )
+        return game_snapshot
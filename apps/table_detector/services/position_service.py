@@ -8,10 +8,12 @@ from shared.domain.position import Position
 
 
 class PositionService:
+    # One detection per seat, "NO" for empty seats
+    REQUIRED_DETECTIONS = 6
 
     @staticmethod
     def get_positions(position_detections: dict[int, Detection]) -> dict[int, Position]:
-        if len(position_detections.items()) < 6:
+        if len(position_detections.items()) < PositionService.REQUIRED_DETECTIONS:
             raise Exception(f"Could not convert {position_detections.items()}")
 
         detected_positions = PositionService.convert_detections_to_detected_positions(position_detections)
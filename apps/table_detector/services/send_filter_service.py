@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.utils.metrics import metrics
+
+
+class SnapshotSendFilter:
+    """
+    Sends a window's snapshot only when its game content changed.
+
+    Chat, timers and animations change pixels without changing the game; such
+    snapshots have the same ``GameSnapshot.get_semantic_digest`` as the last
+    one sent and are suppressed. The server drops tables without an update for
+    a minute, so the last snapshot of every window is resent once
+    ``heartbeat_interval`` seconds have passed since it was sent.
+
+    Callers report successful sends with ``mark_sent``; a snapshot whose send
+    failed is not remembered, so the next one with the same content is sent.
+
+    Metrics: ``send_filter.sent``, ``send_filter.suppressed``, ``send_filter.heartbeats``.
+    """
+
+    def __init__(self, heartbeat_interval: float = 30.0):
+        self.heartbeat_interval = heartbeat_interval
+        # window name -> (digest, last snapshot, last send time)
+        self._windows: Dict[str, Tuple[str, GameSnapshot, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['SnapshotSendFilter']:
+        if os.getenv('SEND_DEDUP', 'true').lower() != 'true':
+            return None
+        return cls(heartbeat_interval=float(os.getenv('SEND_HEARTBEAT_INTERVAL', '30')))
+
+    def should_send(self, window_name: str, game_snapshot: GameSnapshot) -> bool:
+        """Whether the snapshot's content differs from the window's last sent one."""
+        digest = game_snapshot.get_semantic_digest()
+
+        with self._lock:
+            previous = self._windows.get(window_name)
+            if previous and previous[0] == digest:
+                # Keep the newest snapshot for heartbeats, but not the send time
+                self._windows[window_name] = (digest, game_snapshot, previous[2])
+                metrics.increment('send_filter.suppressed')
+                return False
+        return True
+
+    def mark_sent(self, window_name: str, game_snapshot: GameSnapshot, now: float = None):
+        """Record a snapshot the server received (updates and heartbeats)."""
+        now = time.monotonic() if now is None else now
+        digest = game_snapshot.get_semantic_digest()
+        with self._lock:
+            self._windows[window_name] = (digest, game_snapshot, now)
+        metrics.increment('send_filter.sent')
+
+    def filter(self, changed_games: List[Tuple[GameSnapshot, str]], now: float = None) -> List[Tuple[GameSnapshot, str]]:
+        """(game_snapshot, window_name) pairs worth sending: content changes plus due heartbeats."""
+        to_send = [(game_snapshot, window_name) for game_snapshot, window_name in changed_games or []
+                   if self.should_send(window_name, game_snapshot)]
+        return to_send + self.due_heartbeats(now, exclude={window_name for _, window_name in to_send})
+
+    def due_heartbeats(self, now: float = None, exclude=frozenset()) -> List[Tuple[GameSnapshot, str]]:
+        """Last snapshots of windows not sent for ``heartbeat_interval``."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = [(game_snapshot, window_name)
+                   for window_name, (_, game_snapshot, sent_at) in self._windows.items()
+                   if window_name not in exclude and now - sent_at >= self.heartbeat_interval]
+
+        if due:
+            metrics.increment('send_filter.heartbeats', len(due))
+        return due
+
+    def remove(self, window_name: str):
+        with self._lock:
+            self._windows.pop(window_name, None)
@@ -0,0 +1,122 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from table_detector.domain.captured_window import CapturedWindow
+from table_detector.utils.metrics import metrics
+
+HERO_TO_ACT = 'hero_to_act'
+WAITING = 'waiting'
+
+# Lower value is processed first
+PRIORITY_ORDER = {HERO_TO_ACT: 0, WAITING: 1}
+
+
+@dataclass(order=True)
+class PrioritizedWindow:
+    priority: int
+    deadline: float
+    sequence: int
+    captured_window: CapturedWindow = field(compare=False)
+    priority_class: str = field(compare=False)
+    queued_at: float = field(compare=False)
+
+    @property
+    def window_name(self) -> str:
+        return self.captured_window.window_name
+
+
+class TablePriorityQueue:
+    """
+    Changed windows of a cycle ordered by urgency.
+
+    Tables where the hero has to act (action buttons visible) come first,
+    each with a latency deadline of ``hero_deadline`` seconds from the
+    moment it was queued; the other tables follow with ``waiting_deadline``.
+    Within a class the earliest deadline goes first.
+
+    Windows are pushed by the capture loop while a detection thread takes
+    them with ``get``; ``close`` tells it the cycle's captures are done.
+
+    ``complete`` records the queue-to-send latency per class in the
+    ``table_priority.<class>.latency_seconds`` histogram and counts
+    ``table_priority.<class>.deadline_missed``.
+    """
+
+    def __init__(self, hero_deadline: float = 1.0, waiting_deadline: float = 5.0):
+        self.deadlines = {HERO_TO_ACT: hero_deadline, WAITING: waiting_deadline}
+        self._heap: List[PrioritizedWindow] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @classmethod
+    def from_env(cls, waiting_deadline: float) -> Optional['TablePriorityQueue']:
+        if os.getenv('PRIORITY_SCHEDULING', 'false').lower() != 'true':
+            return None
+        return cls(hero_deadline=float(os.getenv('HERO_DEADLINE', '1.0')), waiting_deadline=waiting_deadline)
+
+    def push(self, captured_window: CapturedWindow, hero_to_act: bool, now: float = None) -> PrioritizedWindow:
+        now = time.monotonic() if now is None else now
+        priority_class = HERO_TO_ACT if hero_to_act else WAITING
+        item = PrioritizedWindow(
+            priority=PRIORITY_ORDER[priority_class],
+            deadline=now + self.deadlines[priority_class],
+            sequence=next(self._sequence),
+            captured_window=captured_window,
+            priority_class=priority_class,
+            queued_at=now
+        )
+        with self._condition:
+            heapq.heappush(self._heap, item)
+            self._condition.notify()
+        metrics.increment(f'table_priority.{priority_class}.queued')
+        return item
+
+    def pop(self) -> Optional[PrioritizedWindow]:
+        with self._condition:
+            return heapq.heappop(self._heap) if self._heap else None
+
+    def get(self) -> Optional[PrioritizedWindow]:
+        """Most urgent window, waiting for one to be pushed; None once the queue is closed and empty."""
+        with self._condition:
+            while not self._heap and not self._closed:
+                self._condition.wait()
+            return heapq.heappop(self._heap) if self._heap else None
+
+    def open(self):
+        """Start a cycle: ``get`` waits for pushes again."""
+        with self._condition:
+            self._closed = False
+
+    def close(self):
+        """No more pushes this cycle: ``get`` returns the remaining windows, then None."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def drain(self):
+        """Pop all queued windows, most urgent first."""
+        while True:
+            item = self.pop()
+            if item is None:
+                return
+            yield item
+
+    def __len__(self):
+        with self._condition:
+            return len(self._heap)
+
+    @staticmethod
+    def complete(item: PrioritizedWindow, now: float = None) -> float:
+        """Record that a window's update was sent; returns its latency."""
+        now = time.monotonic() if now is None else now
+        latency = now - item.queued_at
+        metrics.observe(f'table_priority.{item.priority_class}.latency_seconds', latency)
+        if now > item.deadline:
+            metrics.increment(f'table_priority.{item.priority_class}.deadline_missed')
+        return latency
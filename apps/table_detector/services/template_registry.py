@@ -8,6 +8,16 @@ from table_detector.utils.opencv_utils import read_cv2_image
 
 
 class TemplateRegistry:
+    # Template folder -> attribute caching its templates
+    CATEGORIES = {
+        "player_cards": "_player_templates",
+        "table_cards": "_table_templates",
+        "positions": "_position_templates",
+        "actions": "_actions_templates",
+        "moves": "_jurojin_action_templates",
+        "digits": "_digit_templates",
+    }
+
     def __init__(self, country: str, project_root: str):
         self.country = country
         self.project_root = project_root
@@ -17,6 +27,7 @@ class TemplateRegistry:
         self._position_templates: Optional[Dict[str, np.ndarray]] = None
         self._actions_templates: Optional[Dict[str, np.ndarray]] = None
         self._jurojin_action_templates: Optional[Dict[str, np.ndarray]] = None
+        self._digit_templates: Optional[Dict[str, np.ndarray]] = None
 
         self._templates_dir = Path(project_root) / "apps" / "table_detector" / "resources" / "templates" / country
 
@@ -68,6 +79,16 @@ class TemplateRegistry:
             self._jurojin_action_templates = self._load_template_category("moves")
         return self._jurojin_action_templates
 
+    @property
+    def digit_templates(self) -> Dict[str, np.ndarray]:
+        if self._digit_templates is None:
+            self._digit_templates = self._load_template_category("digits")
+        return self._digit_templates
+
+    @property
+    def templates_dir(self) -> Path:
+        return self._templates_dir
+
     def _load_template_category(self, category: str) -> Dict[str, np.ndarray]:
         templates_path = self._templates_dir / category
 
@@ -81,5 +102,17 @@ class TemplateRegistry:
             logger.error(f"❌ Error loading {category} templates: {str(e)}")
             return {}
 
+    def load_all(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Load every category; returns category -> {template name -> template}."""
+        for category, attribute in self.CATEGORIES.items():
+            if getattr(self, attribute) is None:
+                setattr(self, attribute, self._load_template_category(category))
+        return {category: getattr(self, attribute) for category, attribute in self.CATEGORIES.items()}
+
+    def preload(self, templates_by_category: Dict[str, Dict[str, np.ndarray]]):
+        """Use already loaded templates (e.g. shared memory views) instead of reading them from disk."""
+        for category, templates in templates_by_category.items():
+            setattr(self, self.CATEGORIES[category], templates)
+
     def has_position_templates(self) -> bool:
         return bool(self.position_templates)
@@ -1,15 +1,24 @@
 import os
-from typing import List
+from typing import List, Iterator, Set, Callable
 
 from loguru import logger
 
 from table_detector.domain.captured_window import CapturedWindow
+from table_detector.services.archive_writer_service import ArchiveWriter
+from table_detector.services.capture_pool_service import WindowCapturePool
+from table_detector.services.window_registry_service import WindowRegistry
 from table_detector.utils.capture_utils import load_images_from_folder, get_poker_window_info, _capture_windows, \
     save_images_to_window_folders, capture_fullscreen
-from table_detector.utils.windows_utils import write_windows_list
+from table_detector.utils.capture_backend import CaptureBackend
+from table_detector.utils.opencv_utils import pil_to_cv2
+from table_detector.utils.windows_utils import write_windows_list, format_windows_list
 
+POKER_WINDOW_TITLE = "Pot Limit Omaha"
 
-def capture_and_save_windows(timestamp_folder: str = None, save_windows=True, debug=False) -> List[CapturedWindow]:
+
+def capture_and_save_windows(timestamp_folder: str = None, save_windows=True, debug=False,
+                             archive_writer: ArchiveWriter = None,
+                             window_registry: WindowRegistry = None) -> List[CapturedWindow]:
     if debug:
         captured_images = load_images_from_folder(timestamp_folder)
         if captured_images:
@@ -18,14 +27,20 @@ def capture_and_save_windows(timestamp_folder: str = None, save_windows=True, de
             logger.error("❌ No images loaded from debug folder")
         return captured_images
 
-    windows = get_poker_window_info("Pot Limit Omaha")
+    if window_registry is not None:
+        windows = window_registry.get_windows()
+        backend = window_registry.backend
+    else:
+        windows = get_poker_window_info(POKER_WINDOW_TITLE)
+        backend = None
     if len(windows) > 0:
         logger.info(f"Found {len(windows)} poker windows with titles:")
-        os.makedirs(timestamp_folder, exist_ok=True)
+        if archive_writer is None:
+            os.makedirs(timestamp_folder, exist_ok=True)
     else:
         return []
 
-    captured_images = _capture_windows(windows=windows)
+    captured_images = _capture_windows(windows=windows, backend=backend)
 
     if save_windows:
         full_screen = capture_fullscreen()
@@ -39,25 +54,30 @@ def capture_and_save_windows(timestamp_folder: str = None, save_windows=True, de
         captured_images.append(full_screen_captured)
         logger.info(f"Captured full screen")
 
-        # Create window folder mapping - each window gets its own folder
-        window_folder_mapping = {}
-        for captured_image in captured_images:
-            if captured_image.window_name != 'full_screen':
-                # Create sanitized folder name
-                safe_window_name = "".join(
-                    [c if c.isalnum() or c in ('_', '-', ' ') else "_" for c in captured_image.window_name])
-                safe_window_name = safe_window_name.strip().replace(' ', '_')
-                window_folder = os.path.join(timestamp_folder, safe_window_name)
-                window_folder_mapping[captured_image.window_name] = window_folder
-            else:
-                # Full screen goes to base folder
-                window_folder_mapping[captured_image.window_name] = timestamp_folder
+        # Create window folder mapping - each window gets its own folder, full screen goes to base folder
+        window_folder_mapping = {
+            captured_image.window_name: _window_folder(timestamp_folder, captured_image.window_name)
+            for captured_image in captured_images
+        }
 
-        # Save images to their respective window folders
-        save_images_to_window_folders(captured_images, timestamp_folder, window_folder_mapping)
+        if archive_writer is not None:
+            # Hand images over to the background writer - the detection cycle never waits on disk
+            captures = {
+                captured_image.window_name: (
+                    window_folder_mapping[captured_image.window_name],
+                    captured_image.filename,
+                    captured_image.image
+                )
+                for captured_image in captured_images
+            }
+            archive_writer.submit_cycle(timestamp_folder, captures, windows, format_windows_list(windows))
+            full_screen_captured.close()
+        else:
+            # Save images to their respective window folders
+            save_images_to_window_folders(captured_images, timestamp_folder, window_folder_mapping)
 
-        # Write the window list to base folder
-        write_windows_list(windows, timestamp_folder)
+            # Write the window list to base folder
+            write_windows_list(windows, timestamp_folder)
 
         # Remove full screen from the list before returning
         captured_images = [img for img in captured_images if img.window_name != 'full_screen']
@@ -65,3 +85,57 @@ def capture_and_save_windows(timestamp_folder: str = None, save_windows=True, de
     return captured_images
 
 
+def stream_and_save_windows(timestamp_folder, windows: List[dict], backend: CaptureBackend,
+                            capture_pool: WindowCapturePool, save_windows=True,
+                            archive_writer: ArchiveWriter = None, skip_windows: Set[str] = frozenset(),
+                            should_archive: Callable[[CapturedWindow], bool] = None) -> Iterator[CapturedWindow]:
+    """
+    Yield captured poker windows as soon as each capture completes.
+
+    Images are archived (or queued for archiving) before they are yielded, so
+    the consumer may close them right away. The cycle is submitted to the
+    archive writer once the generator is exhausted. ``should_archive`` limits
+    archiving to some of the captures; the cycle is not archived at all when
+    none of them qualifies.
+    """
+    if not windows:
+        return
+
+    logger.debug(f"Found {len(windows)} poker windows")
+    captures = {}
+
+    for captured_image in capture_pool.capture(windows, backend, skip_windows):
+        if save_windows and (should_archive is None or should_archive(captured_image)):
+            window_folder = _window_folder(timestamp_folder, captured_image.window_name)
+            if archive_writer is not None:
+                captures[captured_image.window_name] = (
+                    window_folder, captured_image.filename, pil_to_cv2(captured_image.image)
+                )
+            else:
+                os.makedirs(window_folder, exist_ok=True)
+                captured_image.save(os.path.join(window_folder, captured_image.filename))
+                captures[captured_image.window_name] = None
+
+        yield captured_image
+
+    if not save_windows or not captures:
+        return
+
+    full_screen = capture_fullscreen()
+    if archive_writer is not None:
+        captures['full_screen'] = (timestamp_folder, "full_screen.png", full_screen)
+        archive_writer.submit_cycle(timestamp_folder, captures, windows, format_windows_list(windows))
+    else:
+        full_screen.save(os.path.join(timestamp_folder, "full_screen.png"))
+        write_windows_list(windows, timestamp_folder)
+    full_screen.close()
+
+
+def _window_folder(timestamp_folder, window_name: str) -> str:
+    if window_name == 'full_screen':
+        return timestamp_folder
+
+    # Create sanitized folder name
+    safe_window_name = "".join([c if c.isalnum() or c in ('_', '-', ' ') else "_" for c in window_name])
+    safe_window_name = safe_window_name.strip().replace(' ', '_')
+    return os.path.join(timestamp_folder, safe_window_name)
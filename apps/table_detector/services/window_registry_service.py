@@ -0,0 +1,85 @@
+import os
+import time
+from typing import Dict, List, Set
+
+from loguru import logger
+
+from table_detector.utils.capture_backend import CaptureBackend
+from table_detector.utils.metrics import metrics
+
+
+class WindowRegistry:
+    """
+    Cache of poker windows (hwnd -> metadata) between detection cycles.
+
+    A full enumeration (every top-level window plus a process lookup each) only
+    runs every ``refresh_interval`` seconds or on a change event: a cached
+    window vanished or lost its poker title, the foreground window is one the
+    registry has never seen, or ``invalidate()`` was called. Other cycles only
+    re-check title and rect of the cached windows.
+    """
+
+    def __init__(self, backend: CaptureBackend, title_filter: str, refresh_interval: float = None):
+        self.backend = backend
+        self.title_filter = title_filter
+        self.refresh_interval = refresh_interval if refresh_interval is not None \
+            else float(os.getenv('WINDOW_REFRESH_INTERVAL', '30'))
+        self._windows: Dict[int, dict] = {}
+        self._known_hwnds: Set[int] = set()
+        self._last_refresh = None
+        self._dirty = True
+
+    def invalidate(self):
+        """Force a full enumeration on the next call."""
+        self._dirty = True
+
+    def get_windows(self) -> List[dict]:
+        """Current poker windows, sorted by hwnd, in ``get_window_info`` format."""
+        if self._needs_full_refresh():
+            self._full_refresh()
+        elif not self._recheck():
+            # A cached window changed in a way the cheap check cannot explain
+            self._full_refresh()
+
+        return [dict(w) for _, w in sorted(self._windows.items())]
+
+    def _needs_full_refresh(self) -> bool:
+        if self._dirty or self._last_refresh is None:
+            return True
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            return True
+
+        foreground = self.backend.get_foreground_window()
+        if foreground is not None and foreground not in self._known_hwnds:
+            logger.debug(f"🪟 New foreground window {foreground}, refreshing window list")
+            return True
+        return False
+
+    def _full_refresh(self):
+        all_windows = self.backend.enumerate_windows()
+
+        self._known_hwnds = {w['hwnd'] for w in all_windows}
+        self._windows = {w['hwnd']: dict(w) for w in all_windows if self.title_filter in w['title']}
+        self._last_refresh = time.monotonic()
+        self._dirty = False
+
+        metrics.increment('window_registry.full_refreshes')
+        metrics.set_gauge('window_registry.windows', len(self._windows))
+
+    def _recheck(self) -> bool:
+        """Update title/rect of cached windows. Returns False if a full refresh is needed."""
+        metrics.increment('window_registry.rechecks')
+
+        for hwnd, window in self._windows.items():
+            state = self.backend.get_window_state(hwnd)
+            if state is None or self.title_filter not in state['title']:
+                logger.debug(f"🪟 Window {hwnd} closed or changed, refreshing window list")
+                return False
+
+            rect = tuple(state['rect'])
+            window['title'] = state['title']
+            window['rect'] = rect
+            window['width'] = rect[2] - rect[0]
+            window['height'] = rect[3] - rect[1]
+
+        return True
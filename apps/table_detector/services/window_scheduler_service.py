@@ -0,0 +1,72 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set
+
+from table_detector.utils.metrics import metrics
+
+
+@dataclass
+class WindowSchedule:
+    interval: float
+    next_due: float
+
+
+class AdaptiveWindowScheduler:
+    """
+    Per-window probe cadence for the fast change probe.
+
+    Every window starts at ``min_interval``. Each probe that finds the table
+    unchanged multiplies its interval by ``backoff_factor`` up to
+    ``max_interval``; a change resets it to ``min_interval``, so active tables
+    are probed often and idle ones cost almost nothing.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, backoff_factor: float = 2.0):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f"Invalid probe intervals: min={min_interval}, max={max_interval}")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self._schedules: Dict[str, WindowSchedule] = {}
+
+    @classmethod
+    def from_env(cls, max_interval: float) -> Optional['AdaptiveWindowScheduler']:
+        """Scheduler configured by PROBE_INTERVAL; None when the fast probe is disabled."""
+        probe_interval = float(os.getenv('PROBE_INTERVAL', '0'))
+        if probe_interval <= 0:
+            return None
+        return cls(
+            min_interval=probe_interval,
+            max_interval=max(float(os.getenv('PROBE_MAX_INTERVAL', str(max_interval))), probe_interval),
+            backoff_factor=float(os.getenv('PROBE_BACKOFF_FACTOR', '2.0'))
+        )
+
+    def due_windows(self, window_names: Iterable[str], now: float = None) -> Set[str]:
+        """Windows that should be probed now; unknown windows are always due."""
+        now = time.monotonic() if now is None else now
+        window_names = list(window_names)
+        due = {name for name in window_names
+               if name not in self._schedules or self._schedules[name].next_due <= now}
+
+        metrics.increment('scheduler.probed', len(due))
+        metrics.increment('scheduler.skipped', len(window_names) - len(due))
+        return due
+
+    def record(self, window_name: str, changed: bool, now: float = None):
+        now = time.monotonic() if now is None else now
+        schedule = self._schedules.get(window_name)
+
+        if changed or schedule is None:
+            interval = self.min_interval
+        else:
+            interval = min(schedule.interval * self.backoff_factor, self.max_interval)
+
+        self._schedules[window_name] = WindowSchedule(interval=interval, next_due=now + interval)
+
+    def forget(self, window_name: str):
+        self._schedules.pop(window_name, None)
+
+    def get_interval(self, window_name: str) -> float:
+        schedule = self._schedules.get(window_name)
+        return schedule.interval if schedule else self.min_interval
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from loguru import logger
+
+from shared.domain.moves import MoveType
+from table_detector.domain.omaha_engine import OmahaEngine
+
+ACTIONS = [MoveType.FOLD, MoveType.CHECK, MoveType.CALL, MoveType.BET, MoveType.RAISE, MoveType.ALL_IN]
+# Skewed towards passive actions so that hands reach the later streets
+WEIGHTS = [2, 4, 4, 1, 1, 1]
+
+
+def outcome(call):
+    """Exception type and message of a call, or None when it succeeded."""
+    try:
+        call()
+    except Exception as e:
+        return type(e).__name__, str(e)
+    return None
+
+
+def state_of(engine: OmahaEngine):
+    return engine.poker_state.actor_index, engine.poker_state.street_index, engine.get_moves_by_street()
+
+
+class NativePloStateTest(unittest.TestCase):
+    """Differential tests: the native backend must accept and record exactly what pokerkit does."""
+
+    @classmethod
+    def setUpClass(cls):
+        logger.disable('table_detector.domain.omaha_engine')
+
+    @classmethod
+    def tearDownClass(cls):
+        logger.enable('table_detector.domain.omaha_engine')
+
+    def assert_same_actions(self, player_count: int, actions):
+        pokerkit = OmahaEngine(player_count, backend='pokerkit')
+        native = OmahaEngine(player_count, backend='native')
+        self.assertEqual(pokerkit.seat_mapping, native.seat_mapping)
+
+        for action in actions:
+            if pokerkit.poker_state.actor_index is None:
+                break
+            position = pokerkit.get_current_position()
+            self.assertEqual(outcome(lambda: pokerkit.process_action(position, action)),
+                             outcome(lambda: native.process_action(position, action)))
+            self.assertEqual(state_of(pokerkit), state_of(native))
+
+    def test_random_actions_are_accepted_like_pokerkit(self):
+        rng = random.Random(7)
+        for _ in range(400):
+            player_count = rng.randint(2, 6)
+            actions = rng.choices(ACTIONS, WEIGHTS, k=rng.randint(1, 60))
+            with self.subTest(player_count=player_count, actions=actions):
+                self.assert_same_actions(player_count, actions)
+
+    def test_raising_until_all_in_matches_pokerkit(self):
+        for player_count in range(2, 7):
+            with self.subTest(player_count=player_count):
+                self.assert_same_actions(player_count, [MoveType.RAISE] * 220 + [MoveType.CALL] * 10)
+                self.assert_same_actions(player_count, [MoveType.CALL, MoveType.RAISE] * 120 + [MoveType.CHECK] * 10)
+
+    def test_detected_move_lists_are_simulated_like_pokerkit(self):
+        rng = random.Random(11)
+        for _ in range(400):
+            player_count = rng.randint(2, 6)
+            positions = OmahaEngine.POSITION_ORDERS[player_count]
+            player_moves = {position: rng.choices(ACTIONS, WEIGHTS, k=rng.randint(0, 4)) for position in positions}
+
+            with self.subTest(player_count=player_count, player_moves=player_moves):
+                pokerkit = OmahaEngine(player_count, backend='pokerkit')
+                native = OmahaEngine(player_count, backend='native')
+                pokerkit_moves = {position: list(moves) for position, moves in player_moves.items()}
+                native_moves = {position: list(moves) for position, moves in player_moves.items()}
+
+                self.assertEqual(outcome(lambda: pokerkit.simulate_all_moves(pokerkit_moves)),
+                                 outcome(lambda: native.simulate_all_moves(native_moves)))
+                self.assertEqual(pokerkit.get_moves_by_street(), native.get_moves_by_street())
+                self.assertEqual(pokerkit_moves, native_moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from shared.domain.street import Street
+from table_detector.services.action_recovery_service import ActionSequenceRecovery
+from table_detector.services.hand_context_service import HandContextRegistry
+from table_detector.services.move_memo_service import MoveReconstructionMemo
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.test.service.hand_context_service_test import snapshot
+from table_detector.utils.metrics import metrics
+
+EP, MP, CO, BTN, SB, BB = (Position.EARLY_POSITION, Position.MIDDLE_POSITION, Position.CUTOFF,
+                           Position.BUTTON, Position.SMALL_BLIND, Position.BIG_BLIND)
+FOLD, CALL, CHECK, BET = MoveType.FOLD, MoveType.CALL, MoveType.CHECK, MoveType.BET
+
+
+def actions(**moves) -> dict:
+    seats = {'ep': EP, 'mp': MP, 'co': CO, 'btn': BTN, 'sb': SB, 'bb': BB}
+    return {position: list(moves.get(name, [])) for name, position in seats.items()}
+
+
+class ActionRecoveryServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.recovery = ActionSequenceRecovery(time_budget=1.0)
+
+    def test_missing_fold_is_inserted(self):
+        engine, edits = self.recovery.recover(actions(mp=[CALL], co=[FOLD], btn=[FOLD], sb=[CALL], bb=[CHECK]))
+
+        self.assertEqual(["insert fold for EARLY_POSITION"], edits)
+        self.assertEqual([(EP, FOLD), (MP, CALL), (CO, FOLD), (BTN, FOLD), (SB, CALL), (BB, CHECK)],
+                         engine.get_moves_by_street()[Street.PREFLOP])
+
+    def test_missing_check_is_inserted_on_a_later_street(self):
+        engine, edits = self.recovery.recover(actions(ep=[FOLD], mp=[CALL, BET], co=[FOLD], btn=[FOLD],
+                                                      sb=[CALL], bb=[CHECK, CHECK]))
+
+        self.assertEqual(["insert check for SMALL_BLIND"], edits)
+        self.assertEqual([(SB, CHECK), (BB, CHECK), (MP, BET)], engine.get_moves_by_street()[Street.FLOP])
+
+    def test_spurious_action_is_dropped(self):
+        engine, edits = self.recovery.recover(actions(ep=[FOLD, CALL], mp=[CALL]))
+
+        self.assertEqual(["drop call of EARLY_POSITION"], edits)
+        self.assertEqual([(EP, FOLD), (MP, CALL)], engine.get_moves_by_street()[Street.PREFLOP])
+
+    def test_search_is_bounded(self):
+        broken = actions(mp=[CALL, CALL, CALL], btn=[FOLD, FOLD])
+
+        self.assertIsNone(ActionSequenceRecovery(max_edits=1, time_budget=1.0).recover(broken))
+        self.assertIsNone(ActionSequenceRecovery(time_budget=0).recover(actions(mp=[CALL])))
+        self.assertEqual(2, metrics.get_counter('action_recovery.failed'))
+
+    def test_engine_paths_report_recovered_moves(self):
+        frame = {2: ["call"]}
+        registry = HandContextRegistry(action_recovery=self.recovery)
+
+        incremental = registry.apply_engine("table", snapshot(frame))
+        full = PokerGameProcessor.apply_engine(snapshot(frame))
+
+        self.assertIsNone(incremental.engine_error)
+        self.assertEqual([(EP, FOLD), (MP, CALL)], incremental.moves[Street.PREFLOP])
+        self.assertEqual(dict(full.moves), incremental.moves)
+        # Guessed moves are told apart from replayed ones
+        self.assertEqual({'moves'}, incremental.stale)
+        self.assertEqual({'moves'}, full.stale)
+
+    def test_failed_recovery_is_retried_on_the_next_frame(self):
+        memo = MoveReconstructionMemo()
+        frame = {2: ["call"]}
+
+        failed = HandContextRegistry(move_memo=memo, action_recovery=ActionSequenceRecovery(time_budget=0))
+        self.assertIsNotNone(failed.apply_engine("table", snapshot(frame)).engine_error)
+
+        recovered = HandContextRegistry(move_memo=memo, action_recovery=self.recovery).apply_engine(
+            "table", snapshot(frame))
+        self.assertIsNone(recovered.engine_error)
+        self.assertEqual([(EP, FOLD), (MP, CALL)], recovered.moves[Street.PREFLOP])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from table_detector.services.archive_writer_service import ArchiveWriter, DROP_NEWEST, DROP_OLDEST
+
+
+class BlockingArchiveWriter(ArchiveWriter):
+    """Archive writer whose disk writes wait until the test releases them."""
+
+    def __init__(self, *args, **kwargs):
+        self.release = threading.Event()
+        self.written_paths = []
+        super().__init__(*args, **kwargs)
+
+    def _write(self, job):
+        self.release.wait(5)
+        self.written_paths.append(job.path)
+
+
+class ArchiveWriterServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.image = np.random.randint(0, 255, (58, 78, 3), dtype=np.uint8)
+
+    def test_codecs_round_trip(self):
+        for codec in ('png', 'webp', 'npy'):
+            with self.subTest(codec=codec):
+                writer = ArchiveWriter(codec=codec)
+                writer.submit_image(self.folder / codec, "window.png", self.image.copy())
+                writer.close()
+
+                path = self.folder / codec / f"window.{codec}"
+                loaded = np.load(path) if codec == 'npy' else cv2.imread(str(path))
+                np.testing.assert_array_equal(self.image, loaded)
+                self.assertEqual(1, writer.get_stats()['written'])
+
+    def test_pil_image_is_copied_on_submit(self):
+        pil_image = Image.fromarray(cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB))
+        writer = ArchiveWriter(codec='png')
+
+        writer.submit_image(self.folder, "window.png", pil_image)
+        pil_image.close()
+        writer.close()
+
+        np.testing.assert_array_equal(self.image, cv2.imread(str(self.folder / "window.png")))
+
+    def test_submit_text(self):
+        writer = ArchiveWriter()
+        writer.submit_text(self.folder / "nested" / "windows.txt", "Total windows: 1\n")
+        writer.close()
+
+        self.assertEqual("Total windows: 1\n", (self.folder / "nested" / "windows.txt").read_text(encoding='utf-8'))
+
+    def test_drop_newest_when_full(self):
+        writer = BlockingArchiveWriter(max_queue_size=1, drop_policy=DROP_NEWEST)
+        accepted = [writer.submit_text(self.folder / f"{i}.txt", str(i)) for i in range(5)]
+        writer.release.set()
+        writer.close()
+
+        self.assertTrue(accepted[0])
+        self.assertFalse(accepted[-1])
+        self.assertGreater(writer.get_stats()['dropped'], 0)
+        self.assertNotIn(self.folder / "4.txt", writer.written_paths)
+
+    def test_drop_oldest_keeps_latest_job(self):
+        writer = BlockingArchiveWriter(max_queue_size=1, drop_policy=DROP_OLDEST)
+        accepted = [writer.submit_text(self.folder / f"{i}.txt", str(i)) for i in range(5)]
+        writer.release.set()
+        writer.close()
+
+        self.assertTrue(all(accepted))
+        self.assertGreater(writer.get_stats()['dropped'], 0)
+        self.assertIn(self.folder / "4.txt", writer.written_paths)
+
+    def test_close_is_not_delayed_by_concurrent_submissions(self):
+        writer = BlockingArchiveWriter(max_queue_size=1, drop_policy=DROP_OLDEST)
+        writer.release.set()
+        stop = threading.Event()
+
+        def submit_until_stopped():
+            while not stop.is_set():
+                writer.submit_text(self.folder / "busy.txt", "busy")
+
+        submitter = threading.Thread(target=submit_until_stopped)
+        submitter.start()
+        try:
+            started = time.monotonic()
+            writer.close(timeout=5)
+            elapsed = time.monotonic() - started
+        finally:
+            stop.set()
+            submitter.join(5)
+
+        self.assertLess(elapsed, 2)
+        self.assertFalse(writer._thread.is_alive())
+        self.assertFalse(writer.submit_text(self.folder / "late.txt", "late"))
+
+    def test_lag_is_age_of_oldest_pending_job(self):
+        writer = BlockingArchiveWriter(max_queue_size=4)
+        self.assertEqual(0.0, writer.get_stats()['lag_seconds'])
+
+        writer.submit_text(self.folder / "0.txt", "0")
+        writer.submit_text(self.folder / "1.txt", "1")
+        time.sleep(0.05)
+        self.assertGreaterEqual(writer.get_stats()['lag_seconds'], 0.05)
+
+        writer.release.set()
+        writer.flush(5)
+        self.assertEqual(0.0, writer.get_stats()['lag_seconds'])
+        writer.close()
+
+    def test_rejects_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            ArchiveWriter(codec='bmp')
@@ -0,0 +1,69 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.frame_store_service import FrameStore
+from table_detector.tools.batch_reprocess import iter_archive_frames, reprocess
+from table_detector.utils.opencv_utils import write_image
+
+
+class BatchReprocessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.frame = np.zeros((584, 784, 3), dtype=np.uint8)
+
+    def _write_tree_frame(self, relative: str, image=None):
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_image(path, self.frame if image is None else image)
+        return path
+
+    def test_enumerates_tree_and_cas_frames(self):
+        self._write_tree_frame("2025_01_01/120000/table_1/01_table_1.png")
+        self._write_tree_frame("2025_01_01/120000/full_screen.png")
+        self._write_tree_frame("2025_01_01/120000/table_1/01_table_1_result.png")
+
+        store = FrameStore(self.root)
+        digest = store.put_frame(self.frame)
+        store.write_manifest("2025_01_02/090000", {'table_2': digest})
+        store.write_manifest("2025_01_02/090003", {'table_2': digest, 'table_3': digest})
+
+        frame_ids = [frame_id for frame_id, _ in iter_archive_frames(self.root)]
+
+        self.assertEqual(["2025_01_01/120000/table_1/01_table_1.png", "cas:2025_01_02/090000/table_2"], frame_ids)
+
+    def test_resumes_after_written_frames(self):
+        for i in range(3):
+            self._write_tree_frame(f"2025_01_01/12000{i}/table_1/01_table_1.png")
+        self._write_tree_frame("2025_01_01/120003/table_1/01_table_1.png", np.zeros((10, 10, 3), dtype=np.uint8))
+        output = self.root / "out" / "snapshots.jsonl"
+
+        with patch('table_detector.tools.batch_reprocess.PokerGameProcessor.create_game_snapshot',
+                   return_value=GameSnapshot()) as create_game_snapshot:
+            first = reprocess(self.root, output, workers=0, limit=2)
+            # Interrupted while writing the next record
+            with open(output, 'a') as f:
+                f.write('{"frame": "2025_01_01/1200')
+            second = reprocess(self.root, output, workers=0)
+            third = reprocess(self.root, output, workers=0)
+
+        self.assertEqual(2, first['processed'])
+        self.assertEqual((2, 2, 1), (second['skipped'], second['processed'], second['errors']))
+        self.assertEqual(0, third['processed'])
+        self.assertEqual(3, create_game_snapshot.call_count)
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual(4, len(records))
+        self.assertEqual(4, len({record['frame'] for record in records}))
+        self.assertIn('error', records[-1])
+        self.assertEqual([], records[0]['snapshot']['player_cards'])
+
+
+if __name__ == '__main__':
+    unittest.main()
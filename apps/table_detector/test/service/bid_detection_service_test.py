@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from table_detector.services import bid_detection_service
+from table_detector.services.bid_detection_service import _extract_bid_texts, _stitch_regions
+from table_detector.services.ocr_cache_service import OcrResultCache
+from table_detector.utils.metrics import metrics
+
+
+def _ocr_data(words):
+    """image_to_data DICT output for (text, conf, left, top, width, height) words"""
+    keys = ('text', 'conf', 'left', 'top', 'width', 'height')
+    return {key: [word[i] for word in words] for i, key in enumerate(keys)}
+
+
+class BidDetectionServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.cache = OcrResultCache(max_entries=8)
+        cache_patcher = patch.object(bid_detection_service, 'get_ocr_cache', return_value=self.cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.regions = {
+            2: np.full((120, 320), 255, dtype=np.uint8),
+            5: np.full((120, 240), 255, dtype=np.uint8),
+            6: np.full((120, 200), 255, dtype=np.uint8),
+        }
+
+    def test_stitched_bands_do_not_overlap(self):
+        stitched, bands = _stitch_regions(self.regions)
+
+        self.assertEqual(320, stitched.shape[1])
+        self.assertEqual([2, 5, 6], list(bands))
+        for (_, bottom), (next_top, _) in zip(list(bands.values()), list(bands.values())[1:]):
+            self.assertGreaterEqual(next_top - bottom, bid_detection_service.BATCH_SEPARATOR_HEIGHT)
+
+    def test_batched_ocr_assigns_words_to_seats(self):
+        _, bands = _stitch_regions(self.regions)
+        top_2, top_6 = bands[2][0], bands[6][0]
+        data = _ocr_data([
+            ('', -1, 0, 0, 320, 500),
+            # Seat 2 read as two words with a decimal point between them
+            ('3', 90, 20, top_2 + 30, 40, 60),
+            ('.', 80, 62, top_2 + 80, 8, 8),
+            ('5', 91, 72, top_2 + 30, 40, 60),
+            ('12.5', 95, 10, top_6 + 30, 120, 60),
+            ('7', 20, 10, top_6 + 30, 40, 60),  # too low confidence
+        ])
+
+        engine = Mock(image_to_data=Mock(return_value=data))
+        with patch.object(bid_detection_service, 'get_ocr_engine', return_value=engine):
+            texts = _extract_bid_texts(self.regions)
+
+        engine.image_to_data.assert_called_once()
+        self.assertEqual({2: "3.5", 5: "", 6: "12.5"}, texts)
+
+    def test_single_region_uses_per_seat_ocr(self):
+        with patch.object(bid_detection_service, '_extract_bid_text', return_value="1.0") as extract_bid_text:
+            texts = _extract_bid_texts({5: self.regions[5]})
+
+        self.assertEqual({5: "1.0"}, texts)
+        extract_bid_text.assert_called_once()
+
+    def test_cached_regions_skip_ocr(self):
+        engine = Mock(image_to_data=Mock(return_value=_ocr_data([])))
+        with patch.object(bid_detection_service, 'get_ocr_engine', return_value=engine):
+            first = _extract_bid_texts(self.regions)
+            second = _extract_bid_texts(self.regions)
+
+        self.assertEqual(first, second)
+        engine.image_to_data.assert_called_once()
+        self.assertEqual((3, 3), (metrics.get_counter('ocr_cache.hits'), metrics.get_counter('ocr_cache.misses')))
+        self.assertEqual(0.5, metrics.get_gauge('ocr_cache.hit_rate'))
+
+    def test_failed_reads_are_not_cached(self):
+        engine = Mock(image_to_data=Mock(side_effect=RuntimeError("tesseract crashed")))
+        with patch.object(bid_detection_service, 'get_ocr_engine', return_value=engine):
+            texts = _extract_bid_texts(self.regions)
+
+        self.assertEqual({2: None, 5: None, 6: None}, texts)
+        self.assertEqual(0, len(self.cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import cv2
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services import bid_stage_service
+from table_detector.services.bid_detection_service import PLAYER_BID_POSITIONS, read_bid_texts
+from table_detector.services.bid_stage_service import BidDetectionStage
+from table_detector.utils.metrics import metrics
+
+BIDS_FOLDER = Path(__file__).resolve().parent.parent / "resources" / "detection" / "bids"
+
+
+def _amounts(game_snapshot: GameSnapshot):
+    return {position: bid.amount_text for position, bid in game_snapshot.bids.items()}
+
+
+class BidStageServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.frame = cv2.imread(str(BIDS_FOLDER / "5_move.png"))
+        self.changed_frame = self.frame.copy()
+        x, y, w, h = PLAYER_BID_POSITIONS[3]
+        self.changed_frame[y + h - 1, x + 1] = 0
+
+    def test_unchanged_seats_are_not_read_again(self):
+        stage = BidDetectionStage()
+
+        with patch.object(bid_stage_service, 'read_bid_texts', wraps=read_bid_texts) as read:
+            first = stage.detect("table", self.frame, GameSnapshot())
+            second = stage.detect("table", self.frame.copy(), GameSnapshot())
+            third = stage.detect("table", self.changed_frame, GameSnapshot())
+
+        expected = {1: "1.0", 3: "3.5", 5: "3.5", 6: "0.5"}
+        self.assertEqual([expected, expected, expected], [_amounts(s) for s in (first, second, third)])
+        self.assertEqual(2, read.call_count)
+        self.assertEqual([3], list(read.call_args.args[0]))
+        self.assertEqual(7, metrics.get_counter('bid_stage.seats_read'))
+        self.assertEqual(11, metrics.get_counter('bid_stage.seats_reused'))
+
+    def test_seats_over_ocr_budget_are_stale(self):
+        def slow_read(regions, ocr_allowed=True):
+            if not ocr_allowed:
+                return {}, sorted(regions), 0.0
+            return {position: "2.5" for position in regions}, [], 0.002
+
+        stage = BidDetectionStage(ocr_budget=0.001)
+        with patch.object(bid_stage_service, 'read_bid_texts', side_effect=slow_read):
+            stage.detect("table", self.frame, GameSnapshot())
+            over_budget = stage.detect("table", self.changed_frame, GameSnapshot())
+            stage.start_cycle()
+            next_cycle = stage.detect("table", self.changed_frame, GameSnapshot())
+
+        self.assertEqual({'bids.3'}, over_budget.stale)
+        # The previous bid of seat 3 is kept while it is stale
+        self.assertEqual("2.5", over_budget.bids[3].amount_text)
+        self.assertEqual(set(), next_cycle.stale)
+        self.assertEqual(1, metrics.get_counter('bid_stage.seats_stale'))
+
+    def test_native_reads_are_not_charged(self):
+        def native_read(regions, ocr_allowed=True):
+            time.sleep(0.002)
+            return {position: "2.5" for position in regions}, [], 0.0
+
+        stage = BidDetectionStage(ocr_budget=0.001)
+        with patch.object(bid_stage_service, 'read_bid_texts', side_effect=native_read) as read:
+            stage.detect("table", self.frame, GameSnapshot())
+            stage.detect("table", self.changed_frame, GameSnapshot())
+
+        self.assertTrue(read.call_args.kwargs['ocr_allowed'])
+        self.assertEqual(0, metrics.get_histogram('bid_stage.ocr_seconds')['count'])
+
+    def test_removed_window_is_read_again(self):
+        stage = BidDetectionStage()
+        stage.detect("table", self.frame, GameSnapshot())
+        stage.remove("table")
+
+        with patch.object(bid_stage_service, 'read_bid_texts', wraps=read_bid_texts) as read:
+            stage.detect("table", self.frame, GameSnapshot())
+
+        self.assertEqual(len(PLAYER_BID_POSITIONS), len(read.call_args.args[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
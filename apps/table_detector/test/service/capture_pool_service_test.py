@@ -0,0 +1,124 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from PIL import Image
+
+from table_detector.services.capture_pool_service import WindowCapturePool
+from table_detector.services.image_capture_service import ImageCaptureService
+from table_detector.test.service.test_utils import FakeCaptureBackend
+from table_detector.utils.metrics import metrics
+
+TITLE = "Pot Limit Omaha"
+
+
+class BlockingCaptureBackend(FakeCaptureBackend):
+    """Captures of hwnds in ``blocked`` wait until ``release`` is set."""
+
+    def __init__(self, windows):
+        super().__init__(windows)
+        self.blocked = set()
+        self.release = threading.Event()
+        for hwnd in self.windows:
+            self.images[hwnd] = Image.new('RGB', (784, 584), color=(hwnd, 0, 0))
+
+    def capture_window(self, window):
+        if window['hwnd'] in self.blocked:
+            self.release.wait(5)
+        return super().capture_window(window)
+
+
+class CapturePoolServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = BlockingCaptureBackend([
+            FakeCaptureBackend.make_window(hwnd, f"Table {hwnd} - {TITLE}") for hwnd in (30, 10, 20)
+        ])
+        self.pool = WindowCapturePool(max_workers=3, timeout=0.3)
+        metrics.reset()
+
+    def tearDown(self):
+        self.backend.release.set()
+        self.pool.close()
+
+    def _capture(self):
+        return list(self.pool.capture(list(self.backend.windows.values()), self.backend))
+
+    def test_captures_all_windows_with_stable_names(self):
+        names = sorted(captured.window_name for captured in self._capture())
+
+        self.assertEqual(["01_Table_10___Pot_Limit_Omaha", "02_Table_20___Pot_Limit_Omaha",
+                          "03_Table_30___Pot_Limit_Omaha"], names)
+
+    def test_hung_window_does_not_stall_others(self):
+        self.backend.blocked.add(20)
+
+        started = time.monotonic()
+        first_cycle = self._capture()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(2, len(first_cycle))
+
+        # Still hung: skipped without taking another worker
+        self.assertEqual(2, len(self._capture()))
+        self.assertEqual(4, self.backend.captures)
+
+        self.backend.release.set()
+        time.sleep(0.1)
+        self.assertEqual(3, len(self._capture()))
+
+    def test_captures_waiting_for_a_worker_time_out(self):
+        pool = WindowCapturePool(max_workers=1, timeout=0.3)
+        self.backend.blocked.update({10, 20, 30})
+        try:
+            started = time.monotonic()
+            self.assertEqual([], list(pool.capture(list(self.backend.windows.values()), self.backend)))
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertEqual(3, metrics.get_counter('capture.timeouts'))
+            # Only the first window got a worker, the queued ones were cancelled
+            self.assertEqual(2, sum(future.cancelled() for future in pool._in_flight.values()))
+        finally:
+            self.backend.release.set()
+            pool.close()
+
+    def test_late_result_image_is_closed(self):
+        self.backend.blocked.add(20)
+
+        self.assertEqual(2, len(self._capture()))
+        self.backend.release.set()
+        time.sleep(0.2)
+
+        self.assertEqual(1, metrics.get_counter('capture.late_results_closed'))
+
+    def test_results_stream_before_slow_window_finishes(self):
+        self.backend.blocked.add(30)
+        threading.Timer(0.2, self.backend.release.set).start()
+
+        stream = self.pool.capture(list(self.backend.windows.values()), self.backend)
+        first = next(stream)
+
+        self.assertFalse(self.backend.release.is_set())
+        self.assertNotEqual("03_Table_30___Pot_Limit_Omaha", first.window_name)
+        self.assertEqual(2, len(list(stream)))
+
+    @patch.dict(os.environ, {'DEBUG_MODE': 'false', 'CAPTURE_TIMEOUT': '0.3', 'ARCHIVE_LAYOUT': 'tree'})
+    def test_timed_out_window_is_not_reported_removed(self):
+        service = ImageCaptureService(capture_backend=self.backend)
+        folder = tempfile.mkdtemp()
+        streamed = []
+        try:
+            with patch('table_detector.services.window_capture_service.capture_fullscreen',
+                       side_effect=lambda: Image.new('RGB', (10, 10))):
+                first = service.get_changed_images(folder, on_changed=streamed.append)
+                self.backend.blocked.add(20)
+                second = service.get_changed_images(folder)
+        finally:
+            self.backend.release.set()
+            service.close()
+
+        self.assertEqual(3, len(first.changed_images))
+        self.assertEqual(first.changed_images, streamed)
+        self.assertEqual([], second.removed_windows)
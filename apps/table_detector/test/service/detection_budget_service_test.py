@@ -0,0 +1,80 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from shared.domain.detection import Detection
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services import poker_game_processor
+from table_detector.services.detection_budget_service import CycleBudget, DetectionCache, DetectorCosts
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.utils.metrics import metrics
+
+
+def detection(name: str) -> Detection:
+    return Detection(name, (0, 0), (0, 0, 10, 10), 0.99)
+
+
+class DetectionBudgetServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.detectors = {part: MagicMock(return_value=[]) for part in poker_game_processor.DETECTORS}
+        self.detectors['player_cards'].return_value = [detection(card) for card in ("As", "Kd", "Qh", "Jc")]
+        self.detectors['positions'].return_value = {seat: detection("NO") for seat in range(1, 7)}
+        self.detectors['actions'].return_value = {}
+
+    def test_without_deadline_all_detectors_run(self):
+        with patch.dict(poker_game_processor.DETECTORS, self.detectors), \
+                patch.object(poker_game_processor.DetectUtils, 'detect_hero_to_act', return_value=False):
+            snapshot = PokerGameProcessor.detect_game_elements(np.zeros((10, 10, 3), np.uint8))
+
+        self.assertEqual(set(), snapshot.stale)
+        for detector in self.detectors.values():
+            detector.assert_called_once()
+
+    def test_exhausted_budget_keeps_only_hole_cards(self):
+        with patch.dict(poker_game_processor.DETECTORS, self.detectors), \
+                patch.object(poker_game_processor.DetectUtils, 'detect_hero_to_act', return_value=False):
+            snapshot = PokerGameProcessor.detect_game_elements(np.zeros((10, 10, 3), np.uint8),
+                                                               deadline=time.time() - 1)
+
+        self.assertEqual({'table_cards', 'positions', 'actions'}, snapshot.stale)
+        self.detectors['player_cards'].assert_called_once()
+        self.detectors['actions'].assert_not_called()
+        self.assertEqual(1, metrics.get_counter('degradation.actions.skipped'))
+
+    def test_detector_costs_predict_fit(self):
+        costs = DetectorCosts(smoothing=0.5)
+        costs.record('positions', 1.0)
+        costs.record('positions', 3.0)
+
+        self.assertTrue(costs.fits('positions', deadline=12.0, now=10.0))
+        self.assertFalse(costs.fits('positions', deadline=11.9, now=10.0))
+        self.assertTrue(costs.fits('actions', deadline=10.0, now=10.0))
+
+    def test_cache_fills_stale_parts(self):
+        cache = DetectionCache()
+        fresh = GameSnapshot(player_cards=[detection("As")], table_cards=[detection("Kd")])
+        cache.fill_stale("table", fresh)
+
+        degraded = cache.fill_stale("table", GameSnapshot(player_cards=[detection("As")],
+                                                          stale={'table_cards', 'positions'}))
+
+        self.assertEqual(["Kd"], [card.name for card in degraded.table_cards])
+        self.assertEqual({'table_cards', 'positions'}, degraded.stale)
+        self.assertEqual(1, metrics.get_counter('degradation.table_cards.reused'))
+        self.assertEqual(0, metrics.get_counter('degradation.positions.missing'))
+
+    def test_cache_counts_missing_parts(self):
+        DetectionCache().fill_stale("table", GameSnapshot(stale={'actions'}))
+        self.assertEqual(1, metrics.get_counter('degradation.actions.missing'))
+
+    def test_cycle_over_budget_is_counted(self):
+        processor = PokerGameProcessor(cycle_budget=CycleBudget(0.01))
+        processor.start_cycle()
+        time.sleep(0.02)
+        processor.end_cycle()
+
+        self.assertEqual(1, metrics.get_counter('degradation.cycles_over_budget'))
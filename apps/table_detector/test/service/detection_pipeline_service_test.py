@@ -0,0 +1,139 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.detection_budget_service import CycleBudget
+from table_detector.services.detection_pipeline_service import DetectionPipeline
+from table_detector.services.image_capture_service import ImageCaptureService
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.test.service.test_utils import FakeCaptureBackend
+from table_detector.utils.metrics import metrics
+from table_detector.utils.pipeline import Pipeline, PipelineStage
+
+
+class PipelineTest(unittest.TestCase):
+
+    def test_items_flow_through_stages_in_order(self):
+        results = []
+        pipeline = Pipeline([
+            PipelineStage('double_test', lambda item: [item * 2]),
+            PipelineStage('collect_test', lambda item: results.append(item)),
+        ])
+        pipeline.start()
+        for item in range(5):
+            pipeline.put(item)
+        pipeline.stop()
+
+        self.assertEqual([0, 2, 4, 6, 8], results)
+        self.assertEqual(5, metrics.get_counter('pipeline.double_test.processed'))
+        self.assertEqual(5, metrics.get_histogram('pipeline.double_test.latency_seconds')['count'])
+
+    def test_full_queue_blocks_producer(self):
+        release = threading.Event()
+        stage = PipelineStage('slow_test', lambda item: release.wait(5) and [], queue_size=1)
+        pipeline = Pipeline([stage])
+        pipeline.start()
+        blocked_before = metrics.get_counter('pipeline.slow_test.blocked')
+
+        producer = threading.Thread(target=lambda: [pipeline.put(i) for i in range(3)])
+        producer.start()
+        time.sleep(0.2)
+
+        self.assertTrue(producer.is_alive())
+        self.assertGreater(metrics.get_counter('pipeline.slow_test.blocked'), blocked_before)
+        release.set()
+        producer.join(5)
+        pipeline.stop()
+
+
+class DetectionPipelineServiceTest(unittest.TestCase):
+
+    @patch.dict(os.environ, {'DEBUG_MODE': 'false', 'ARCHIVE_LAYOUT': 'tree'})
+    def test_changed_windows_and_removals_are_sent(self):
+        backend = FakeCaptureBackend([FakeCaptureBackend.make_window(hwnd, f"Table {hwnd} Pot Limit Omaha")
+                                      for hwnd in (1, 2)])
+        for hwnd in backend.windows:
+            backend.images[hwnd] = Image.new('RGB', (784, 584), color=(hwnd, 0, 0))
+        results_root = Path(tempfile.mkdtemp())
+        capture_service = ImageCaptureService(capture_backend=backend)
+        sent = []
+        forgotten = []
+
+        pipeline = DetectionPipeline(
+            image_capture_service=capture_service,
+            poker_game_processor=PokerGameProcessor(),
+            create_game_update=lambda snapshot, window_name: window_name,
+            create_removal_messages=lambda names: [('removed', names)],
+            send_message=sent.append,
+            cycle_interval=60
+        )
+
+        with patch.object(PokerGameProcessor, 'detect_game_elements', side_effect=lambda image, deadline=None: GameSnapshot()), \
+                patch.object(PokerGameProcessor, 'apply_engine', side_effect=lambda snapshot: snapshot), \
+                patch.object(PokerGameProcessor, 'forget_window',
+                             side_effect=lambda name: forgotten.append((name, threading.current_thread().name))), \
+                patch('table_detector.services.window_capture_service.capture_fullscreen',
+                      side_effect=lambda: Image.new('RGB', (10, 10))), \
+                patch('table_detector.utils.fs_utils.get_results_root', return_value=results_root):
+            pipeline.pipeline.start()
+            pipeline.run_capture_cycle()
+            pipeline.run_capture_cycle()
+            del backend.windows[2]
+            capture_service.window_registry.invalidate()
+            pipeline.run_capture_cycle()
+            pipeline.pipeline.stop()
+        capture_service.close()
+
+        self.assertEqual(["01_Table_1_Pot_Limit_Omaha", "02_Table_2_Pot_Limit_Omaha"], sorted(sent[:2]))
+        self.assertEqual(3, len(sent))
+        self.assertEqual(('removed', ["02_Table_2_Pot_Limit_Omaha"]), sent[2])
+        # Closed windows are forgotten by the engine stage, in order with their frames
+        self.assertEqual([("02_Table_2_Pot_Limit_Omaha", "pipeline-engine")], forgotten)
+        # Only the first cycle had changed windows; its log is archived with its frames
+        logs = list(results_root.rglob("app.log"))
+        self.assertEqual(1, len(logs))
+        self.assertIn("Processing 2 changed/new images", logs[0].read_text(encoding='utf-8'))
+
+    @patch.dict(os.environ, {'DEBUG_MODE': 'false', 'ARCHIVE_LAYOUT': 'tree'})
+    def test_cycle_budget_reaches_detection(self):
+        metrics.reset()
+        backend = FakeCaptureBackend([FakeCaptureBackend.make_window(1, "Table 1 Pot Limit Omaha")])
+        backend.images[1] = Image.new('RGB', (784, 584))
+        capture_service = ImageCaptureService(capture_backend=backend)
+        deadlines = []
+
+        def slow_detection(image, deadline=None):
+            deadlines.append(deadline)
+            time.sleep(0.05)
+            return GameSnapshot()
+
+        pipeline = DetectionPipeline(
+            image_capture_service=capture_service,
+            poker_game_processor=PokerGameProcessor(cycle_budget=CycleBudget(0.01)),
+            create_game_update=lambda snapshot, window_name: window_name,
+            create_removal_messages=lambda names: [],
+            send_message=lambda message: None,
+            cycle_interval=60
+        )
+
+        with patch.object(PokerGameProcessor, 'detect_game_elements', side_effect=slow_detection), \
+                patch('table_detector.services.window_capture_service.capture_fullscreen',
+                      side_effect=lambda: Image.new('RGB', (10, 10))), \
+                patch('table_detector.utils.fs_utils.get_results_root', return_value=Path(tempfile.mkdtemp())):
+            pipeline.pipeline.start()
+            started = time.time()
+            pipeline.run_capture_cycle()
+            pipeline.pipeline.stop()
+        capture_service.close()
+
+        self.assertEqual(1, len(deadlines))
+        self.assertAlmostEqual(started + 0.01, deadlines[0], delta=0.5)
+        self.assertEqual(1, metrics.get_counter('degradation.cycles_over_budget'))
+
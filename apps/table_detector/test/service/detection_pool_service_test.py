@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.detection_pool_service import publish_templates, attach_templates, \
+    SharedFrameSlots, DetectionProcessPool
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.test.service.test_utils import load_image
+
+
+class SharedMemoryTest(unittest.TestCase):
+
+    def test_templates_round_trip_read_only(self):
+        templates = {
+            'player_cards': {'AS': np.full((30, 20, 3), 7, dtype=np.uint8)},
+            'positions': {'BTN': np.arange(24, dtype=np.uint8).reshape(2, 4, 3)},
+        }
+        memory, descriptor = publish_templates(templates)
+        try:
+            attached_memory, attached = attach_templates(descriptor)
+
+            np.testing.assert_array_equal(templates['positions']['BTN'], attached['positions']['BTN'])
+            np.testing.assert_array_equal(templates['player_cards']['AS'], attached['player_cards']['AS'])
+            with self.assertRaises(ValueError):
+                attached['player_cards']['AS'][0, 0, 0] = 1
+
+            del attached
+            attached_memory.close()
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def test_frame_slots_are_reused(self):
+        slots = SharedFrameSlots(1, frame_shape=(4, 4, 3))
+        try:
+            slot = slots.acquire()
+            slots.write(slot, np.ones((4, 4, 3), dtype=np.uint8))
+            with self.assertRaises(ValueError):
+                slots.write(slot, np.ones((5, 4, 3), dtype=np.uint8))
+            slots.release(slot)
+
+            self.assertEqual(slot, slots.acquire(timeout=1))
+        finally:
+            slots.close()
+
+
+class DetectionProcessPoolTest(unittest.TestCase):
+
+    def test_pool_matches_in_process_detection(self):
+        frame = load_image("2.png")
+        pool = DetectionProcessPool(workers=1)
+        try:
+            pooled = pool.submit(frame).result(timeout=120)
+        finally:
+            pool.close()
+
+        expected = PokerGameProcessor.create_game_snapshot(frame)
+        self.assertIsInstance(pooled, GameSnapshot)
+        self.assertEqual([d.template_name for d in expected.player_cards],
+                         [d.template_name for d in pooled.player_cards])
+        self.assertEqual([d.template_name for d in expected.table_cards],
+                         [d.template_name for d in pooled.table_cards])
+        self.assertEqual(expected.moves, pooled.moves)
@@ -0,0 +1,184 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.detector_broker_service import DetectorBroker, DetectorWorkerError, run_detector_worker
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.tools.detector_worker import worker_main
+from table_detector.utils.capture_backend import ReplayCaptureBackend
+from table_detector.utils.metrics import metrics
+from table_detector.utils.opencv_utils import pil_to_cv2
+
+IMAGES = Path(__file__).resolve().parent.parent / "resources" / "service" / "poker_game_processor"
+
+
+def fake_detection(frame, deadline=None, hero_to_act=None) -> GameSnapshot:
+    # Frame identity travels back through is_player_move for the assertions
+    return GameSnapshot(is_player_move=bool(frame[0, 0, 2]))
+
+
+class DetectorBrokerServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.folder = Path(tempfile.mkdtemp())
+        self.address = str(self.folder / "broker.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def make_replay_folder(self) -> Path:
+        replay = self.folder / "replay"
+        (replay / "table_a").mkdir(parents=True)
+        Image.new('RGB', (784, 584), color=(255, 0, 0)).save(replay / "table_a" / "001.png")
+        Image.new('RGB', (784, 584), color=(0, 0, 0)).save(replay / "table_a" / "002.png")
+        Image.new('RGB', (784, 584), color=(255, 0, 0)).save(replay / "single.png")
+        return replay
+
+    def start_worker(self, broker: DetectorBroker, **kwargs) -> threading.Thread:
+        worker = threading.Thread(target=run_detector_worker, args=(self.address, broker.authkey),
+                                  kwargs=dict(retry_interval=0.05, **kwargs), daemon=True)
+        worker.start()
+        return worker
+
+    def test_replay_backend_serves_frames_per_table(self):
+        backend = ReplayCaptureBackend(self.make_replay_folder(), loop=False)
+
+        windows = {window['title']: window for window in backend.enumerate_windows()}
+        self.assertEqual({"table_a - Pot Limit Omaha", "single - Pot Limit Omaha"}, set(windows))
+
+        table = windows["table_a - Pot Limit Omaha"]
+        self.assertEqual((255, 0, 0), backend.capture_window(table).getpixel((0, 0)))
+        self.assertEqual((0, 0, 0), backend.capture_window(table).getpixel((0, 0)))
+        self.assertIsNone(backend.capture_window(table))
+        self.assertIsNone(backend.get_window_state(table['hwnd']))
+
+    @patch.object(PokerGameProcessor, 'detect_game_elements', side_effect=fake_detection)
+    def test_workers_detect_replayed_frames(self, _):
+        backend = ReplayCaptureBackend(self.make_replay_folder())
+        broker = DetectorBroker(self.address)
+        try:
+            stop = threading.Event()
+            self.start_worker(broker, stop_event=stop)
+
+            frames = [pil_to_cv2(backend.capture_window(window))
+                      for window in backend.enumerate_windows() for _ in range(2)]
+            results = [broker.submit(frame, detect_only=True).result(timeout=10) for frame in frames]
+            stop.set()
+        finally:
+            broker.close()
+
+        self.assertEqual([True, False, True, True], [snapshot.is_player_move for snapshot in results])
+        self.assertEqual(4, metrics.get_histogram('detector_broker.latency_seconds')['count'])
+
+    @patch.object(PokerGameProcessor, 'detect_game_elements', side_effect=fake_detection)
+    def test_frame_of_a_departed_worker_goes_to_the_next_one(self, _):
+        broker = DetectorBroker(self.address)
+        try:
+            frame = pil_to_cv2(Image.new('RGB', (784, 584), color=(255, 0, 0)))
+            futures = [broker.submit(frame, detect_only=True) for _ in range(2)]
+
+            self.start_worker(broker, max_jobs=1).join(10)
+            stop = threading.Event()
+            self.start_worker(broker, stop_event=stop)
+
+            results = [future.result(timeout=10) for future in futures]
+            stop.set()
+        finally:
+            broker.close()
+
+        self.assertEqual(2, len(results))
+        self.assertEqual(1, metrics.get_counter('detector_broker.requeued'))
+
+    def test_worker_errors_and_close_fail_futures(self):
+        broker = DetectorBroker(self.address)
+        with patch.object(PokerGameProcessor, 'detect_game_elements', side_effect=ValueError("bad frame")):
+            stop = threading.Event()
+            self.start_worker(broker, stop_event=stop)
+            with self.assertRaises(DetectorWorkerError):
+                broker.submit(pil_to_cv2(Image.new('RGB', (784, 584))), detect_only=True).result(timeout=10)
+            stop.set()
+
+        broker.close()
+        self.assertFalse(os.path.exists(self.address))
+        with self.assertRaises(DetectorWorkerError):
+            broker.submit(pil_to_cv2(Image.new('RGB', (784, 584))))
+
+    def test_workers_need_the_broker_authkey(self):
+        broker = DetectorBroker(self.address)
+        try:
+            self.assertEqual(32, len(broker.authkey))
+            other = DetectorBroker(str(self.folder / "other.sock"))
+            other.close()
+            self.assertNotEqual(broker.authkey, other.authkey)
+            stop = threading.Event()
+            worker = threading.Thread(target=run_detector_worker, args=(self.address, b'wrong key'),
+                                      kwargs=dict(retry_interval=0.05, stop_event=stop), daemon=True)
+            worker.start()
+
+            future = broker.submit(pil_to_cv2(Image.new('RGB', (784, 584))), detect_only=True)
+            worker.join(10)
+            stop.set()
+            self.assertFalse(worker.is_alive())
+            self.assertFalse(future.done())
+        finally:
+            broker.close()
+
+        with self.assertRaises(DetectorWorkerError):
+            future.result(timeout=1)
+
+    def test_full_queue_without_workers_fails_frames_and_close_returns(self):
+        broker = DetectorBroker(self.address, max_pending=1, submit_timeout=0.05)
+        frame = pil_to_cv2(Image.new('RGB', (784, 584)))
+        queued = broker.submit(frame, detect_only=True)
+        rejected = broker.submit(frame, detect_only=True)
+
+        with self.assertRaises(DetectorWorkerError):
+            rejected.result(timeout=1)
+        self.assertEqual(1, metrics.get_counter('detector_broker.rejected'))
+
+        closing = threading.Thread(target=broker.close, daemon=True)
+        closing.start()
+        closing.join(10)
+        self.assertFalse(closing.is_alive())
+        with self.assertRaises(DetectorWorkerError):
+            queued.result(timeout=1)
+
+    @patch.dict(os.environ, {'DETECTOR_BROKER': 'true'})
+    def test_broker_from_env_requires_an_authkey(self):
+        os.environ.pop('DETECTOR_AUTHKEY', None)
+        with self.assertRaises(ValueError):
+            DetectorBroker.from_env()
+
+    @unittest.skipIf(os.name == 'nt', "Unix sockets only")
+    def test_default_socket_directory_is_private(self):
+        with patch('tempfile.gettempdir', return_value=str(self.folder)):
+            broker = DetectorBroker()
+            try:
+                self.assertEqual(0o700, os.stat(os.path.dirname(broker.address)).st_mode & 0o777)
+            finally:
+                broker.close()
+
+    def test_standalone_worker_process(self):
+        broker = DetectorBroker(self.address)
+        process = multiprocessing.get_context('spawn').Process(
+            target=worker_main, args=(self.address, broker.authkey), daemon=True)
+        process.start()
+        try:
+            frame = pil_to_cv2(Image.open(IMAGES / "4.png").convert('RGB'))
+            snapshot = broker.submit(frame, detect_only=True).result(timeout=120)
+        finally:
+            process.terminate()
+            process.join(10)
+            broker.close()
+
+        self.assertEqual(4, len(snapshot.player_cards))
+        self.assertTrue(snapshot.is_player_move)
@@ -0,0 +1,93 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+
+from table_detector.services import bid_detection_service
+from table_detector.services.bid_detection_service import PLAYER_BID_POSITIONS, detect_bids, read_bid_texts
+from table_detector.services.digit_recognition_service import DigitRecognizer
+from table_detector.services.template_matcher_service import TemplateMatchService
+
+BIDS_FOLDER = Path(__file__).resolve().parent.parent / "resources" / "detection" / "bids"
+
+EXPECTED_BIDS = {
+    "1_move.png": {1: "0.5", 2: "1.0"},
+    "2_move.png": {},
+    "4_move.png": {1: "1.0", 4: "3.5", 6: "0.5"},
+    "5_move.png": {1: "1.0", 3: "3.5", 5: "3.5", 6: "0.5"},
+    "8_bid.png": {5: "0.5", 6: "1.0"},
+    "9_bid.png": {2: "5.0"},
+}
+
+
+class DigitRecognitionServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.templates = TemplateMatchService.TEMPLATE_REGISTRY.digit_templates
+
+    def _region(self, filename: str, position: int):
+        x, y, w, h = PLAYER_BID_POSITIONS[position]
+        return cv2.imread(str(BIDS_FOLDER / filename))[y:y + h, x:x + w]
+
+    def test_detect_bids_without_tesseract(self):
+        engine = Mock()
+        with patch.object(bid_detection_service, 'get_ocr_engine', return_value=engine):
+            for filename, expected in EXPECTED_BIDS.items():
+                bids = detect_bids(cv2.imread(str(BIDS_FOLDER / filename)))
+
+                self.assertEqual(expected, {position: bid.amount_text for position, bid in bids.items()}, filename)
+        engine.image_to_data.assert_not_called()
+
+    def test_empty_seat_is_confident(self):
+        text, confidence = DigitRecognizer(self.templates).recognize(self._region("2_move.png", 3))
+
+        self.assertEqual(("", 1.0), (text, confidence))
+
+    def test_unknown_glyph_falls_back_to_tesseract(self):
+        # Without templates of 3, the 3 of "3.5" cannot be read confidently
+        recognizer = DigitRecognizer({name: t for name, t in self.templates.items() if not name.startswith('3')})
+        _, confidence = recognizer.recognize(self._region("5_move.png", 3))
+        self.assertLess(confidence, recognizer.min_confidence)
+
+        with patch.dict(os.environ, {'BATCHED_OCR': 'false'}), \
+                patch.object(bid_detection_service, 'get_digit_recognizer', return_value=recognizer), \
+                patch.object(bid_detection_service, 'get_ocr_cache', return_value=None), \
+                patch.object(bid_detection_service, '_extract_bid_text', return_value="3.5") as extract_bid_text:
+            bids = detect_bids(cv2.imread(str(BIDS_FOLDER / "5_move.png")))
+
+        self.assertEqual(("3.5", "3.5", "1.0"), (bids[3].amount_text, bids[5].amount_text, bids[1].amount_text))
+        # Seats 3 and 5 hold a 3.5, the other seats are read natively
+        self.assertEqual(2, extract_bid_text.call_count)
+
+    def _glyph_region(self, glyph: np.ndarray) -> np.ndarray:
+        """An empty seat region with ``glyph`` drawn in the bid digits' color."""
+        region = self._region("2_move.png", 3).copy()
+        height, width = glyph.shape[:2]
+        region[3:3 + height, 5:5 + width][glyph[:, :, 0] > 127] = 255
+        return region
+
+    def test_look_alike_of_a_known_digit_is_not_confident(self):
+        # A 0 with its middle rows filled: most of its ink matches the 0 template
+        glyph = self.templates['0'].copy()
+        glyph[3:5, :] = 255
+        _, confidence = DigitRecognizer(self.templates).recognize(self._glyph_region(glyph))
+
+        self.assertLess(confidence, 0.9)
+
+    def test_digit_without_template_falls_back_to_tesseract(self):
+        recognizer = DigitRecognizer({name: t for name, t in self.templates.items() if not name.startswith('8')})
+        region = self._glyph_region(self.templates['8'])
+
+        with patch.object(bid_detection_service, 'get_digit_recognizer', return_value=recognizer), \
+                patch.object(bid_detection_service, '_extract_bid_texts', return_value={3: "8"}) as extract_bid_texts:
+            bid_texts, _, _ = read_bid_texts({3: region})
+
+        self.assertEqual({3: "8"}, bid_texts)
+        extract_bid_texts.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from table_detector.domain.omaha_engine import InvalidPositionSequenceError, OmahaEngine
+from table_detector.services.engine_state_cache_service import EngineStateCache
+from table_detector.utils.metrics import metrics
+
+EP, MP, CO, BTN, SB, BB = (Position.EARLY_POSITION, Position.MIDDLE_POSITION, Position.CUTOFF,
+                           Position.BUTTON, Position.SMALL_BLIND, Position.BIG_BLIND)
+FOLD, CALL, CHECK, RAISE = MoveType.FOLD, MoveType.CALL, MoveType.CHECK, MoveType.RAISE
+
+
+def actions(**moves) -> dict:
+    seats = {'ep': EP, 'mp': MP, 'co': CO, 'btn': BTN, 'sb': SB, 'bb': BB}
+    return {position: list(moves.get(name, [])) for name, position in seats.items()}
+
+
+def full_replay(position_actions: dict):
+    engine = OmahaEngine(len(position_actions))
+    engine.simulate_all_moves({position: list(moves) for position, moves in position_actions.items()})
+    return engine.get_moves_by_street()
+
+
+class EngineStateCacheServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.cache = EngineStateCache()
+
+    def test_frames_resume_from_the_deepest_cached_prefix(self):
+        frames = [
+            actions(ep=[FOLD]),
+            actions(ep=[FOLD], mp=[CALL]),
+            actions(ep=[FOLD], mp=[CALL], co=[FOLD], btn=[RAISE]),
+            actions(ep=[FOLD], mp=[CALL, CALL], co=[FOLD], btn=[RAISE], sb=[FOLD], bb=[CALL]),
+        ]
+
+        for frame in frames:
+            engine = self.cache.replay(6, frame)
+            self.assertEqual(full_replay(frame), engine.get_moves_by_street())
+
+        self.assertEqual(1, metrics.get_counter('engine_cache.misses'))
+        self.assertEqual(3, metrics.get_counter('engine_cache.hits'))
+        self.assertEqual(1 + 2 + 4, metrics.get_counter('engine_cache.actions_reused'))
+        self.assertEqual(1 + 1 + 2 + 3, metrics.get_counter('engine_cache.actions_applied'))
+
+    def test_diverging_frame_branches_without_changing_the_cached_state(self):
+        self.cache.replay(6, actions(ep=[FOLD], mp=[CALL]))
+        branch = self.cache.replay(6, actions(ep=[FOLD], mp=[FOLD], co=[CALL]))
+        # The resumed engine is private: changing it does not touch the cache
+        branch.simulate_all_moves(actions(btn=[FOLD]))
+
+        engine = self.cache.replay(6, actions(ep=[FOLD], mp=[CALL]))
+
+        self.assertEqual(full_replay(actions(ep=[FOLD], mp=[CALL])), engine.get_moves_by_street())
+        self.assertEqual(1, metrics.get_counter('engine_cache.misses'))
+        # The branch resumed from the new hand state, the repeated frame from its own state
+        self.assertEqual(2, metrics.get_counter('engine_cache.actions_reused'))
+
+    def test_least_recently_used_states_are_evicted(self):
+        cache = EngineStateCache(max_states=2)
+        cache.replay(6, actions(ep=[FOLD]))
+        cache.replay(6, actions(ep=[FOLD], mp=[CALL]))
+
+        self.assertEqual(2, len(cache))
+        # The new hand state was the least recently used one
+        cache.replay(6, actions(ep=[CALL]))
+        self.assertEqual(2, metrics.get_counter('engine_cache.misses'))
+
+    def test_invalid_sequence_raises_and_is_not_cached(self):
+        with self.assertRaises(InvalidPositionSequenceError):
+            self.cache.replay(6, actions(mp=[CALL]))
+
+        # Only the new hand state was cached
+        self.assertEqual(1, len(self.cache))
+        engine = self.cache.replay(6, actions(ep=[FOLD], mp=[CALL]))
+        self.assertEqual(full_replay(actions(ep=[FOLD], mp=[CALL])), engine.get_moves_by_street())
+
+
+if __name__ == '__main__':
+    unittest.main()
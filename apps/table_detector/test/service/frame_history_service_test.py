@@ -0,0 +1,82 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from shared.domain.detection import Detection
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services.frame_history_service import FrameRingBuffer, FrameHistory
+
+
+def make_frame(value):
+    return np.full((584, 784, 3), value, dtype=np.uint8)
+
+
+def make_cards(count):
+    return [Detection(f"{rank}S", (0, 0), (0, 0, 10, 10), 0.9) for rank in "AKQJT98"[:count]]
+
+
+class FrameRingBufferTest(unittest.TestCase):
+
+    def test_keeps_last_frames_in_preallocated_memory(self):
+        buffer = FrameRingBuffer(3)
+        storage = buffer._frames
+
+        for value in range(5):
+            self.assertTrue(buffer.push(make_frame(value), {'cycle': value}))
+
+        self.assertIs(storage, buffer._frames)
+        self.assertEqual([2, 3, 4], [int(frame[0, 0, 0]) for _, frame, _ in buffer.items()])
+        self.assertEqual([2, 3, 4], [snapshot['cycle'] for _, _, snapshot in buffer.items()])
+
+    def test_rejects_unexpected_shape(self):
+        buffer = FrameRingBuffer(3)
+
+        self.assertFalse(buffer.push(np.zeros((10, 10, 3), dtype=np.uint8), {}))
+        self.assertEqual(0, len(buffer))
+
+
+class FrameHistoryServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.history = FrameHistory(capacity=3, dump_root=self.root / "dumps",
+                                    trigger_file=self.root / "dump.request")
+
+    def _dumps(self):
+        folder = self.root / "dumps"
+        return sorted(folder.iterdir()) if folder.exists() else []
+
+    def test_engine_error_dumps_window_history(self):
+        self.history.record("table", make_frame(1), GameSnapshot(player_cards=make_cards(4)))
+        self.history.record("table", make_frame(2), GameSnapshot(player_cards=make_cards(4), engine_error="bad move"))
+
+        dumps = self._dumps()
+        self.assertEqual(1, len(dumps))
+        self.assertTrue(dumps[0].name.endswith("table_engine_error"))
+        index = json.loads((dumps[0] / "snapshots.json").read_text(encoding='utf-8'))
+        self.assertEqual(2, len(index['frames']))
+        self.assertEqual("bad move", index['frames'][1]['snapshot']['engine_error'])
+        self.assertTrue((dumps[0] / "01.png").exists())
+
+    def test_anomaly_dumps_once_per_capacity(self):
+        for value in range(4):
+            self.history.record("table", make_frame(value), GameSnapshot(player_cards=make_cards(3)))
+
+        self.assertEqual(1, len(self._dumps()))
+        self.assertEqual("3 player cards", FrameHistory.find_anomaly(GameSnapshot(player_cards=make_cards(3))))
+        self.assertIsNone(FrameHistory.find_anomaly(GameSnapshot(player_cards=make_cards(4),
+                                                                 table_cards=make_cards(3))))
+
+    def test_manual_trigger_file_dumps_all_windows(self):
+        self.history.record("table_1", make_frame(1), GameSnapshot())
+        self.history.record("table_2", make_frame(2), GameSnapshot())
+        self.assertEqual(0, self.history.check_manual_trigger())
+
+        (self.root / "dump.request").touch()
+
+        self.assertEqual(2, self.history.check_manual_trigger())
+        self.assertFalse((self.root / "dump.request").exists())
+        self.assertEqual(2, len(self._dumps()))
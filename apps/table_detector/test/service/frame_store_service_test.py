@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from table_detector.services.archive_writer_service import ArchiveWriter
+from table_detector.services.frame_store_service import FrameStore
+
+
+class FrameStoreServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.store = FrameStore(self.root)
+        self.frame_a = np.full((20, 30, 3), 10, dtype=np.uint8)
+        self.frame_b = np.full((20, 30, 3), 200, dtype=np.uint8)
+
+    def _age(self, path: Path, seconds: int):
+        old = time.time() - seconds
+        os.utime(path, (old, old))
+
+    def test_identical_frames_are_stored_once(self):
+        digest_1 = self.store.put_frame(self.frame_a)
+        digest_2 = self.store.put_frame(self.frame_a.copy())
+        digest_3 = self.store.put_frame(self.frame_b)
+
+        self.assertEqual(digest_1, digest_2)
+        self.assertNotEqual(digest_1, digest_3)
+        self.assertEqual(2, self.store.get_usage()['objects'])
+        np.testing.assert_array_equal(self.frame_a, self.store.load_frame(digest_1))
+
+    def test_repeated_manifest_is_skipped(self):
+        digest = self.store.put_frame(self.frame_a)
+
+        self.assertTrue(self.store.write_manifest("2025_01_01/120000", {'table': digest}))
+        self.assertFalse(self.store.write_manifest("2025_01_01/120003", {'table': digest}))
+        self.assertEqual(1, len(list(self.store.iter_manifests())))
+
+    def test_gc_removes_expired_manifests_and_orphan_frames(self):
+        old_digest = self.store.put_frame(self.frame_a)
+        new_digest = self.store.put_frame(self.frame_b)
+        self.store.write_manifest("2000_01_01/120000", {'table': old_digest})
+        self.store.write_manifest("2999_01_01/120000", {'table': new_digest})
+        self._age(self.store.find_object(old_digest), 7200)
+
+        result = self.store.gc(retention_days=7)
+
+        self.assertEqual(1, result['manifests_removed'])
+        self.assertEqual(1, result['objects_removed'])
+        self.assertIsNone(self.store.find_object(old_digest))
+        self.assertIsNotNone(self.store.find_object(new_digest))
+
+    def test_gc_keeps_young_orphans(self):
+        digest = self.store.put_frame(self.frame_a)
+
+        self.store.gc(retention_days=7)
+
+        self.assertIsNotNone(self.store.find_object(digest))
+
+    def test_deduplicated_frame_is_kept_by_gc(self):
+        digest = self.store.put_frame(self.frame_a)
+        self._age(self.store.find_object(digest), 7200)
+
+        self.store.put_frame(self.frame_a.copy())
+        self.store.gc(retention_days=7)
+
+        self.assertIsNotNone(self.store.find_object(digest))
+
+    def test_compact_rerun_does_not_duplicate_manifests(self):
+        digest = self.store.put_frame(self.frame_a)
+        self.store.write_manifest("2000_01_01/120000", {'table': digest})
+        day_dir = self.root / "manifests" / "2000_01_01"
+        kept = (day_dir / "120000.json").read_text(encoding='utf-8')
+
+        self.store.compact()
+        # Interrupted before the day folder was removed
+        day_dir.mkdir()
+        (day_dir / "120000.json").write_text(kept, encoding='utf-8')
+        self.store.compact()
+
+        self.assertEqual(1, len(list(self.store.iter_manifests())))
+        self.assertEqual(["2000_01_01.jsonl"], [p.name for p in (self.root / "manifests").iterdir()])
+
+    def test_compact_merges_day_manifests_with_logs(self):
+        digest_a = self.store.put_frame(self.frame_a)
+        digest_b = self.store.put_frame(self.frame_b)
+        self.store.write_manifest("2000_01_01/120000", {'table': digest_a})
+        self.store.write_manifest("2000_01_01/120003", {'table': digest_b})
+        self.store.write_cycle_log("2000_01_01/120003", "log line\n")
+
+        result = self.store.compact()
+
+        self.assertEqual({'days_compacted': 1, 'manifests_merged': 2}, result)
+        self.assertFalse((self.root / "manifests" / "2000_01_01").exists())
+        lines = (self.root / "manifests" / "2000_01_01.jsonl").read_text(encoding='utf-8').splitlines()
+        self.assertEqual("log line\n", json.loads(lines[1])['log'])
+        self.assertEqual(2, len(list(self.store.iter_manifests())))
+
+    def test_log_of_skipped_manifest_survives_compaction(self):
+        digest = self.store.put_frame(self.frame_a)
+        self.store.write_manifest("2000_01_01/120000", {'table': digest})
+        self.assertFalse(self.store.write_manifest("2000_01_01/120003", {'table': digest}))
+        self.store.write_cycle_log("2000_01_01/120003", "skipped cycle log\n")
+
+        self.store.compact()
+
+        manifests = {manifest['cycle']: manifest for manifest in self.store.iter_manifests()}
+        self.assertEqual("skipped cycle log\n", manifests["2000_01_01/120003"]['log'])
+        self.assertEqual("2000_01_01/120000", manifests["2000_01_01/120003"]['same_frames_as'])
+        self.assertEqual({digest}, self.store._referenced_digests())
+
+    def test_archive_writer_cycle_goes_to_store(self):
+        writer = ArchiveWriter(frame_store=self.store)
+        cycle_folder = self.root / "2025_01_01" / "120000"
+        window = {'title': 'Table 1', 'process': 'poker.exe', 'rect': (0, 0, 30, 20)}
+
+        writer.submit_cycle(cycle_folder, {'table': ('unused', 'table.png', self.frame_a.copy())}, [window], "")
+        writer.submit_cycle_log(cycle_folder, "cycle log\n")
+        writer.close()
+
+        manifest = next(self.store.iter_manifests())
+        self.assertEqual("2025_01_01/120000", manifest['cycle'])
+        self.assertEqual('Table 1', manifest['windows'][0]['title'])
+        np.testing.assert_array_equal(self.frame_a, self.store.load_frame(manifest['frames']['table']))
+        self.assertTrue((self.root / "manifests" / "2025_01_01" / "120000.log").exists())
+        self.assertFalse(cycle_folder.exists())
@@ -0,0 +1,101 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.domain.detection import Detection
+from shared.domain.game_snapshot import GameSnapshot
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from shared.domain.street import Street
+from table_detector.services.hand_context_service import HandContextRegistry
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.utils.metrics import metrics
+
+SEATS = {1: "EP", 2: "MP", 3: "CO", 4: "BTN", 5: "SB", 6: "BB"}
+
+
+def detection(name: str) -> Detection:
+    return Detection(name, (0, 0), (0, 0, 10, 10), 0.99)
+
+
+def snapshot(actions: dict, hole_cards=("As", "Kd", "Qh", "Jc"), table_cards=()) -> GameSnapshot:
+    return GameSnapshot(
+        player_cards=[detection(card) for card in hole_cards],
+        table_cards=[detection(card) for card in table_cards],
+        positions={player_id: detection(name) for player_id, name in SEATS.items()},
+        actions={player_id: [detection(action) for action in player_actions]
+                 for player_id, player_actions in actions.items()}
+    )
+
+
+class HandContextServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.registry = HandContextRegistry()
+
+    def test_new_actions_are_applied_incrementally(self):
+        frames = [
+            {1: ["fold"]},
+            {1: ["fold"], 2: ["call"]},
+            {1: ["fold"], 2: ["call"], 3: ["fold"], 4: ["raise"]},
+        ]
+
+        for actions in frames:
+            incremental = self.registry.apply_engine("table", snapshot(actions))
+            full = PokerGameProcessor.apply_engine(snapshot(actions))
+            self.assertEqual(dict(full.moves), incremental.moves)
+
+        self.assertEqual(1, metrics.get_counter('hand_context.new_hands'))
+        self.assertEqual(2, metrics.get_counter('hand_context.incremental'))
+        self.assertEqual(4, metrics.get_counter('hand_context.actions_applied'))
+
+    def test_snapshot_moves_are_not_changed_by_later_frames(self):
+        first = self.registry.apply_engine("table", snapshot({1: ["fold"]}))
+        self.registry.apply_engine("table", snapshot({1: ["fold"], 2: ["call"]}))
+
+        self.assertEqual([(Position.EARLY_POSITION, MoveType.FOLD)], first.moves[Street.PREFLOP])
+
+    def test_new_hole_cards_start_a_new_hand(self):
+        self.registry.apply_engine("table", snapshot({1: ["fold"], 2: ["call"]}))
+        result = self.registry.apply_engine("table", snapshot({1: ["call"]}, hole_cards=("2s", "3d", "4h", "5c")))
+
+        self.assertEqual([(Position.EARLY_POSITION, MoveType.CALL)], result.moves[Street.PREFLOP])
+        self.assertEqual(2, metrics.get_counter('hand_context.new_hands'))
+
+    def test_diverging_actions_replay_the_hand(self):
+        self.registry.apply_engine("table", snapshot({1: ["fold"]}))
+        result = self.registry.apply_engine("table", snapshot({1: ["call"], 2: ["fold"]}))
+
+        self.assertEqual([(Position.EARLY_POSITION, MoveType.CALL), (Position.MIDDLE_POSITION, MoveType.FOLD)],
+                         result.moves[Street.PREFLOP])
+        self.assertEqual(1, metrics.get_counter('hand_context.replays'))
+
+    def test_unrecoverable_positions_reset_the_hand(self):
+        self.registry.apply_engine("table", snapshot({1: ["fold"]}))
+        broken = snapshot({1: ["fold"], 2: ["call"]})
+        broken.positions = {1: detection("EP")}
+
+        with self.assertRaises(Exception):
+            self.registry.apply_engine("table", broken)
+        self.registry.apply_engine("table", snapshot({1: ["fold"], 2: ["call"]}))
+
+        self.assertEqual(2, metrics.get_counter('hand_context.new_hands'))
+        self.assertEqual(0, metrics.get_counter('hand_context.incremental'))
+
+    def test_frames_of_a_window_from_several_threads(self):
+        frames = [{1: ["fold"]}, {1: ["fold"], 2: ["call"]}, {1: ["fold"], 2: ["call"], 3: ["fold"]}] * 20
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda actions: self.registry.apply_engine("table", snapshot(actions)),
+                                        frames))
+
+        for actions, result in zip(frames, results):
+            self.assertIsNone(result.engine_error)
+            self.assertEqual(dict(PokerGameProcessor.apply_engine(snapshot(actions)).moves), result.moves)
+
+    def test_engine_error_resets_the_hand(self):
+        result = self.registry.apply_engine("table", snapshot({2: ["call"]}))
+        self.assertIsNotNone(result.engine_error)
+
+        result = self.registry.apply_engine("table", snapshot({1: ["fold"], 2: ["call"]}))
+        self.assertIsNone(result.engine_error)
+        self.assertEqual(2, len(result.moves[Street.PREFLOP]))
@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import Mock
+
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from shared.domain.street import Street
+from table_detector.domain.omaha_engine import InvalidPositionSequenceError
+from table_detector.services.hand_context_service import HandContextRegistry
+from table_detector.services.move_memo_service import MoveReconstructionMemo
+from table_detector.test.service.hand_context_service_test import detection, snapshot
+from table_detector.utils.metrics import metrics
+
+POSITIONS = {1: Position.EARLY_POSITION, 2: Position.BIG_BLIND}
+MOVES = {Street.PREFLOP: [(Position.EARLY_POSITION, MoveType.FOLD)], Street.FLOP: []}
+
+
+class MoveMemoServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.memo = MoveReconstructionMemo()
+
+    def test_same_pattern_is_reconstructed_once(self):
+        reconstruct = Mock(return_value=MOVES)
+        actions = {1: [detection("fold")]}
+
+        first = self.memo.get_moves(POSITIONS, actions, reconstruct)
+        second = self.memo.get_moves(dict(POSITIONS), {1: [detection("fold")]}, reconstruct)
+        second[Street.PREFLOP].append((Position.BIG_BLIND, MoveType.CHECK))
+        third = self.memo.get_moves(POSITIONS, actions, reconstruct)
+
+        self.assertEqual(1, reconstruct.call_count)
+        self.assertEqual(MOVES, first)
+        self.assertEqual(MOVES, third)
+        self.assertEqual(2, metrics.get_counter('move_memo.hits'))
+
+    def test_rejected_sequence_is_simulated_once(self):
+        reconstruct = Mock(side_effect=InvalidPositionSequenceError("Wrong position sequence"))
+
+        for _ in range(3):
+            with self.assertRaises(InvalidPositionSequenceError):
+                self.memo.get_moves(POSITIONS, {2: [detection("call")]}, reconstruct)
+
+        self.assertEqual(1, reconstruct.call_count)
+        self.assertEqual(2, metrics.get_counter('move_memo.errors'))
+
+    def test_other_exceptions_are_not_memoized(self):
+        reconstruct = Mock(side_effect=[RuntimeError("boom"), MOVES])
+
+        with self.assertRaises(RuntimeError):
+            self.memo.get_moves(POSITIONS, {2: [detection("call")]}, reconstruct)
+        moves = self.memo.get_moves(POSITIONS, {2: [detection("call")]}, reconstruct)
+
+        self.assertEqual(MOVES, moves)
+        self.assertEqual(2, reconstruct.call_count)
+
+    def test_least_recently_used_patterns_are_evicted(self):
+        memo = MoveReconstructionMemo(max_entries=2)
+        for action in ("fold", "call", "raise"):
+            memo.get_moves(POSITIONS, {1: [detection(action)]}, lambda: MOVES)
+
+        self.assertEqual(2, len(memo))
+        reconstruct = Mock(return_value=MOVES)
+        memo.get_moves(POSITIONS, {1: [detection("fold")]}, reconstruct)
+        reconstruct.assert_called_once()
+
+    def test_windows_share_memoized_moves(self):
+        registry = HandContextRegistry(move_memo=self.memo)
+        actions = {1: ["fold"], 2: ["call"]}
+
+        first = registry.apply_engine("table 1", snapshot(actions))
+        second = registry.apply_engine("table 2", snapshot(actions, hole_cards=("2s", "3d", "4h", "5c")))
+        error = registry.apply_engine("table 3", snapshot({2: ["call"]}))
+        repeated_error = registry.apply_engine("table 1", snapshot({2: ["call"]}))
+
+        self.assertEqual(first.moves, second.moves)
+        # Only table 1 and the invalid frame of table 3 went through a hand context
+        self.assertEqual(2, metrics.get_counter('hand_context.new_hands'))
+        self.assertIsNotNone(error.engine_error)
+        # The invalid frame is answered by the memoized exception
+        self.assertEqual(error.engine_error, repeated_error.engine_error)
+        self.assertEqual(1, metrics.get_counter('move_memo.errors'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from table_detector.services.bid_detection_service import TESSERACT_CONFIG
+from table_detector.services.ocr_engine_service import (
+    PytesseractEngine, TesserocrEngine, create_ocr_engine, parse_tesseract_config
+)
+from table_detector.utils.metrics import metrics
+
+
+class FakeApi:
+    def __init__(self, number):
+        self.number = number
+        self.ended = False
+
+    def End(self):
+        self.ended = True
+
+
+class FakeTesserocrEngine(TesserocrEngine):
+    """Counts created APIs; an image filled with 0 makes recognition fail."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.apis = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _create_api(self, oem, variables):
+        api = FakeApi(len(self.apis))
+        self.apis.append(api)
+        return api
+
+    def _recognize(self, api, image, psm):
+        self.release.wait(5)
+        if not image.any():
+            raise RuntimeError("engine crashed")
+        return {'text': [str(api.number)], 'conf': [95.0], 'left': [0], 'top': [0], 'width': [1], 'height': [1]}
+
+
+class OcrEngineServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.image = np.full((10, 10), 255, dtype=np.uint8)
+
+    def test_parses_pytesseract_config(self):
+        psm, oem, variables = parse_tesseract_config(TESSERACT_CONFIG)
+
+        self.assertEqual((7, 3), (psm, oem))
+        self.assertEqual({'tessedit_char_whitelist': '0123456789.', 'load_system_dawg': '0', 'load_freq_dawg': '0'},
+                         variables)
+
+    def test_apis_are_reused(self):
+        engine = FakeTesserocrEngine(workers=2)
+
+        for _ in range(5):
+            self.assertEqual(['0'], engine.image_to_data(self.image, TESSERACT_CONFIG)['text'])
+
+        self.assertEqual(1, len(engine.apis))
+        engine.close()
+        self.assertTrue(engine.apis[0].ended)
+
+    def test_concurrency_is_bounded(self):
+        engine = FakeTesserocrEngine(workers=1, acquire_timeout=0.1)
+        engine.release.clear()
+        busy = threading.Thread(target=engine.image_to_data, args=(self.image, TESSERACT_CONFIG))
+        busy.start()
+        try:
+            with self.assertRaises(TimeoutError):
+                engine.image_to_data(self.image, TESSERACT_CONFIG)
+        finally:
+            engine.release.set()
+            busy.join(5)
+
+        self.assertEqual(1, len(engine.apis))
+
+    def test_failed_api_is_restarted(self):
+        engine = FakeTesserocrEngine(workers=1)
+
+        with self.assertRaises(RuntimeError):
+            engine.image_to_data(np.zeros((10, 10), dtype=np.uint8), TESSERACT_CONFIG)
+        data = engine.image_to_data(self.image, TESSERACT_CONFIG)
+
+        self.assertTrue(engine.apis[0].ended)
+        self.assertEqual(['1'], data['text'])
+        self.assertEqual(1, metrics.get_counter('ocr_engine.restarts'))
+
+    def test_auto_falls_back_to_pytesseract(self):
+        with patch.dict(sys.modules, {'tesserocr': None}):
+            self.assertIsInstance(create_ocr_engine('auto'), PytesseractEngine)
+            with self.assertRaises(ImportError):
+                create_ocr_engine('tesserocr')
+
+
+if __name__ == '__main__':
+    unittest.main()
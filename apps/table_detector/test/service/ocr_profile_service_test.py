@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from table_detector.services.bid_detection_service import _preprocess_bid_region
+from table_detector.services.ocr_profile_service import OcrProfile, get_ocr_profile
+from table_detector.tools.ocr_preprocess_sweep import choose_profile
+
+
+class OcrProfileServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        get_ocr_profile.cache_clear()
+        self.addCleanup(get_ocr_profile.cache_clear)
+        # Light "1" on a dark bubble
+        self.region = np.full((15, 40, 3), 40, dtype=np.uint8)
+        self.region[4:12, 10:12] = 230
+
+    def test_profile_file_is_loaded_at_runtime(self):
+        path = Path(tempfile.mkdtemp()) / "layout.json"
+        OcrProfile(scale_factor=3, interpolation='linear', threshold_method='otsu').save(path, accuracy=1.0)
+
+        with patch.dict(os.environ, {'OCR_PROFILE': str(path)}):
+            profile = get_ocr_profile()
+
+        self.assertEqual(OcrProfile(scale_factor=3, interpolation='linear', threshold_method='otsu'), profile)
+        self.assertEqual((45, 120), _preprocess_bid_region(self.region, profile=profile).shape)
+
+    def test_missing_layout_uses_default_profile(self):
+        with patch.dict(os.environ, {'OCR_PROFILE': 'no_such_layout'}):
+            self.assertEqual(OcrProfile(), get_ocr_profile())
+
+    def test_every_threshold_method_gives_dark_text_on_white(self):
+        for method in ('fixed', 'otsu', 'adaptive'):
+            processed = _preprocess_bid_region(self.region, profile=OcrProfile(scale_factor=4, threshold_method=method))
+
+            self.assertEqual({0, 255}, set(np.unique(processed)), method)
+            self.assertEqual(0, processed[32, 42], method)
+            self.assertEqual(255, processed[4, 4], method)
+
+    def test_cheapest_profile_reaching_target_is_chosen(self):
+        results = [
+            {'profile': {'scale_factor': 8}, 'accuracy': 1.0, 'mean_ms': 9.0},
+            {'profile': {'scale_factor': 4}, 'accuracy': 1.0, 'mean_ms': 5.0},
+            {'profile': {'scale_factor': 2}, 'accuracy': 0.9, 'mean_ms': 3.0},
+        ]
+
+        self.assertEqual(4, choose_profile(results, 1.0)['profile']['scale_factor'])
+        self.assertEqual(2, choose_profile(results, 0.9)['profile']['scale_factor'])
+        self.assertIsNone(choose_profile(results[2:], 1.0))
+
+    def test_unknown_method_is_rejected(self):
+        with self.assertRaises(ValueError):
+            OcrProfile(threshold_method='sauvola')
+
+
+if __name__ == '__main__':
+    unittest.main()
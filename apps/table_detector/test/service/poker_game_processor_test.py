@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from shared.domain.detection import Detection
+from shared.domain.game_snapshot import GameSnapshot
+from table_detector.services import poker_game_processor
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.utils.metrics import metrics
+
+HOLE_CARDS = ("As", "Kd", "Qh", "Jc")
+SEATS = {1: "EP", 2: "MP", 3: "CO", 4: "BTN", 5: "SB", 6: "BB"}
+
+
+def detection(name: str) -> Detection:
+    return Detection(name, (0, 0), (0, 0, 10, 10), 0.99)
+
+
+class PokerGameProcessorStagesTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.detectors = {
+            'player_cards': MagicMock(return_value=[detection(card) for card in HOLE_CARDS]),
+            'table_cards': MagicMock(return_value=[]),
+            'positions': MagicMock(return_value={seat: detection(name) for seat, name in SEATS.items()}),
+            'actions': MagicMock(return_value={1: [detection("fold")]}),
+        }
+        self.hero_to_act = MagicMock(return_value=True)
+
+    def detect(self, **kwargs) -> GameSnapshot:
+        with patch.dict(poker_game_processor.DETECTORS, self.detectors), \
+                patch.object(poker_game_processor.DetectUtils, 'detect_hero_to_act', self.hero_to_act):
+            return PokerGameProcessor.detect_game_elements(np.zeros((10, 10, 3), np.uint8), **kwargs)
+
+    def test_all_stages_run_when_hero_is_in_hand(self):
+        snapshot = self.detect()
+
+        for detector in self.detectors.values():
+            detector.assert_called_once()
+        self.assertTrue(snapshot.is_player_move)
+        self.assertTrue(PokerGameProcessor.should_run_engine(snapshot))
+        self.assertEqual(1, metrics.get_counter('detection_stage.actions.executed'))
+
+    def test_probed_hero_to_act_is_reused(self):
+        snapshot = self.detect(hero_to_act=False)
+
+        self.hero_to_act.assert_not_called()
+        self.assertFalse(snapshot.is_player_move)
+
+    def test_no_hole_cards_skips_hand_stages(self):
+        self.detectors['player_cards'].return_value = []
+
+        snapshot = self.detect()
+
+        self.detectors['table_cards'].assert_called_once()
+        self.detectors['positions'].assert_not_called()
+        self.detectors['actions'].assert_not_called()
+        self.hero_to_act.assert_not_called()
+        self.assertFalse(snapshot.is_player_move)
+        self.assertFalse(PokerGameProcessor.should_run_engine(snapshot))
+        for stage in ('positions', 'actions', 'hero_to_act', 'engine'):
+            self.assertEqual(1, metrics.get_counter(f'detection_stage.{stage}.skipped'), stage)
+
+    def test_missing_position_detections_skip_actions_and_engine(self):
+        self.detectors['positions'].return_value = {1: detection("BTN")}
+
+        snapshot = self.detect()
+
+        self.detectors['actions'].assert_not_called()
+        self.assertEqual({}, snapshot.actions)
+        self.assertFalse(PokerGameProcessor.should_run_engine(snapshot))
+
+    def test_engine_is_skipped_without_actions(self):
+        self.detectors['actions'].return_value = {seat: [] for seat in SEATS}
+
+        processor = PokerGameProcessor()
+        with patch.object(PokerGameProcessor, 'apply_engine') as apply_engine:
+            processor.finish_window("table", self.detect())
+
+        apply_engine.assert_not_called()
+        self.assertEqual(1, metrics.get_counter('detection_stage.engine.skipped'))
+
+    def test_hand_without_actions_keeps_empty_streets(self):
+        self.detectors['actions'].return_value = {seat: [] for seat in SEATS}
+        engine_moves = PokerGameProcessor.apply_engine(self.detect()).moves
+
+        snapshot = PokerGameProcessor().finish_window("table", self.detect())
+
+        self.assertEqual(engine_moves, snapshot.moves)
+        self.assertEqual(4, len(snapshot._format_moves_for_protocol()))
+
+    def test_no_moves_without_hero(self):
+        self.detectors['player_cards'].return_value = []
+
+        snapshot = PokerGameProcessor().finish_window("table", self.detect())
+
+        self.assertFalse(snapshot.moves)
@@ -0,0 +1,78 @@
+import unittest
+
+from shared.domain.detection import Detection
+from shared.domain.game_snapshot import GameSnapshot
+from shared.domain.moves import MoveType
+from shared.domain.position import Position
+from shared.domain.street import Street
+from table_detector.services.send_filter_service import SnapshotSendFilter
+from table_detector.utils.metrics import metrics
+
+
+def snapshot(score: float = 0.95, x: int = 10, moves=None) -> GameSnapshot:
+    return GameSnapshot(
+        player_cards=[Detection(card, (x, 10), (x, 10, 20, 30), score) for card in ("As", "Kd", "Qh", "Jc")],
+        positions={1: Detection("BTN", (x, 50), (x, 50, 20, 10), score)},
+        moves=moves
+    )
+
+
+class SendFilterServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.send_filter = SnapshotSendFilter(heartbeat_interval=30)
+
+    def test_digest_ignores_scores_and_coordinates(self):
+        self.assertEqual(snapshot().get_semantic_digest(), snapshot(score=0.81, x=12).get_semantic_digest())
+
+    def test_digest_changes_with_moves(self):
+        moves = {Street.PREFLOP: [(Position.BUTTON, MoveType.RAISE)]}
+        self.assertNotEqual(snapshot().get_semantic_digest(), snapshot(moves=moves).get_semantic_digest())
+
+    def test_digest_changes_with_empty_streets(self):
+        empty_streets = {street: [] for street in Street.get_street_order()}
+        self.assertNotEqual(snapshot(moves={}).get_semantic_digest(),
+                            snapshot(moves=empty_streets).get_semantic_digest())
+
+    def test_digest_changes_with_stale_fields(self):
+        stale = snapshot()
+        stale.stale.add('bids.3')
+        self.assertNotEqual(snapshot().get_semantic_digest(), stale.get_semantic_digest())
+
+    def _send(self, window_name: str, game_snapshot: GameSnapshot, now: float) -> bool:
+        if not self.send_filter.should_send(window_name, game_snapshot):
+            return False
+        self.send_filter.mark_sent(window_name, game_snapshot, now)
+        return True
+
+    def test_unchanged_content_is_suppressed(self):
+        self.assertTrue(self._send("table", snapshot(), now=0))
+        self.assertFalse(self._send("table", snapshot(score=0.9), now=1))
+        self.assertTrue(self._send("other", snapshot(), now=1))
+
+        self.assertEqual(1, metrics.get_counter('send_filter.suppressed'))
+        self.assertEqual(2, metrics.get_counter('send_filter.sent'))
+
+    def test_failed_send_is_not_remembered(self):
+        # should_send without mark_sent: the send did not go through
+        self.assertTrue(self.send_filter.should_send("table", snapshot()))
+        self.assertTrue(self.send_filter.should_send("table", snapshot()))
+        self.assertEqual([], self.send_filter.due_heartbeats(now=100))
+
+    def test_heartbeat_resends_latest_snapshot(self):
+        self._send("table", snapshot(), now=0)
+        latest = snapshot(score=0.9)
+        self._send("table", latest, now=10)
+
+        self.assertEqual([], self.send_filter.filter([], now=29))
+        self.assertEqual([(latest, "table")], self.send_filter.filter([], now=30))
+        self.send_filter.mark_sent("table", latest, now=30)
+        self.assertEqual([], self.send_filter.filter([], now=31))
+
+    def test_removed_window_is_sent_again(self):
+        self._send("table", snapshot(), now=0)
+        self.send_filter.remove("table")
+
+        self.assertTrue(self.send_filter.should_send("table", snapshot()))
+        self.assertEqual([], self.send_filter.due_heartbeats(now=100, exclude={"table"}))
@@ -0,0 +1,79 @@
+import os
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from table_detector.domain.captured_window import CapturedWindow
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.services.table_priority_service import HERO_TO_ACT, WAITING, TablePriorityQueue
+from table_detector.utils.metrics import metrics
+
+IMAGES = Path(__file__).resolve().parent.parent / "resources" / "service" / "poker_game_processor"
+
+
+def window(name: str) -> CapturedWindow:
+    return CapturedWindow(Image.new('RGB', (784, 584)), f"{name}.png", name)
+
+
+class TablePriorityServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.queue = TablePriorityQueue(hero_deadline=1.0, waiting_deadline=5.0)
+
+    def test_priority_scheduling_is_opt_in(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(TablePriorityQueue.from_env(waiting_deadline=3))
+        with patch.dict(os.environ, {'PRIORITY_SCHEDULING': 'true'}):
+            self.assertIsNotNone(TablePriorityQueue.from_env(waiting_deadline=3))
+
+    def test_hero_to_act_tables_come_first(self):
+        self.queue.push(window("waiting_1"), hero_to_act=False, now=0)
+        self.queue.push(window("hero_late"), hero_to_act=True, now=2)
+        self.queue.push(window("waiting_2"), hero_to_act=False, now=1)
+        self.queue.push(window("hero_early"), hero_to_act=True, now=1)
+
+        order = [item.window_name for item in self.queue.drain()]
+
+        self.assertEqual(["hero_early", "hero_late", "waiting_1", "waiting_2"], order)
+        self.assertEqual(0, len(self.queue))
+
+    def test_detection_thread_takes_windows_until_closed(self):
+        taken = []
+
+        def detect():
+            while (item := self.queue.get()) is not None:
+                taken.append(item.window_name)
+
+        self.queue.open()
+        consumer = threading.Thread(target=detect)
+        consumer.start()
+        self.queue.push(window("first"), hero_to_act=False)
+        self.queue.push(window("second"), hero_to_act=True)
+        self.queue.close()
+        consumer.join(5)
+
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual({"first", "second"}, set(taken))
+        self.assertIsNone(self.queue.get())
+
+    def test_complete_records_latency_per_class(self):
+        hero = self.queue.push(window("hero"), hero_to_act=True, now=0)
+        waiting = self.queue.push(window("waiting"), hero_to_act=False, now=0)
+
+        TablePriorityQueue.complete(hero, now=1.5)
+        TablePriorityQueue.complete(waiting, now=1.5)
+
+        self.assertEqual(1, metrics.get_histogram(f'table_priority.{HERO_TO_ACT}.latency_seconds')['count'])
+        self.assertEqual(1.5, metrics.get_histogram(f'table_priority.{WAITING}.latency_seconds')['max'])
+        self.assertEqual(1, metrics.get_counter(f'table_priority.{HERO_TO_ACT}.deadline_missed'))
+        self.assertEqual(0, metrics.get_counter(f'table_priority.{WAITING}.deadline_missed'))
+
+    def test_probe_detects_action_buttons(self):
+        with CapturedWindow(Image.open(IMAGES / "4.png").convert('RGB'), "4.png", "hero") as hero, \
+                CapturedWindow(Image.open(IMAGES / "1.png").convert('RGB'), "1.png", "waiting") as waiting:
+            self.assertTrue(PokerGameProcessor.probe_hero_to_act(hero))
+            self.assertFalse(PokerGameProcessor.probe_hero_to_act(waiting))
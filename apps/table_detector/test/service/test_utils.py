@@ -2,9 +2,42 @@ from pathlib import Path
 
 import cv2
 
+from table_detector.utils.capture_backend import CaptureBackend
+
 
 def load_image(image_name):
     test_dir = Path(__file__).parent.parent
     test_image_path = test_dir / "resources" / "service" / "poker_game_processor" / image_name
 
-    return cv2.imread(str(test_image_path))
\ No newline at end of file
+    return cv2.imread(str(test_image_path))
+
+class FakeCaptureBackend(CaptureBackend):
+    """In-memory window list for capture tests; counts the expensive calls."""
+
+    def __init__(self, windows=None):
+        self.windows = {w['hwnd']: dict(w) for w in windows or []}
+        self.foreground = None
+        self.images = {}
+        self.enumerations = 0
+        self.captures = 0
+
+    @staticmethod
+    def make_window(hwnd, title, rect=(0, 0, 784, 584), process='poker.exe'):
+        return {'hwnd': hwnd, 'title': title, 'rect': rect, 'process': process,
+                'width': rect[2] - rect[0], 'height': rect[3] - rect[1]}
+
+    def enumerate_windows(self):
+        self.enumerations += 1
+        return [dict(w) for w in self.windows.values()]
+
+    def get_window_state(self, hwnd):
+        window = self.windows.get(hwnd)
+        return {'title': window['title'], 'rect': window['rect']} if window else None
+
+    def get_foreground_window(self):
+        return self.foreground
+
+    def capture_window(self, window):
+        self.captures += 1
+        image = self.images.get(window['hwnd'])
+        return image.copy() if image is not None else None
@@ -0,0 +1,64 @@
+import unittest
+
+from table_detector.services.window_registry_service import WindowRegistry
+from table_detector.test.service.test_utils import FakeCaptureBackend
+
+TITLE = "Pot Limit Omaha"
+
+
+class WindowRegistryServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeCaptureBackend([
+            FakeCaptureBackend.make_window(20, f"Table B - {TITLE}"),
+            FakeCaptureBackend.make_window(10, f"Table A - {TITLE}"),
+            FakeCaptureBackend.make_window(30, "Lobby"),
+        ])
+        self.registry = WindowRegistry(self.backend, TITLE, refresh_interval=3600)
+
+    def test_filters_and_sorts_poker_windows(self):
+        windows = self.registry.get_windows()
+
+        self.assertEqual([10, 20], [w['hwnd'] for w in windows])
+        self.assertEqual('poker.exe', windows[0]['process'])
+
+    def test_cheap_recheck_between_refreshes(self):
+        self.registry.get_windows()
+        self.backend.windows[10]['rect'] = (100, 100, 884, 684)
+
+        windows = self.registry.get_windows()
+
+        self.assertEqual(1, self.backend.enumerations)
+        self.assertEqual((100, 100, 884, 684), windows[0]['rect'])
+        self.assertEqual(784, windows[0]['width'])
+
+    def test_closed_window_triggers_refresh(self):
+        self.registry.get_windows()
+        del self.backend.windows[10]
+
+        windows = self.registry.get_windows()
+
+        self.assertEqual(2, self.backend.enumerations)
+        self.assertEqual([20], [w['hwnd'] for w in windows])
+
+    def test_unknown_foreground_window_triggers_refresh(self):
+        self.registry.get_windows()
+        self.backend.windows[40] = FakeCaptureBackend.make_window(40, f"Table C - {TITLE}")
+
+        self.backend.foreground = 30
+        self.assertEqual(2, len(self.registry.get_windows()))
+
+        self.backend.foreground = 40
+        self.assertEqual([10, 20, 40], [w['hwnd'] for w in self.registry.get_windows()])
+        self.assertEqual(2, self.backend.enumerations)
+
+    def test_refresh_interval_and_invalidate(self):
+        registry = WindowRegistry(self.backend, TITLE, refresh_interval=0)
+        registry.get_windows()
+        registry.get_windows()
+        self.assertEqual(2, self.backend.enumerations)
+
+        self.registry.get_windows()
+        self.registry.invalidate()
+        self.registry.get_windows()
+        self.assertEqual(4, self.backend.enumerations)
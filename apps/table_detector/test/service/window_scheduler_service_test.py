@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from PIL import Image
+
+from table_detector.services.image_capture_service import ImageCaptureService
+from table_detector.services.window_scheduler_service import AdaptiveWindowScheduler
+from table_detector.test.service.test_utils import FakeCaptureBackend
+
+
+class AdaptiveWindowSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = AdaptiveWindowScheduler(min_interval=0.2, max_interval=1.0)
+
+    def test_idle_window_backs_off_up_to_max(self):
+        intervals = []
+        for _ in range(5):
+            self.scheduler.record("table", changed=False, now=0)
+            intervals.append(self.scheduler.get_interval("table"))
+
+        self.assertEqual([0.2, 0.4, 0.8, 1.0, 1.0], intervals)
+
+    def test_change_resets_interval(self):
+        for _ in range(3):
+            self.scheduler.record("table", changed=False, now=0)
+
+        self.scheduler.record("table", changed=True, now=0)
+
+        self.assertEqual(0.2, self.scheduler.get_interval("table"))
+
+    def test_due_windows(self):
+        self.scheduler.record("idle", changed=False, now=10)
+        self.scheduler.record("idle", changed=False, now=10)
+
+        self.assertEqual({"new"}, self.scheduler.due_windows(["idle", "new"], now=10.3))
+        self.assertEqual({"idle", "new"}, self.scheduler.due_windows(["idle", "new"], now=10.4))
+
+    def test_from_env_disabled_by_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(AdaptiveWindowScheduler.from_env(max_interval=3))
+        with patch.dict(os.environ, {'PROBE_INTERVAL': '0.2'}, clear=True):
+            self.assertEqual(3, AdaptiveWindowScheduler.from_env(max_interval=3).max_interval)
+
+    @patch.dict(os.environ, {'DEBUG_MODE': 'false', 'ARCHIVE_LAYOUT': 'tree'})
+    def test_probe_skips_idle_windows(self):
+        backend = FakeCaptureBackend([FakeCaptureBackend.make_window(hwnd, f"Table {hwnd} Pot Limit Omaha")
+                                      for hwnd in (1, 2)])
+        for hwnd in backend.windows:
+            backend.images[hwnd] = Image.new('RGB', (784, 584), color=(hwnd, 0, 0))
+        scheduler = AdaptiveWindowScheduler(min_interval=60, max_interval=120)
+        service = ImageCaptureService(capture_backend=backend, window_scheduler=scheduler)
+        folder = tempfile.mkdtemp()
+
+        try:
+            with patch('table_detector.services.window_capture_service.capture_fullscreen',
+                       side_effect=lambda: Image.new('RGB', (10, 10))):
+                first = service.get_changed_images(folder)
+                second = service.get_changed_images(folder)
+        finally:
+            service.close()
+
+        self.assertEqual(2, len(first.changed_images))
+        self.assertEqual([], second.changed_images)
+        self.assertEqual([], second.removed_windows)
+        self.assertEqual(2, backend.captures)
@@ -0,0 +1,31 @@
+import unittest
+
+from loguru import logger
+
+from table_detector.utils.metrics import MetricsRegistry, MetricsReporter
+
+
+class MetricsReporterTest(unittest.TestCase):
+
+    def test_snapshot_is_logged_every_interval_cycles(self):
+        registry = MetricsRegistry()
+        registry.increment('detection.cycles_dropped')
+        registry.observe('pipeline.capture.latency_seconds', 0.02)
+        reporter = MetricsReporter(interval=3, registry=registry)
+
+        messages = []
+        handler = logger.add(messages.append, format="{message}")
+        try:
+            logged = [reporter.cycle_finished() for _ in range(7)]
+        finally:
+            logger.remove(handler)
+
+        self.assertEqual([False, False, True, False, False, True, False], logged)
+        self.assertEqual(2, len(messages))
+        self.assertIn("after 6 cycles", messages[1])
+        self.assertIn("detection.cycles_dropped = 1", messages[1])
+        self.assertIn("pipeline.capture.latency_seconds.p95 = 0.025", messages[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
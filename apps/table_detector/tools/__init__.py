@@ -0,0 +1 @@
+# Command line tools for archive maintenance, benchmarks and offline processing
@@ -0,0 +1,49 @@
+"""
+Maintenance commands for the content-addressed capture archive (ARCHIVE_LAYOUT=cas).
+
+Usage (from the apps folder):
+    python -m table_detector.tools.archive_tool stats
+    python -m table_detector.tools.archive_tool gc --retention-days 7
+    python -m table_detector.tools.archive_tool compact --keep-days 0
+"""
+import argparse
+import json
+from pathlib import Path
+
+from table_detector.services.frame_store_service import FrameStore
+from table_detector.utils.fs_utils import get_results_root
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Content-addressed capture archive maintenance")
+    parser.add_argument('--root', type=Path, default=get_results_root(),
+                        help="Archive root folder (default: ./resources/results)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help="Show object and manifest counts")
+
+    gc_parser = subparsers.add_parser('gc', help="Remove expired manifests and unreferenced frames")
+    gc_parser.add_argument('--retention-days', type=int, default=7)
+    gc_parser.add_argument('--grace-seconds', type=int, default=3600,
+                           help="Keep unreferenced frames younger than this (protects a running client)")
+
+    compact_parser = subparsers.add_parser('compact', help="Merge per-cycle manifests into one file per day")
+    compact_parser.add_argument('--keep-days', type=int, default=0,
+                                help="Leave the most recent N days before today uncompacted")
+
+    args = parser.parse_args(argv)
+    store = FrameStore(args.root)
+
+    if args.command == 'stats':
+        result = store.get_usage()
+    elif args.command == 'gc':
+        result = store.gc(args.retention_days, args.grace_seconds)
+    else:
+        result = store.compact(args.keep_days)
+
+    print(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == "__main__":
+    main()
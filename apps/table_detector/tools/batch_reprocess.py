@@ -0,0 +1,209 @@
+"""
+Offline reprocessing of a capture archive: every archived frame goes through
+PokerGameProcessor.create_game_snapshot and its snapshot is written as one JSON line.
+
+Both archive layouts are read: the legacy tree (<date>/<time>/<window>/*.png) and the
+content-addressed store (ARCHIVE_LAYOUT=cas manifests, identical frames detected once).
+Frames are decoded by a pool of prefetch threads and detected on all cores. Output is
+appended and flushed every --checkpoint-every frames; a rerun with the same --output
+skips frames already written, so an interrupted run resumes where it stopped.
+
+Usage (from the apps folder):
+    python -m table_detector.tools.batch_reprocess --output snapshots.jsonl
+    python -m table_detector.tools.batch_reprocess --root resources/results/2025_01_31 --output day.jsonl --workers 4
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Set, Tuple
+
+from loguru import logger
+
+from table_detector.services.detection_pool_service import FRAME_SHAPE, DetectionProcessPool
+from table_detector.services.frame_store_service import MANIFESTS_FOLDER, OBJECTS_FOLDER, FrameStore
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.utils.fs_utils import get_results_root
+from table_detector.utils.opencv_utils import read_image
+
+FRAME_EXTENSIONS = ('.png', '.webp', '.npy')
+# Archive folders that do not hold captured tables
+SKIPPED_FOLDERS = {OBJECTS_FOLDER, MANIFESTS_FOLDER, 'dumps'}
+
+
+def iter_archive_frames(root) -> Iterator[Tuple[str, Path]]:
+    """
+    Yield (frame id, path) of every archived table frame, oldest first.
+
+    The frame id is stable across runs: the path relative to ``root`` for the
+    tree layout, ``cas:<cycle>/<window>`` for frames of the content-addressed store.
+    """
+    root = Path(root)
+
+    for folder, subfolders, files in os.walk(root):
+        subfolders[:] = sorted(name for name in subfolders if name not in SKIPPED_FOLDERS)
+        for name in sorted(files):
+            lower = name.lower()
+            if not lower.endswith(FRAME_EXTENSIONS) or lower.startswith('full_screen.') \
+                    or '_result.' in lower:
+                continue
+            path = Path(folder) / name
+            yield path.relative_to(root).as_posix(), path
+
+    store = FrameStore(root)
+    seen_digests: Set[str] = set()
+    for manifest in store.iter_manifests():
+        for window_name, digest in sorted(manifest.get('frames', {}).items()):
+            if digest in seen_digests:
+                # Same pixels, same snapshot
+                continue
+            path = store.find_object(digest)
+            if path is None:
+                logger.warning(f"⚠️ Frame {digest} of {manifest.get('cycle')}/{window_name} is missing")
+                continue
+            seen_digests.add(digest)
+            yield f"cas:{manifest.get('cycle')}/{window_name}", path
+
+
+def load_done_frames(output: Path) -> Set[str]:
+    """Frame ids already written to ``output``; a partially written last line is cut off."""
+    if not output.exists():
+        return set()
+
+    done = set()
+    valid_size = 0
+    with open(output, 'rb') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['frame'])
+            except (ValueError, KeyError):
+                # Interrupted mid-write; everything after it is rewritten
+                break
+            valid_size += len(line)
+
+    if valid_size != output.stat().st_size:
+        with open(output, 'r+b') as f:
+            f.truncate(valid_size)
+        logger.warning(f"⚠️ Truncated a partial record at the end of {output}")
+    return done
+
+
+def _decode(path: Path):
+    image = read_image(path)
+    if image is None:
+        raise ValueError(f"Could not decode {path}")
+    if image.shape != FRAME_SHAPE:
+        raise ValueError(f"Unexpected frame shape {image.shape}, expected {FRAME_SHAPE}")
+    return image
+
+
+def _detect_in_process(image) -> Future:
+    future = Future()
+    try:
+        future.set_result(PokerGameProcessor.create_game_snapshot(image))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def reprocess(root, output, workers: int = None, prefetch: int = 8, checkpoint_every: int = 50,
+              limit: int = None) -> dict:
+    """
+    Reprocess every frame under ``root`` not yet in ``output``. ``workers=0``
+    detects in this process. Returns the run statistics.
+    """
+    output = Path(output)
+    workers = os.cpu_count() if workers is None else workers
+    done = load_done_frames(output)
+
+    frames = [(frame_id, path) for frame_id, path in iter_archive_frames(root) if frame_id not in done]
+    if limit is not None:
+        frames = frames[:limit]
+    logger.info(f"🗂️ {len(frames)} frames to process, {len(done)} already done")
+
+    pool = DetectionProcessPool(workers) if workers > 0 else None
+    submit = pool.submit if pool else _detect_in_process
+    # Enough frames in flight to keep every worker busy
+    in_flight_limit = max(workers, 1) * 2
+
+    stats = {'total': len(frames) + len(done), 'skipped': len(done), 'processed': 0, 'errors': 0}
+    started = time.monotonic()
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output, 'a', encoding='utf-8') as out, ThreadPoolExecutor(max_workers=prefetch) as decoder:
+        decoded = deque()
+        frame_iter = iter(frames)
+        for frame_id, path in frame_iter:
+            decoded.append((frame_id, path, decoder.submit(_decode, path)))
+            if len(decoded) >= prefetch:
+                break
+
+        pending = deque()
+
+        def write_result(frame_id, path, detection: Future):
+            record = {'frame': frame_id, 'path': str(path)}
+            try:
+                record['snapshot'] = detection.result().to_summary()
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+                stats['errors'] += 1
+            out.write(json.dumps(record) + '\n')
+            stats['processed'] += 1
+
+            if stats['processed'] % checkpoint_every == 0:
+                out.flush()
+                elapsed = time.monotonic() - started
+                logger.info(f"📈 {stats['processed']}/{len(frames)} frames, "
+                            f"{stats['processed'] / elapsed:.2f} frames/s")
+
+        try:
+            while decoded or pending:
+                if decoded and len(pending) < in_flight_limit:
+                    frame_id, path, image_future = decoded.popleft()
+                    next_frame = next(frame_iter, None)
+                    if next_frame:
+                        decoded.append((*next_frame, decoder.submit(_decode, next_frame[1])))
+
+                    try:
+                        detection = submit(image_future.result())
+                    except Exception as e:
+                        detection = Future()
+                        detection.set_exception(e)
+                    pending.append((frame_id, path, detection))
+                    continue
+
+                # Results are written in archive order
+                write_result(*pending.popleft())
+        finally:
+            out.flush()
+            if pool:
+                pool.close()
+
+    stats['seconds'] = round(time.monotonic() - started, 3)
+    stats['fps'] = round(stats['processed'] / stats['seconds'], 3) if stats['seconds'] else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprocess archived frames into JSONL snapshots")
+    parser.add_argument('--root', type=Path, default=get_results_root(),
+                        help="Archive root folder (default: ./resources/results)")
+    parser.add_argument('--output', type=Path, required=True, help="JSONL file, appended to on resume")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Detection processes (default: all cores, 0 detects in this process)")
+    parser.add_argument('--prefetch', type=int, default=8, help="Frames decoded ahead of detection")
+    parser.add_argument('--checkpoint-every', type=int, default=50, help="Flush the output every N frames")
+    parser.add_argument('--limit', type=int, default=None, help="Process at most N new frames")
+    args = parser.parse_args(argv)
+
+    result = reprocess(args.root, args.output, workers=args.workers, prefetch=args.prefetch,
+                       checkpoint_every=args.checkpoint_every, limit=args.limit)
+    print(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Tesseract latency of bid detection: one image_to_data call per seat against one batched call
+for all seats, for every OCR engine (a tesseract process per call, or warm in-process tesserocr APIs).
+
+All six seat regions of every screenshot go through Tesseract (the native digit recognizer is
+bypassed), so every mode reads the same regions. Engines that are not installed are reported
+as unavailable.
+
+Usage (from the apps folder):
+    python -m table_detector.tools.bid_ocr_benchmark --repeat 5
+    python -m table_detector.tools.bid_ocr_benchmark --engines pytesseract tesserocr
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from table_detector.services.bid_detection_service import (
+    PLAYER_BID_POSITIONS, _extract_bid_text, _extract_bid_texts_batched, _preprocess_bid_region, TESSERACT_CONFIG
+)
+from table_detector.services.ocr_engine_service import create_ocr_engine
+from table_detector.utils.opencv_utils import read_cv2_image
+
+DEFAULT_IMAGES = Path(__file__).resolve().parent.parent / "test" / "resources" / "detection" / "bids"
+
+
+def load_regions(folder: Path):
+    screenshots = []
+    for path in sorted(folder.glob('*.png')):
+        image = read_cv2_image(str(path))
+        screenshots.append({position: _preprocess_bid_region(image[y:y + h, x:x + w])
+                            for position, (x, y, w, h) in PLAYER_BID_POSITIONS.items()})
+    if not screenshots:
+        raise SystemExit(f"No images found in {folder}")
+    return screenshots
+
+
+def measure(read, screenshots, repeat: int) -> dict:
+    durations = []
+    texts = []
+    for _ in range(repeat):
+        for regions in screenshots:
+            started = time.perf_counter()
+            texts.append(read(regions))
+            durations.append(time.perf_counter() - started)
+
+    return {
+        'mean_ms': round(float(np.mean(durations)) * 1000, 2),
+        'p95_ms': round(float(np.percentile(durations, 95)) * 1000, 2),
+        'per_region_ms': round(float(np.mean(durations)) * 1000 / len(PLAYER_BID_POSITIONS), 2),
+        'texts': texts[:len(screenshots)],
+    }
+
+
+def benchmark_engine(engine_name: str, screenshots, repeat: int) -> dict:
+    try:
+        engine = create_ocr_engine(engine_name)
+        # Warm-up, and fails right away when the engine cannot run
+        engine.image_to_data(next(iter(screenshots[0].values())), TESSERACT_CONFIG)
+    except Exception as e:
+        return {'unavailable': f"{type(e).__name__}: {e}"}
+
+    try:
+        per_seat = measure(lambda regions: {position: _extract_bid_text(region, PLAYER_BID_POSITIONS[position], engine)
+                                            for position, region in regions.items()}, screenshots, repeat)
+        batched = measure(lambda regions: _extract_bid_texts_batched(regions, engine), screenshots, repeat)
+    finally:
+        engine.close()
+
+    mismatches = sum(1 for a, b in zip(per_seat.pop('texts'), batched.pop('texts')) if a != b)
+    return {
+        'per_seat': per_seat,
+        'batched': batched,
+        'batched_speedup': round(per_seat['mean_ms'] / batched['mean_ms'], 2) if batched['mean_ms'] else None,
+        'screenshots_read_differently': mismatches,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-seat against batched Tesseract bid OCR, per OCR engine")
+    parser.add_argument('--images', type=Path, default=DEFAULT_IMAGES, help="Folder with table screenshots")
+    parser.add_argument('--engines', nargs='+', default=['pytesseract', 'tesserocr'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    screenshots = load_regions(args.images)
+    result = {'screenshots': len(screenshots)}
+    for engine_name in args.engines:
+        result[engine_name] = benchmark_engine(engine_name, screenshots, args.repeat)
+
+    per_region = {name: result[name]['per_seat']['per_region_ms'] for name in args.engines if 'per_seat' in result[name]}
+    if 'pytesseract' in per_region and 'tesserocr' in per_region and per_region['tesserocr']:
+        result['tesserocr_per_region_speedup'] = round(per_region['pytesseract'] / per_region['tesserocr'], 2)
+
+    print(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Detection throughput (windows/second) in-process and with the detection process pool.
+
+Usage (from the apps folder):
+    python -m table_detector.tools.detection_workers_benchmark --workers 1 2 4 --windows 48
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from table_detector.services.detection_pool_service import DetectionProcessPool, FRAME_SHAPE
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.utils.opencv_utils import read_cv2_image
+
+DEFAULT_IMAGES = Path(__file__).resolve().parent.parent / "test" / "resources" / "service" / "poker_game_processor"
+
+
+def load_frames(folder: Path):
+    frames = [read_cv2_image(path) for path in sorted(folder.glob('*.png'))]
+    return [frame for frame in frames if frame is not None and frame.shape == FRAME_SHAPE]
+
+
+def run_in_process(frames, windows: int) -> float:
+    started = time.perf_counter()
+    for i in range(windows):
+        PokerGameProcessor.create_game_snapshot(frames[i % len(frames)])
+    return windows / (time.perf_counter() - started)
+
+
+def run_pool(frames, windows: int, workers: int) -> float:
+    pool = DetectionProcessPool(workers)
+    try:
+        # Warm up every worker (imports, template attachment) outside the measurement
+        for future in [pool.submit(frames[i % len(frames)]) for i in range(workers)]:
+            future.result()
+
+        started = time.perf_counter()
+        futures = [pool.submit(frames[i % len(frames)]) for i in range(windows)]
+        for future in futures:
+            future.result()
+        return windows / (time.perf_counter() - started)
+    finally:
+        pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detection throughput against worker count")
+    parser.add_argument('--images', type=Path, default=DEFAULT_IMAGES, help="Folder with 784x584 table screenshots")
+    parser.add_argument('--windows', type=int, default=24, help="Windows detected per run")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    frames = load_frames(args.images)
+    if not frames:
+        raise SystemExit(f"No 784x584 images found in {args.images}")
+
+    results = {'cpu_count': os.cpu_count(), 'windows': args.windows,
+               'in_process': round(run_in_process(frames, args.windows), 2)}
+    for workers in args.workers:
+        results[f'workers_{workers}'] = round(run_pool(frames, args.windows, workers), 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
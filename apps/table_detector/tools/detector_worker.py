@@ -0,0 +1,54 @@
+"""
+Standalone detector workers for a detection client running with DETECTOR_BROKER=true.
+
+Workers connect to the client's detector broker over local IPC, detect the frames it sends and
+reconnect when the client restarts. Start, stop or restart them at any time.
+
+Usage (from the apps folder):
+    DETECTOR_AUTHKEY=<secret> python -m table_detector.tools.detector_worker --workers 4
+    DETECTOR_AUTHKEY=<secret> python -m table_detector.tools.detector_worker --address /run/user/1000/detection.sock
+"""
+import argparse
+import multiprocessing
+import os
+
+from loguru import logger
+
+from table_detector.services.detector_broker_service import default_address, env_authkey, run_detector_worker
+
+
+def worker_main(address: str, authkey: bytes):
+    try:
+        run_detector_worker(address, authkey)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detector worker processes fed by the detection client")
+    parser.add_argument('--address', default=os.getenv('DETECTOR_ADDRESS') or default_address(),
+                        help="Broker address (DETECTOR_ADDRESS)")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes to start")
+    args = parser.parse_args(argv)
+
+    authkey = env_authkey()
+    if authkey is None:
+        parser.error("set DETECTOR_AUTHKEY to the detection client's DETECTOR_AUTHKEY")
+    logger.info(f"🛰️ Starting {args.workers} detector workers for {args.address}")
+
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=worker_main, args=(args.address, authkey), daemon=True)
+                 for _ in range(args.workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("🛰️ Stopping detector workers")
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Harvest digit templates for the native bid recognizer from screenshots whose bids are known.
+
+Each sample is <screenshot>:<seat>:<bid text>. The seat's bid region is segmented like the
+recognizer does it; when the glyph count matches the text, every glyph not yet covered by a
+template (same character, same pixels) is written to the registry's digits folder.
+
+Usage (from the apps folder):
+    python -m table_detector.tools.digit_templates table_detector/test/resources/detection/bids/5_move.png:3:3.5
+"""
+import argparse
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from table_detector.services.bid_detection_service import PLAYER_BID_POSITIONS
+from table_detector.services.digit_recognition_service import DIGIT_THRESHOLD, DigitRecognizer, template_character
+from table_detector.services.template_matcher_service import TemplateMatchService
+from table_detector.utils.opencv_utils import read_cv2_image
+
+TEMPLATE_NAMES = {'.': 'dot'}
+
+
+def harvest(samples, output: Path) -> dict:
+    output.mkdir(parents=True, exist_ok=True)
+    existing = [(template_character(path.stem), read_cv2_image(str(path))[:, :, 0] > 127)
+                for path in sorted(output.glob('*.png'))]
+    result = {'written': [], 'skipped': []}
+
+    for sample in samples:
+        image_path, seat, text = sample.rsplit(':', 2)
+        x, y, w, h = PLAYER_BID_POSITIONS[int(seat)]
+        region = cv2.imread(image_path)[y:y + h, x:x + w]
+        gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+        glyphs = DigitRecognizer.segment((gray >= DIGIT_THRESHOLD).astype(np.uint8))
+
+        if len(glyphs) != len(text):
+            result['skipped'].append(f"{sample}: {len(glyphs)} glyphs for {len(text)} characters")
+            continue
+
+        for character, glyph in zip(text, glyphs):
+            glyph = glyph.astype(bool)
+            if any(known == character and pixels.shape == glyph.shape and np.array_equal(pixels, glyph)
+                   for known, pixels in existing):
+                continue
+
+            base = TEMPLATE_NAMES.get(character, character)
+            variant = sum(1 for known, _ in existing if known == character)
+            path = output / (f"{base}.png" if variant == 0 else f"{base}_{variant}.png")
+            cv2.imwrite(str(path), glyph.astype(np.uint8) * 255)
+            existing.append((character, glyph))
+            result['written'].append(path.name)
+
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Harvest digit templates from screenshots with known bids")
+    parser.add_argument('samples', nargs='+', help="<screenshot>:<seat>:<bid text>")
+    parser.add_argument('--output', type=Path, default=TemplateMatchService.TEMPLATE_REGISTRY.templates_dir / 'digits',
+                        help="Template folder (default: the registry's digits folder)")
+    args = parser.parse_args(argv)
+
+    result = harvest(args.samples, args.output)
+    print(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == "__main__":
+    main()
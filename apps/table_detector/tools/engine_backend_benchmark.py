@@ -0,0 +1,86 @@
+"""
+Engine throughput of the pokerkit and native (NativePloState) backends of OmahaEngine.
+
+Random hands are played to the end; every action prefix of a hand is one frame, replayed into
+a new engine like PokerGameProcessor.apply_engine does (engine state cache off). Both backends
+must record the same moves for every frame, the run stops otherwise.
+
+Usage (from the apps folder):
+    python -m table_detector.tools.engine_backend_benchmark --hands 200
+"""
+import argparse
+import json
+import random
+import time
+
+from loguru import logger
+
+from shared.domain.moves import MoveType
+from table_detector.domain.omaha_engine import ENGINE_BACKENDS, OmahaEngine, OmahaEngineException
+
+ACTIONS = [MoveType.FOLD, MoveType.CHECK, MoveType.CALL, MoveType.RAISE]
+WEIGHTS = [2, 4, 4, 1]
+
+
+def play_hand(rng: random.Random, player_count: int):
+    """(position, move) steps of a random hand, only accepted actions"""
+    engine = OmahaEngine(player_count, backend='native')
+    while engine.poker_state.actor_index is not None:
+        position = engine.get_current_position()
+        try:
+            engine.process_action(position, rng.choices(ACTIONS, WEIGHTS)[0])
+        except OmahaEngineException:
+            continue
+    return [step for moves in engine.get_moves_by_street().values() for step in moves]
+
+
+def build_frames(hands: int, seed: int):
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(hands):
+        player_count = rng.randint(2, 6)
+        steps = play_hand(rng, player_count)
+        for length in range(len(steps) + 1):
+            position_actions = {position: [] for position in OmahaEngine.POSITION_ORDERS[player_count]}
+            for position, move in steps[:length]:
+                position_actions[position].append(move)
+            frames.append((player_count, position_actions))
+    return frames
+
+
+def replay(frames, backend: str):
+    results = []
+    started = time.perf_counter()
+    for player_count, position_actions in frames:
+        engine = OmahaEngine(player_count, backend=backend)
+        engine.simulate_all_moves({position: list(moves) for position, moves in position_actions.items()})
+        results.append(engine.get_moves_by_street())
+    return time.perf_counter() - started, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frames per second of the OmahaEngine backends")
+    parser.add_argument('--hands', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    frames = build_frames(args.hands, args.seed)
+    output = {'hands': args.hands, 'frames': len(frames), 'backends': {}}
+    reference = None
+    for backend in ENGINE_BACKENDS:
+        seconds, results = replay(frames, backend)
+        if reference is None:
+            reference = results
+        elif results != reference:
+            raise SystemExit(f"Backend {backend} recorded different moves than {ENGINE_BACKENDS[0]}")
+        output['backends'][backend] = {'frames_per_second': round(len(frames) / seconds, 1),
+                                       'mean_us': round(seconds / len(frames) * 1e6, 1)}
+
+    output['speedup'] = round(output['backends']['pokerkit']['mean_us'] / output['backends']['native']['mean_us'], 1)
+    print(json.dumps(output, indent=2))
+    return output
+
+
+if __name__ == "__main__":
+    main()
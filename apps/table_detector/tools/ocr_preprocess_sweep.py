@@ -0,0 +1,117 @@
+"""
+OCR accuracy and latency of bid preprocessing profiles (scale factor, interpolation, threshold
+method), measured on the labelled bid screenshots. The cheapest profile that reaches the target
+accuracy is chosen and, with --write, saved as the OCR profile of a layout (loaded at runtime
+through OCR_PROFILE=<layout>).
+
+Every seat of every screenshot is read with Tesseract, empty seats included (they must read as
+nothing). Needs a working OCR engine (see OCR_ENGINE).
+
+Usage (from the apps folder):
+    python -m table_detector.tools.ocr_preprocess_sweep --target-accuracy 1.0
+    python -m table_detector.tools.ocr_preprocess_sweep --scales 2 4 8 --write canada
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from table_detector.services.bid_detection_service import (
+    PLAYER_BID_POSITIONS, TESSERACT_CONFIG, _extract_bid_text, _preprocess_bid_region
+)
+from table_detector.services.ocr_engine_service import create_ocr_engine
+from table_detector.services.ocr_profile_service import INTERPOLATIONS, THRESHOLD_METHODS, OcrProfile, profile_path
+from table_detector.utils.opencv_utils import read_cv2_image
+
+DEFAULT_IMAGES = Path(__file__).resolve().parent.parent / "test" / "resources" / "detection" / "bids"
+LABELS_FILE = "expected_bids.json"
+
+
+def load_samples(folder: Path):
+    """(position, seat region, expected text) of every seat of every labelled screenshot"""
+    with open(folder / LABELS_FILE, encoding='utf-8') as f:
+        labels = json.load(f)
+
+    samples = []
+    for filename, bids in sorted(labels.items()):
+        image = read_cv2_image(str(folder / filename))
+        for position, (x, y, w, h) in PLAYER_BID_POSITIONS.items():
+            samples.append((position, image[y:y + h, x:x + w], bids.get(str(position), "")))
+    return samples
+
+
+def evaluate(profile: OcrProfile, samples, engine) -> dict:
+    durations = []
+    correct = 0
+    for position, region, expected in samples:
+        started = time.perf_counter()
+        text = _extract_bid_text(_preprocess_bid_region(region, profile=profile), PLAYER_BID_POSITIONS[position], engine)
+        durations.append(time.perf_counter() - started)
+        correct += (text or "") == expected
+
+    return {
+        'profile': asdict(profile),
+        'accuracy': round(correct / len(samples), 4),
+        'mean_ms': round(float(np.mean(durations)) * 1000, 3),
+    }
+
+
+def choose_profile(results: List[dict], target_accuracy: float) -> Optional[dict]:
+    """Cheapest result reaching the target accuracy, None when no profile does"""
+    qualifying = [result for result in results if result['accuracy'] >= target_accuracy]
+    return min(qualifying, key=lambda result: result['mean_ms']) if qualifying else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep bid OCR preprocessing profiles")
+    parser.add_argument('--images', type=Path, default=DEFAULT_IMAGES,
+                        help=f"Folder with table screenshots and {LABELS_FILE}")
+    parser.add_argument('--scales', type=int, nargs='+', default=[2, 3, 4, 6, 8])
+    parser.add_argument('--interpolations', nargs='+', default=list(INTERPOLATIONS), choices=list(INTERPOLATIONS))
+    parser.add_argument('--thresholds', nargs='+', default=list(THRESHOLD_METHODS), choices=list(THRESHOLD_METHODS))
+    parser.add_argument('--target-accuracy', type=float, default=1.0)
+    parser.add_argument('--write', metavar='LAYOUT', help="Save the chosen profile as this layout's OCR profile")
+    args = parser.parse_args(argv)
+
+    engine = create_ocr_engine(os.getenv('OCR_ENGINE', 'auto').lower())
+    samples = load_samples(args.images)
+    try:
+        # Fails right away when the engine cannot run
+        engine.image_to_data(_preprocess_bid_region(samples[0][1]), TESSERACT_CONFIG)
+    except Exception as e:
+        raise SystemExit(f"OCR engine {engine.name} cannot run: {e}")
+
+    results = []
+    try:
+        for scale, interpolation, threshold_method in itertools.product(args.scales, args.interpolations,
+                                                                        args.thresholds):
+            profile = OcrProfile(scale_factor=scale, interpolation=interpolation, threshold_method=threshold_method)
+            results.append(evaluate(profile, samples, engine))
+    finally:
+        engine.close()
+
+    results.sort(key=lambda result: (-result['accuracy'], result['mean_ms']))
+    chosen = choose_profile(results, args.target_accuracy)
+    output = {'engine': engine.name, 'seats': len(samples), 'target_accuracy': args.target_accuracy,
+              'chosen': chosen, 'results': results}
+
+    if args.write:
+        if chosen is None:
+            raise SystemExit(f"No profile reaches {args.target_accuracy} accuracy, nothing written")
+        path = profile_path(args.write)
+        OcrProfile(**chosen['profile']).save(path, accuracy=chosen['accuracy'], mean_ms=chosen['mean_ms'],
+                                             engine=engine.name, seats=len(samples))
+        output['written'] = str(path)
+
+    print(json.dumps(output, indent=2))
+    return output
+
+
+if __name__ == "__main__":
+    main()
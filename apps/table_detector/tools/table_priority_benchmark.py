@@ -0,0 +1,82 @@
+"""
+Queue-to-send latency per table class for one detection cycle, capture order against hero-to-act first.
+
+Every table of the cycle changed; screenshots with visible action buttons are hero-to-act tables.
+Capture order sends all tables when the cycle ends, priority order sends hero-to-act tables as soon
+as they are detected.
+
+Usage (from the apps folder):
+    python -m table_detector.tools.table_priority_benchmark --tables 12
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from PIL import Image
+from loguru import logger
+
+from table_detector.domain.captured_window import CapturedWindow
+from table_detector.services.poker_game_processor import PokerGameProcessor
+from table_detector.services.table_priority_service import HERO_TO_ACT, WAITING, TablePriorityQueue
+from table_detector.utils.metrics import metrics
+
+DEFAULT_IMAGES = Path(__file__).resolve().parent.parent / "test" / "resources" / "service" / "poker_game_processor"
+
+
+def load_windows(folder: Path, tables: int):
+    paths = sorted(folder.glob('*.png'))
+    if not paths:
+        raise SystemExit(f"No images found in {folder}")
+    return [CapturedWindow(Image.open(paths[i % len(paths)]).convert('RGB'), f"{i:02d}.png", f"table_{i:02d}")
+            for i in range(tables)]
+
+
+def detect(window: CapturedWindow):
+    try:
+        PokerGameProcessor.create_game_snapshot(window.get_cv2_image())
+    except Exception as e:
+        # The client logs and moves on as well; the table still counts towards the cycle
+        logger.debug(f"Detection failed for {window.window_name}: {e}")
+
+
+def run_cycle(windows, prioritized: bool) -> dict:
+    metrics.reset()
+    queue = TablePriorityQueue(hero_deadline=1.0, waiting_deadline=float('inf'))
+    started = time.monotonic()
+    for window in windows:
+        queue.push(window, PokerGameProcessor.probe_hero_to_act(window), now=started)
+
+    # Capture order: take items back in the order they were queued
+    items = list(queue.drain()) if prioritized else sorted(queue.drain(), key=lambda item: item.sequence)
+    waiting = []
+    for item in items:
+        detect(item.captured_window)
+        if prioritized and item.priority_class == HERO_TO_ACT:
+            TablePriorityQueue.complete(item)
+        else:
+            waiting.append(item)
+
+    for item in waiting:
+        TablePriorityQueue.complete(item)
+
+    return {priority_class: metrics.get_histogram(f'table_priority.{priority_class}.latency_seconds')
+            for priority_class in (HERO_TO_ACT, WAITING)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-class latency of capture-order and hero-first detection")
+    parser.add_argument('--images', type=Path, default=DEFAULT_IMAGES, help="Folder with 784x584 table screenshots")
+    parser.add_argument('--tables', type=int, default=12, help="Changed tables in the cycle")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    windows = load_windows(args.images, args.tables)
+    results = {'tables': args.tables,
+               'capture_order': run_cycle(windows, prioritized=False),
+               'hero_first': run_cycle(windows, prioritized=True)}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
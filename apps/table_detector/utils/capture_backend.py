@@ -0,0 +1,129 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image
+from loguru import logger
+
+from table_detector.utils.windows_utils import get_window_info, careful_capture_window, capture_screen_region
+
+
+class CaptureBackend(ABC):
+    """
+    Platform access used by window capture.
+
+    Window dicts have the shape produced by ``get_window_info``:
+    ``hwnd``, ``title``, ``rect``, ``process``, ``width``, ``height``.
+    """
+
+    @abstractmethod
+    def enumerate_windows(self) -> List[dict]:
+        """Full enumeration of visible top-level windows (expensive)."""
+
+    @abstractmethod
+    def get_window_state(self, hwnd) -> Optional[dict]:
+        """
+        Cheap re-check of a known window: ``title`` and ``rect`` only.
+        Returns None when the window is gone, hidden or minimized.
+        """
+
+    @abstractmethod
+    def get_foreground_window(self):
+        """Handle of the current foreground window, None if unknown."""
+
+    @abstractmethod
+    def capture_window(self, window: dict) -> Optional[Image.Image]:
+        """Capture the content of a window, None on failure."""
+
+
+class Win32CaptureBackend(CaptureBackend):
+
+    def enumerate_windows(self) -> List[dict]:
+        return get_window_info()
+
+    def get_window_state(self, hwnd) -> Optional[dict]:
+        import win32gui
+
+        try:
+            if not win32gui.IsWindow(hwnd) or not win32gui.IsWindowVisible(hwnd) or win32gui.IsIconic(hwnd):
+                return None
+            return {
+                'title': win32gui.GetWindowText(hwnd),
+                'rect': win32gui.GetWindowRect(hwnd),
+            }
+        except Exception as e:
+            logger.debug(f"Window state check failed for {hwnd}: {e}")
+            return None
+
+    def get_foreground_window(self):
+        import win32gui
+
+        try:
+            return win32gui.GetForegroundWindow() or None
+        except Exception:
+            return None
+
+    def capture_window(self, window: dict) -> Optional[Image.Image]:
+        img = careful_capture_window(window['hwnd'], window['width'], window['height'])
+
+        if img is None:
+            logger.info("  Using fallback method: screen region capture")
+            img = capture_screen_region(window['rect'])
+
+        return img
+
+
+class ReplayCaptureBackend(CaptureBackend):
+    """
+    Captures screenshot files instead of windows, standing in for Windows capture in tests.
+
+    Every subfolder of ``folder`` is one table whose PNG frames are returned
+    in name order, one per capture; PNG files directly in ``folder`` are
+    single-frame tables. With ``loop`` a table starts over after its last
+    frame, otherwise it is reported closed.
+    """
+
+    def __init__(self, folder, title_format: str = "{name} - Pot Limit Omaha", loop: bool = True):
+        self.loop = loop
+        self._frames: Dict[int, List[Path]] = {}
+        self._windows: Dict[int, dict] = {}
+        self._next_frame: Dict[int, int] = {}
+
+        folder = Path(folder)
+        tables = [(path.name, sorted(path.glob('*.png'))) for path in sorted(folder.iterdir()) if path.is_dir()]
+        tables += [(path.stem, [path]) for path in sorted(folder.glob('*.png'))]
+
+        for hwnd, (name, frames) in enumerate((table for table in tables if table[1]), 1):
+            with Image.open(frames[0]) as first_frame:
+                width, height = first_frame.size
+            self._frames[hwnd] = frames
+            self._next_frame[hwnd] = 0
+            self._windows[hwnd] = {'hwnd': hwnd, 'title': title_format.format(name=name),
+                                   'rect': (0, 0, width, height), 'process': 'replay',
+                                   'width': width, 'height': height}
+
+    def enumerate_windows(self) -> List[dict]:
+        return [dict(self._windows[hwnd]) for hwnd in self._windows if not self._is_exhausted(hwnd)]
+
+    def get_window_state(self, hwnd) -> Optional[dict]:
+        window = self._windows.get(hwnd)
+        if window is None or self._is_exhausted(hwnd):
+            return None
+        return {'title': window['title'], 'rect': window['rect']}
+
+    def get_foreground_window(self):
+        return None
+
+    def capture_window(self, window: dict) -> Optional[Image.Image]:
+        hwnd = window['hwnd']
+        if hwnd not in self._frames or self._is_exhausted(hwnd):
+            return None
+
+        frames = self._frames[hwnd]
+        path = frames[self._next_frame[hwnd] % len(frames)]
+        self._next_frame[hwnd] += 1
+        with Image.open(path) as frame:
+            return frame.convert('RGB')
+
+    def _is_exhausted(self, hwnd) -> bool:
+        return not self.loop and self._next_frame[hwnd] >= len(self._frames[hwnd])
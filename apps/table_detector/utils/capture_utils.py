@@ -6,9 +6,11 @@ from loguru import logger
 
 from table_detector.domain.captured_window import CapturedWindow
 from table_detector.utils.fs_utils import get_image_names
-from table_detector.utils.windows_utils import get_window_info, careful_capture_window, capture_screen_region
+from table_detector.utils.capture_backend import CaptureBackend, Win32CaptureBackend
 
-def _capture_windows(windows) -> List[CapturedWindow]:
+
+def _capture_windows(windows, backend: CaptureBackend = None) -> List[CapturedWindow]:
+    backend = backend or Win32CaptureBackend()
     windows.sort(key=lambda w: w['hwnd'])
 
     logger.info(f"Found {len(windows)} windows to capture")
@@ -16,33 +18,12 @@ def _capture_windows(windows) -> List[CapturedWindow]:
     captured_images = []
 
     for i, window in enumerate(windows, 1):
-        hwnd = window['hwnd']
-        title = window['title']
-        process = window['process']
-        rect = window['rect']
-        width = window['width']
-        height = window['height']
-
-        logger.info(f"Capturing window {i}/{len(windows)}: {title} ({process})")
-
-        safe_title = "".join([c if c.isalnum() else "_" for c in title])[:50]
-        safe_title = f"{i:02d}_{safe_title}"
-        filename = f"{safe_title}.png"
-
-        img = careful_capture_window(hwnd, width, height)
+        logger.info(f"Capturing window {i}/{len(windows)}: {window['title']} ({window['process']})")
 
-        if img is None:
-            logger.info("  Using fallback method: screen region capture")
-            img = capture_screen_region(rect)
+        img = backend.capture_window(window)
 
         if img:
-            captured_image = CapturedWindow(
-                image=img,
-                filename=filename,
-                window_name=safe_title,
-                description=f"{safe_title}"
-            )
-            captured_images.append(captured_image)
+            captured_images.append(_to_captured_window(i, window, img))
             logger.info(f"  ✓ Captured images")
         else:
             logger.error(f"  ✗ Failed to capture")
@@ -50,8 +31,26 @@ def _capture_windows(windows) -> List[CapturedWindow]:
     return captured_images
 
 
-def get_poker_window_info(poker_window_name):
-    original_windows_info = get_window_info()
+def capture_window_name(index: int, title: str) -> str:
+    safe_title = "".join([c if c.isalnum() else "_" for c in title])[:50]
+    return f"{index:02d}_{safe_title}"
+
+
+def _to_captured_window(index: int, window: dict, img: Image.Image) -> CapturedWindow:
+    """Wrap a window capture; ``index`` is the 1-based position of the window in hwnd order."""
+    safe_title = capture_window_name(index, window['title'])
+
+    return CapturedWindow(
+        image=img,
+        filename=f"{safe_title}.png",
+        window_name=safe_title,
+        description=f"{safe_title}"
+    )
+
+
+def get_poker_window_info(poker_window_name, backend: CaptureBackend = None):
+    backend = backend or Win32CaptureBackend()
+    original_windows_info = backend.enumerate_windows()
     windows = [w for w in original_windows_info if poker_window_name in w['title']]
     return windows
 
@@ -71,6 +71,11 @@ class DetectUtils:
     def detect_table_cards(cv2_image) -> List[Detection]:
         return TemplateMatchService.find_table_cards(cv2_image)
 
+    @staticmethod
+    def detect_hero_to_act(cv2_image) -> bool:
+        """Whether the hero's action buttons are on screen, i.e. the hero has to act."""
+        return bool(TemplateMatchService.find_actions(cv2_image))
+
     @staticmethod
     def get_player_actions_detection(image: np.ndarray) -> Dict[int, List[Detection]]:
         player_actions = {}
@@ -7,23 +7,33 @@ from loguru import logger
 DEBUG_FOLDER = "test/resources/default_debug"
 
 
-def create_timestamp_folder(debug_mode=False) -> Path:
+def get_results_root() -> Path:
+    """Root folder of live-mode capture archives"""
+    return Path.cwd() / "resources" / "results"
+
+
+def create_timestamp_folder(debug_mode=False, with_milliseconds=False) -> Path:
     """
     Create timestamp folder path for current session
 
+    Args:
+        with_milliseconds: Append milliseconds to the time folder, for cycles shorter than a second
+
     Returns:
         String path to timestamp folder
     """
     now = datetime.now()
     date_folder = now.strftime("%Y_%m_%d")
     time_folder = now.strftime("%H%M%S")
+    if with_milliseconds:
+        time_folder += f"_{now.microsecond // 1000:03d}"
 
     if debug_mode:
         # Debug mode - use existing folder
         timestamp_folder = Path.cwd() / DEBUG_FOLDER
     else:
         # Live mode - create new folder 
-        timestamp_folder = Path.cwd() / "resources" / "results" / date_folder / time_folder
+        timestamp_folder = get_results_root() / date_folder / time_folder
 
     return timestamp_folder
 
@@ -57,6 +57,10 @@ class LogAccumulator:
         with open(file_path, 'w', encoding='utf-8') as f:
             f.writelines(self.logs)
 
+    def get_text(self) -> str:
+        """Return accumulated logs as a single string."""
+        return "".join(self.logs)
+
     def clear(self):
         """Clear accumulated logs from memory."""
         self.logs.clear()
@@ -0,0 +1,139 @@
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence
+
+from loguru import logger
+
+# Upper bounds (seconds) of the default latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are reported as the upper bound of their bucket."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'max': self.max,
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process registry of counters, gauges and histograms.
+
+    Detection, capture and archival code report into the shared ``metrics``
+    instance; the detection client logs a snapshot of it every
+    METRICS_LOG_INTERVAL cycles (see ``MetricsReporter``).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """Record a value in histogram ``name``; ``buckets`` only applies when the histogram is created."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def get_counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def get_gauge(self, name: str, default: float = 0.0) -> float:
+        with self._lock:
+            return self._gauges.get(name, default)
+
+    def get_histogram(self, name: str) -> Dict[str, float]:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.summary() if histogram else Histogram().summary()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return a flat copy of all counters, gauges and histogram summaries (``<name>.p95`` etc.)."""
+        with self._lock:
+            result: Dict[str, float] = dict(self._counters)
+            result.update(self._gauges)
+            for name, histogram in self._histograms.items():
+                for key, value in histogram.summary().items():
+                    result[f"{name}.{key}"] = value
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsReporter:
+    """Logs a snapshot of a metrics registry every ``interval`` detection cycles."""
+
+    def __init__(self, interval: int = 60, registry: MetricsRegistry = metrics):
+        self.interval = interval
+        self.registry = registry
+        self._cycles = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['MetricsReporter']:
+        interval = int(os.getenv('METRICS_LOG_INTERVAL', '60'))
+        return cls(interval) if interval > 0 else None
+
+    def cycle_finished(self) -> bool:
+        """Count a finished cycle; returns True when it logged a snapshot."""
+        with self._lock:
+            self._cycles += 1
+            if self._cycles % self.interval:
+                return False
+            cycles = self._cycles
+
+        snapshot = self.registry.snapshot()
+        lines = [f"  {name} = {round(value, 4) if isinstance(value, float) else value}"
+                 for name, value in sorted(snapshot.items())]
+        logger.info(f"📊 Metrics after {cycles} cycles ({len(snapshot)} values):\n" + "\n".join(lines))
+        return True
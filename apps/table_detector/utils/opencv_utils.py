@@ -20,6 +20,33 @@ def pil_to_cv2(pil_image: Image.Image) -> np.ndarray:
     return cv2_image
 
 
+# Archive codec name -> (file extension, cv2.imwrite params). 'npy' is written with numpy directly.
+IMAGE_CODECS = {
+    'png': ('.png', [cv2.IMWRITE_PNG_COMPRESSION, 1]),
+    'npy': ('.npy', None),
+    'webp': ('.webp', [cv2.IMWRITE_WEBP_QUALITY, 101]),  # quality > 100 means lossless
+}
+
+
+def write_image(path, image: np.ndarray, codec: str = 'png'):
+    """Write a BGR image with one of IMAGE_CODECS, raising IOError on failure."""
+    if codec == 'npy':
+        with open(path, 'wb') as f:
+            np.save(f, image)
+        return
+
+    params = IMAGE_CODECS[codec][1]
+    if not cv2.imwrite(str(path), image, params):
+        raise IOError(f"cv2.imwrite returned False for {path}")
+
+
+def read_image(path) -> np.ndarray:
+    """Read a BGR image written by write_image, whatever its codec."""
+    if str(path).endswith('.npy'):
+        return np.load(path)
+    return cv2.imread(str(path), cv2.IMREAD_COLOR)
+
+
 def save_opencv_image(image, folder_path, filename):
     os.makedirs(folder_path, exist_ok=True)
     filepath = os.path.join(folder_path, filename)
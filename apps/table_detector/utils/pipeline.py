@@ -0,0 +1,105 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional
+
+from loguru import logger
+
+from table_detector.utils.metrics import metrics
+
+# Handler of a stage: one input item -> zero or more items for the next stage
+StageHandler = Callable[[Any], Optional[Iterable[Any]]]
+
+
+class _Stop:
+    pass
+
+
+STOP = _Stop()
+
+
+class PipelineStage:
+    """
+    One pipeline stage: a thread draining a bounded input queue.
+
+    When the next stage's queue is full ``emit`` blocks, so a slow stage slows
+    down its producers instead of letting work pile up or get dropped.
+
+    Metrics (``pipeline.<name>.*``): ``queue_depth`` gauge, ``wait_seconds``
+    (time in the input queue) and ``latency_seconds`` (handler time)
+    histograms, ``processed``, ``failed`` and ``blocked`` (full output queue)
+    counters.
+    """
+
+    def __init__(self, name: str, handler: StageHandler, queue_size: int = 8):
+        self.name = name
+        self.handler = handler
+        self.input: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.next_stage: Optional['PipelineStage'] = None
+        self._thread = threading.Thread(target=self._run, name=f"pipeline-{name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def put(self, item: Any):
+        """Queue an item for this stage, blocking while the queue is full."""
+        try:
+            self.input.put_nowait((time.monotonic(), item))
+        except queue.Full:
+            metrics.increment(f'pipeline.{self.name}.blocked')
+            self.input.put((time.monotonic(), item))
+        metrics.set_gauge(f'pipeline.{self.name}.queue_depth', self.input.qsize())
+
+    def emit(self, item: Any):
+        if self.next_stage is not None:
+            self.next_stage.put(item)
+
+    def join(self, timeout: float = None):
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            enqueued_at, item = self.input.get()
+            metrics.set_gauge(f'pipeline.{self.name}.queue_depth', self.input.qsize())
+
+            if item is STOP:
+                self.emit(STOP)
+                return
+
+            started = time.monotonic()
+            metrics.observe(f'pipeline.{self.name}.wait_seconds', started - enqueued_at)
+            try:
+                for output in self.handler(item) or ():
+                    self.emit(output)
+                metrics.increment(f'pipeline.{self.name}.processed')
+            except Exception as e:
+                metrics.increment(f'pipeline.{self.name}.failed')
+                logger.error(f"❌ Pipeline stage {self.name} failed: {e}")
+            finally:
+                metrics.observe(f'pipeline.{self.name}.latency_seconds', time.monotonic() - started)
+
+
+class Pipeline:
+    """Linear chain of stages; items put into the first stage flow through all of them."""
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next_stage = next_stage
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def put(self, item: Any):
+        self.stages[0].put(item)
+
+    def stop(self, timeout: float = 10.0):
+        """Let queued items drain through every stage, then stop the threads."""
+        self.put(STOP)
+        deadline = time.monotonic() + timeout
+        for stage in self.stages:
+            stage.join(max(deadline - time.monotonic(), 0))
+
+    def get_queue_depths(self) -> dict:
+        return {stage.name: stage.input.qsize() for stage in self.stages}
@@ -115,6 +115,7 @@ def capture_screen_region(rect):
 
 def get_window_info():
     import win32gui
+    import win32process
 
     """Get info about all visible, non-minimized windows"""
     window_info = []
@@ -162,26 +163,31 @@ def get_window_info():
     return windows
 
 
+def format_windows_list(windows) -> str:
+    """Format the list of windows the way it is stored in windows.txt"""
+    lines = [f"Window List - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", "=" * 60 + "\n\n"]
+
+    for i, window in enumerate(windows, 1):
+        lines.append(f"Window {i}:\n")
+        lines.append(f"  Title: {window['title']}\n")
+        lines.append(f"  Process: {window['process']}\n")
+        lines.append(f"  HWND: {window['hwnd']}\n")
+        lines.append(f"  Position: ({window['rect'][0]}, {window['rect'][1]})\n")
+        lines.append(f"  Size: {window['width']} x {window['height']}\n")
+        lines.append(f"  Rectangle: {window['rect']}\n")
+        lines.append("-" * 40 + "\n")
+
+    lines.append(f"\nTotal windows: {len(windows)}\n")
+    return "".join(lines)
+
+
 def write_windows_list(windows, output_folder):
     """Write the list of all windows to windows.txt"""
     windows_file_path = os.path.join(output_folder, "windows.txt")
 
     try:
         with open(windows_file_path, 'w', encoding='utf-8') as f:
-            f.write(f"Window List - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 60 + "\n\n")
-
-            for i, window in enumerate(windows, 1):
-                f.write(f"Window {i}:\n")
-                f.write(f"  Title: {window['title']}\n")
-                f.write(f"  Process: {window['process']}\n")
-                f.write(f"  HWND: {window['hwnd']}\n")
-                f.write(f"  Position: ({window['rect'][0]}, {window['rect'][1]})\n")
-                f.write(f"  Size: {window['width']} x {window['height']}\n")
-                f.write(f"  Rectangle: {window['rect']}\n")
-                f.write("-" * 40 + "\n")
-
-            f.write(f"\nTotal windows: {len(windows)}\n")
+            f.write(format_windows_list(windows))
 
         #print(f"Window list written to: {windows_file_path}")
 